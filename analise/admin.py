@@ -2,8 +2,55 @@ from django.contrib import admin
 from .models.atleta import Atleta
 from .models.evento import Evento
 from .models.estatistica import Estatistica
+from .models.resumo_atleta import ResumoAtleta
+from .models.progresso_importacao import ProgressoImportacao
+from .paginacao import PaginadorContagemEstimada
 
-# Registrando os modelos na interface administrativa
-admin.site.register(Atleta)
-admin.site.register(Evento)
-admin.site.register(Estatistica)
\ No newline at end of file
+
+class AdminGrandesVolumes(admin.ModelAdmin):
+    """
+    Base das listagens de tabelas grandes: contagem estimada/em cache e sem o
+    COUNT(*) adicional do total sem filtros.
+    """
+    paginator = PaginadorContagemEstimada
+    show_full_result_count = False
+
+
+# Os filtros usam colunas indexadas (esporte, oficial, data); as buscas alimentam
+# o autocomplete das chaves estrangeiras de Estatistica
+
+@admin.register(Atleta)
+class AtletaAdmin(AdminGrandesVolumes):
+    list_display = ('nome', 'cpf', 'esporte', 'nacionalidade', 'ativo')
+    list_filter = ('esporte', 'ativo')
+    search_fields = ('nome', '=cpf')
+
+
+@admin.register(Evento)
+class EventoAdmin(AdminGrandesVolumes):
+    list_display = ('nome', 'data', 'esporte', 'cidade', 'pais', 'oficial')
+    list_filter = ('esporte', 'oficial')
+    date_hierarchy = 'data'
+    search_fields = ('nome',)
+
+
+@admin.register(Estatistica)
+class EstatisticaAdmin(AdminGrandesVolumes):
+    # As colunas atleta e evento usam o __str__ dos objetos já carregados na mesma consulta
+    list_display = ('atleta', 'evento', 'pontuacao', 'distancia', 'estrangeiro')
+    list_select_related = ('atleta', 'evento')
+    list_filter = ('evento__esporte', 'evento__oficial', 'estrangeiro')
+    autocomplete_fields = ('atleta', 'evento')
+
+
+@admin.register(ResumoAtleta)
+class ResumoAtletaAdmin(AdminGrandesVolumes):
+    list_display = ('atleta', 'esporte', 'total_estatisticas', 'melhor_pontuacao', 'melhor_pontuacao_oficial')
+    list_select_related = ('atleta',)
+    list_filter = ('esporte',)
+    raw_id_fields = ('atleta',)
+
+
+@admin.register(ProgressoImportacao)
+class ProgressoImportacaoAdmin(admin.ModelAdmin):
+    list_display = ('arquivo', 'linhas_confirmadas', 'concluido', 'atualizado_em')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AnaliseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analise'
+
+    def ready(self):
+        # Registra os receivers de sinais dos modelos
+        from . import signals  # noqa: F401
@@ -0,0 +1,210 @@
+"""
+Cache versionado dos resultados das consultas dos managers.
+
+A chave de cada resultado combina o método, seus argumentos e a versão atual
+de cada modelo consultado. As versões são incrementadas pelos sinais
+post_save/post_delete de Atleta, Evento e Estatistica (ver analise/signals.py),
+de modo que qualquer escrita torna inacessíveis apenas os resultados que
+dependiam daquele modelo, sem varrer o cache.
+
+Leituras roteadas para a réplica (ver analise/replica.py) podem estar
+atrasadas em relação às versões: a chave inclui também o banco lido e, na
+réplica, o instante da sua última atualização, de modo que nenhum resultado
+lido da réplica sobrevive à próxima cópia ou ao atraso máximo.
+
+A versão só é incrementada quando a transação da escrita é confirmada
+(``invalidar_ao_confirmar``): incrementada antes, uma leitura concorrente
+ainda veria as linhas anteriores e as gravaria sob a versão nova.
+
+O alias de cache é definido por ``ANALISE_CACHE_ALIAS`` (padrão 'default') e
+funciona com os backends locmem e de arquivos; o limite de tamanho e a
+política de descarte vêm de ``MAX_ENTRIES``/``CULL_FREQUENCY`` do backend.
+
+Uso:
+    Atleta.objects.em_cache().buscar_ranking_eventos_oficiais(3)
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import models, transaction
+
+from .replica import alias_leitura, alias_replica, sincronizada_em
+
+PREFIXO = 'analise'
+
+_AUSENTE = object()
+
+_contadores = Counter()
+_trava_contadores = threading.Lock()
+
+
+def obter_cache():
+    """Backend de cache configurado para as consultas"""
+    return caches[getattr(settings, 'ANALISE_CACHE_ALIAS', 'default')]
+
+
+def _chave_versao(modelo) -> str:
+    return f'{PREFIXO}:versao:{modelo._meta.label_lower}'
+
+
+def _nova_versao() -> int:
+    # Uma versão descartada pelo backend nunca volta a um valor já usado
+    return time.time_ns()
+
+
+def versoes(*modelos) -> tuple:
+    """Versões atuais dos modelos, inicializando as que não existirem no cache"""
+    cache = obter_cache()
+    chaves = [_chave_versao(modelo) for modelo in modelos]
+    atuais = cache.get_many(chaves)
+
+    for chave in chaves:
+        if chave not in atuais:
+            cache.add(chave, _nova_versao(), timeout=None)
+            atuais[chave] = cache.get(chave)
+
+    return tuple(atuais[chave] for chave in chaves)
+
+
+def invalidar(modelo) -> None:
+    """Incrementa a versão do modelo, invalidando os resultados que dependem dele"""
+    cache = obter_cache()
+    try:
+        cache.incr(_chave_versao(modelo))
+    except ValueError:
+        cache.set(_chave_versao(modelo), _nova_versao(), timeout=None)
+
+
+def invalidar_ao_confirmar(modelo, using: str = None) -> None:
+    """
+    Invalida o modelo quando a transação atual do banco ``using`` for
+    confirmada (imediatamente, fora de transação); nada é feito em rollback.
+    """
+    transaction.on_commit(lambda: invalidar(modelo), using=using)
+
+
+def origem_leitura() -> tuple:
+    """
+    Banco das leituras feitas pelos managers e, se for a réplica, o instante
+    da sua última atualização
+    """
+    alias = alias_leitura()
+    return alias, sincronizada_em() if alias == alias_replica() else None
+
+
+def _normalizar(valor):
+    """Representação estável de um argumento para compor a chave"""
+    if isinstance(valor, models.Model):
+        return f'{valor._meta.label_lower}:{valor.pk}'
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, str):
+        # Esporte.CORRIDA e 'CORRIDA' compartilham a mesma chave
+        return repr(str(valor))
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        itens = [_normalizar(item) for item in valor]
+        return sorted(itens) if isinstance(valor, (set, frozenset)) else itens
+    return repr(valor)
+
+
+def montar_chave(metodo: str, args: tuple, kwargs: dict, versoes_modelos: tuple) -> str:
+    """Chave curta e estável para o resultado de um método com os argumentos e versões dados"""
+    assinatura = repr((
+        [_normalizar(arg) for arg in args],
+        sorted((nome, _normalizar(valor)) for nome, valor in kwargs.items()),
+        versoes_modelos,
+    ))
+    resumo = hashlib.sha1(assinatura.encode()).hexdigest()
+    return f'{PREFIXO}:consulta:{metodo}:{resumo}'
+
+
+def estatisticas_cache() -> dict:
+    """
+    Contadores de acertos e falhas desde o início do processo (ou do último
+    zerar_estatisticas_cache), no total e por método ('Atleta.buscar_...:acertos').
+    """
+    with _trava_contadores:
+        return {'acertos': 0, 'falhas': 0, **_contadores}
+
+
+def zerar_estatisticas_cache() -> None:
+    """Zera os contadores de acertos e falhas"""
+    with _trava_contadores:
+        _contadores.clear()
+
+
+def _contar(evento: str, metodo: str) -> None:
+    with _trava_contadores:
+        _contadores[evento] += 1
+        _contadores[f'{metodo}:{evento}'] += 1
+
+
+class ConsultasEmCache:
+    """
+    Envolve um manager, respondendo os métodos listados em
+    ``manager.metodos_em_cache`` a partir do cache.
+
+    Resultados em QuerySet são avaliados antes de serem gravados.
+    """
+
+    def __init__(self, manager, timeout=DEFAULT_TIMEOUT):
+        self._manager = manager
+        self._timeout = timeout
+
+    def __getattr__(self, nome):
+        if nome not in self._manager.metodos_em_cache:
+            raise AttributeError(f'{nome} não é uma consulta em cache de {type(self._manager).__name__}')
+
+        metodo = getattr(self._manager, nome)
+        identificador = f'{self._manager.model.__name__}.{nome}'
+        dependencias = self._manager.modelos_consultados()
+
+        def consultar(*args, **kwargs):
+            cache = obter_cache()
+            chave = montar_chave(identificador, args, kwargs, versoes(*dependencias) + origem_leitura())
+
+            resultado = cache.get(chave, _AUSENTE)
+            if resultado is not _AUSENTE:
+                _contar('acertos', identificador)
+                return resultado
+
+            _contar('falhas', identificador)
+            resultado = metodo(*args, **kwargs)
+            if isinstance(resultado, models.QuerySet):
+                len(resultado)  # avalia para gravar as linhas, não a consulta
+
+            cache.set(chave, resultado, timeout=self._timeout)
+            return resultado
+
+        return consultar
+
+
+class ConsultasEmCacheMixin:
+    """
+    Adiciona ``em_cache()`` a um manager. O manager lista em ``metodos_em_cache``
+    as consultas que podem ser respondidas pelo cache.
+    """
+    metodos_em_cache = ()
+
+    # Modelos cujas escritas invalidam os resultados das consultas
+    modelos_dependentes = ('analise.Atleta', 'analise.Evento', 'analise.Estatistica')
+
+    def modelos_consultados(self) -> tuple:
+        """Classes dos modelos listados em modelos_dependentes"""
+        return tuple(apps.get_model(label) for label in self.modelos_dependentes)
+
+    def em_cache(self, timeout=DEFAULT_TIMEOUT) -> ConsultasEmCache:
+        """
+        Retorna um objeto com as mesmas consultas do manager, respondidas pelo cache.
+
+        Args:
+            timeout: Validade dos resultados em segundos (padrão: o do backend)
+        """
+        return ConsultasEmCache(self, timeout)
@@ -0,0 +1,244 @@
+"""
+Gerador de dados sintéticos válidos para testes de carga e benchmarks.
+
+Os dados respeitam as regras dos modelos por construção: CPFs com dígitos
+verificadores corretos (validate_cpf), idades entre 18 e 45 anos
+(validate_data_nascimento), idade mínima na data de qualquer evento
+(validate_atleta_idade_minima), atleta e evento do mesmo esporte e campos
+por esporte de acordo com validate_estatistica_por_esporte. Por isso as
+estatísticas são gravadas com bulk_create, sem full_clean por linha.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Max
+
+from .cache import invalidar_ao_confirmar
+from .models.atleta import Atleta
+from .models.evento import Evento
+from .models.estatistica import Estatistica
+from .models.esporte import Esporte
+from .models.resumo_atleta import ResumoAtleta
+
+# Esportes com regras de estatística em validate_estatistica_por_esporte
+ESPORTES = (Esporte.CORRIDA, Esporte.FUTEBOL, Esporte.BASQUETE)
+
+NACIONALIDADES = ('Brasil', 'Argentina', 'Quênia', 'Estados Unidos', 'Portugal', 'Etiópia')
+
+CIDADES = (
+    ('São Paulo', 'Brasil'),
+    ('Rio de Janeiro', 'Brasil'),
+    ('Buenos Aires', 'Argentina'),
+    ('Nairobi', 'Quênia'),
+    ('Boston', 'Estados Unidos'),
+    ('Lisboa', 'Portugal'),
+)
+
+DISTANCIAS = (Decimal('5.00'), Decimal('10.00'), Decimal('21.10'), Decimal('42.20'))
+
+# Proporção padrão entre estatísticas e cadastros
+ESTATISTICAS_POR_ATLETA = 20
+ESTATISTICAS_POR_EVENTO = 200
+
+
+# Bases de 9 dígitos com todos os dígitos iguais (111111111...999999999), rejeitadas por validate_cpf
+_BASES_REPETIDAS = tuple(111111111 * digito for digito in range(1, 10))
+CAPACIDADE_CPF = 900000000 - len(_BASES_REPETIDAS)
+
+
+def gerar_cpf(numero: int) -> str:
+    """
+    Gera um CPF válido a partir de um número sequencial.
+
+    Números diferentes (módulo CAPACIDADE_CPF) geram CPFs diferentes: as bases
+    com todos os dígitos iguais são puladas, deslocando as seguintes.
+
+    Args:
+        numero: Número usado como base dos 9 primeiros dígitos
+
+    Returns:
+        CPF com 11 dígitos, sem pontuação
+    """
+    posicao = 100000000 + numero % CAPACIDADE_CPF
+    pulos = 0
+    while True:
+        base = posicao + pulos
+        puladas = sum(1 for repetida in _BASES_REPETIDAS if repetida <= base)
+        if puladas == pulos:
+            break
+        pulos = puladas
+    cpf = f'{base:09d}'
+
+    for i in range(9, 11):
+        soma = sum(int(cpf[num]) * ((i + 1) - num) for num in range(0, i))
+        cpf += str(((soma * 10) % 11) % 10)
+
+    return cpf
+
+
+def gerar_campos_estatistica(esporte, rng: random.Random) -> dict:
+    """Campos de uma estatística válida para o esporte"""
+    if esporte == Esporte.CORRIDA:
+        return {
+            'pontuacao': rng.randint(1, 50),
+            'distancia': rng.choice(DISTANCIAS),
+        }
+    if esporte == Esporte.FUTEBOL:
+        return {
+            'pontuacao': rng.randint(0, 4),
+            'assistencias': rng.randint(0, 3),
+            'faltas': rng.randint(0, 5),
+            'cartoes': rng.randint(0, 2),
+            'minutos_jogados': rng.randint(1, 90),
+        }
+    return {
+        'pontuacao': rng.randint(0, 45),
+        'assistencias': rng.randint(0, 15),
+        'faltas': rng.randint(0, 6),
+        'cartoes': rng.randint(0, 1),
+        'minutos_jogados': rng.randint(1, 48),
+    }
+
+
+def _proximo_numero(modelo) -> int:
+    """
+    Primeiro número sequencial livre para novos registros sintéticos do modelo.
+
+    Cada registro gerado recebe um número menor que o seu pk, e o SQLite
+    atribui pks acima do maior existente: a partir do maior pk, CPFs e e-mails
+    não repetem os de registros restantes, mesmo após remoções (que tornam
+    count() menor que o último número usado).
+    """
+    return modelo.objects.aggregate(maior=Max('pk'))['maior'] or 0
+
+
+def gerar_atletas(quantidade: int, rng: random.Random, hoje: date, tamanho_lote: int = 5000) -> dict:
+    """
+    Cria atletas válidos distribuídos entre ESPORTES.
+
+    Returns:
+        Dicionário {esporte: [ids dos atletas]}
+    """
+    inicio = _proximo_numero(Atleta)
+    ids_por_esporte = {esporte: [] for esporte in ESPORTES}
+
+    for deslocamento in range(0, quantidade, tamanho_lote):
+        lote = []
+        for n in range(inicio + deslocamento, inicio + min(deslocamento + tamanho_lote, quantidade)):
+            lote.append(Atleta(
+                nome=f'Atleta Sintético {n:07d}',
+                cpf=gerar_cpf(n),
+                email=f'atleta{n}@sintetico.com',
+                # Entre 18 e 45 anos hoje, portanto com 12 anos ou mais em qualquer evento gerado
+                data_nascimento=hoje - timedelta(days=rng.randint(18 * 366, 45 * 365)),
+                nacionalidade=rng.choice(NACIONALIDADES),
+                altura=Decimal(rng.randint(150, 215)) / 100,
+                peso=Decimal(rng.randint(450, 1200)) / 10,
+                esporte=ESPORTES[n % len(ESPORTES)],
+            ))
+        with transaction.atomic():
+            for atleta in Atleta.objects.bulk_create(lote):
+                ids_por_esporte[atleta.esporte].append(atleta.pk)
+
+    return ids_por_esporte
+
+
+def gerar_eventos(quantidade: int, rng: random.Random, hoje: date, tamanho_lote: int = 5000) -> dict:
+    """
+    Cria eventos válidos nos últimos 5 anos, distribuídos entre ESPORTES.
+
+    Returns:
+        Dicionário {esporte: [ids dos eventos]}
+    """
+    inicio = _proximo_numero(Evento)
+    ids_por_esporte = {esporte: [] for esporte in ESPORTES}
+
+    for deslocamento in range(0, quantidade, tamanho_lote):
+        lote = []
+        for n in range(inicio + deslocamento, inicio + min(deslocamento + tamanho_lote, quantidade)):
+            cidade, pais = rng.choice(CIDADES)
+            lote.append(Evento(
+                nome=f'Evento Sintético {n:07d}',
+                local=f'Arena {cidade}',
+                cidade=cidade,
+                pais=pais,
+                data=hoje - timedelta(days=rng.randint(0, 5 * 365)),
+                esporte=ESPORTES[n % len(ESPORTES)],
+                oficial=rng.random() < 0.7,
+                organizador='Federação Sintética',
+                capacidade=rng.randint(100, 80000),
+            ))
+        with transaction.atomic():
+            for evento in Evento.objects.bulk_create(lote):
+                ids_por_esporte[evento.esporte].append(evento.pk)
+
+    return ids_por_esporte
+
+
+def gerar_dados(estatisticas: int, semente: int = 0, tamanho_lote: int = 5000,
+                atletas: int = None, eventos: int = None) -> dict:
+    """
+    Gera atletas, eventos e estatísticas válidos em escala configurável.
+
+    As estatísticas são produzidas e gravadas em lotes, de modo que o consumo
+    de memória não cresce com o total (apenas os ids de atletas e eventos
+    ficam em memória). Ao final o indicador ``estrangeiro`` das novas
+    estatísticas é calculado e os resumos dos atletas são reconstruídos.
+
+    Args:
+        estatisticas: Quantidade de estatísticas a gerar
+        semente: Semente do gerador aleatório (mesma semente, mesmos dados)
+        tamanho_lote: Quantidade de linhas gravadas por transação
+        atletas: Quantidade de atletas (padrão: estatisticas / 20, no mínimo
+            um por esporte)
+        eventos: Quantidade de eventos (padrão: estatisticas / 200, no mínimo
+            um por esporte)
+
+    Returns:
+        Dicionário com as quantidades geradas de cada modelo
+
+    Raises:
+        ValueError: Se alguma quantidade não for positiva ou se atletas ou
+            eventos forem menos que len(ESPORTES)
+    """
+    if atletas is None:
+        atletas = max(estatisticas // ESTATISTICAS_POR_ATLETA, len(ESPORTES))
+    if eventos is None:
+        eventos = max(estatisticas // ESTATISTICAS_POR_EVENTO, len(ESPORTES))
+    if min(estatisticas, atletas, eventos, tamanho_lote) < 1:
+        raise ValueError('Quantidades e tamanho do lote devem ser positivos')
+    if min(atletas, eventos) < len(ESPORTES):
+        # As estatísticas de cada esporte precisam de atletas e eventos daquele esporte
+        raise ValueError(f'Atletas e eventos devem ser ao menos {len(ESPORTES)}, um por esporte')
+
+    rng = random.Random(semente)
+    hoje = date.today()
+
+    atletas_por_esporte = gerar_atletas(atletas, rng, hoje, tamanho_lote)
+    eventos_por_esporte = gerar_eventos(eventos, rng, hoje, tamanho_lote)
+
+    ultima_estatistica = Estatistica.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    for inicio in range(0, estatisticas, tamanho_lote):
+        lote = []
+        for n in range(inicio, min(inicio + tamanho_lote, estatisticas)):
+            esporte = ESPORTES[n % len(ESPORTES)]
+            lote.append(Estatistica(
+                atleta_id=rng.choice(atletas_por_esporte[esporte]),
+                evento_id=rng.choice(eventos_por_esporte[esporte]),
+                observacoes='Gerado automaticamente\nSegunda linha' if n % 10 == 0 else '',
+                **gerar_campos_estatistica(esporte, rng)
+            ))
+        with transaction.atomic():
+            Estatistica.objects.bulk_create(lote)
+
+    Estatistica.objects.atualizar_estrangeiro(pk__gt=ultima_estatistica)
+    ResumoAtleta.objects.reconstruir()
+
+    # bulk_create não envia post_save
+    for modelo in (Atleta, Evento, Estatistica):
+        invalidar_ao_confirmar(modelo)
+
+    return {'atletas': atletas, 'eventos': eventos, 'estatisticas': estatisticas}
@@ -0,0 +1,254 @@
+"""
+Instrumentação SQL dos métodos de consulta dos managers.
+
+Quando ``ANALISE_INSTRUMENTACAO`` está ativo, cada método decorado com
+``@instrumentado`` é medido com ``connection.execute_wrapper``: quantidade de
+consultas, tempo total em SQL, tempo em Python e linhas retornadas. Os totais
+por método ficam em ``relatorio_instrumentacao()`` e o
+InstrumentacaoConsultasMiddleware os devolve em cabeçalhos da resposta.
+
+Consultas mais lentas que ``ANALISE_CONSULTA_LENTA_MS`` são registradas no
+logger 'analise.consultas_lentas' com o SQL e a saída do EXPLAIN.
+
+A instrumentação nunca avalia o resultado: as linhas são contadas apenas em
+listas e dicionários. QuerySets ainda não avaliados (preguiçosos, projetados
+ou paginados pela view) são registrados com ``linhas=None`` e as consultas
+que executarem depois não são atribuídas ao método.
+Os métodos assíncronos (abuscar_*) são medidos da mesma forma, com amedir.
+"""
+import inspect
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, models
+
+logger_consultas_lentas = logging.getLogger('analise.consultas_lentas')
+
+# Medições em andamento no contexto atual (a mais interna por último)
+_medicoes_ativas = ContextVar('analise_medicoes_ativas', default=())
+
+# Evita instrumentar o EXPLAIN executado pelo próprio registro de consulta lenta
+_explicando = threading.local()
+
+_totais = {}
+_trava_totais = threading.Lock()
+
+# Quantidade de medições ativas que usam o wrapper de cada conexão
+_usos_wrapper = weakref.WeakKeyDictionary()
+_trava_wrappers = threading.Lock()
+
+
+def instrumentacao_ativa() -> bool:
+    return getattr(settings, 'ANALISE_INSTRUMENTACAO', False)
+
+
+class Medicao:
+    """
+    Totais de uma medição: consultas, tempo em SQL, tempo total e linhas
+    (None se o resultado não foi avaliado)
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.consultas = 0
+        self.tempo_sql = 0.0
+        self.tempo_total = 0.0
+        self.linhas = None
+
+    @property
+    def tempo_python(self) -> float:
+        return max(self.tempo_total - self.tempo_sql, 0.0)
+
+
+def _registrar_execucao(execute, sql, params, many, context):
+    """execute_wrapper que contabiliza a consulta em todas as medições ativas"""
+    if getattr(_explicando, 'ativo', False):
+        return execute(sql, params, many, context)
+
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracao = time.perf_counter() - inicio
+        for medicao in _medicoes_ativas.get():
+            medicao.consultas += 1
+            medicao.tempo_sql += duracao
+
+        limiar = getattr(settings, 'ANALISE_CONSULTA_LENTA_MS', 200)
+        if limiar is not None and duracao * 1000 >= limiar:
+            _registrar_consulta_lenta(context['connection'], sql, params, many, duracao)
+
+
+def _registrar_consulta_lenta(connection, sql, params, many, duracao):
+    """Registra o SQL e o plano de execução de uma consulta lenta"""
+    plano = '(não disponível)'
+    if not many and sql.lstrip().upper().startswith('SELECT'):
+        prefixo = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+        _explicando.ativo = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefixo} {sql}', params)
+                plano = '\n'.join(' '.join(str(coluna) for coluna in linha) for linha in cursor.fetchall())
+        except Exception as e:
+            plano = f'(falha ao executar {prefixo}: {e})'
+        finally:
+            _explicando.ativo = False
+
+    logger_consultas_lentas.warning(
+        'Consulta lenta (%.1f ms) em %s\nSQL: %s\nParâmetros: %r\nPlano:\n%s',
+        duracao * 1000,
+        ' > '.join(medicao.nome for medicao in _medicoes_ativas.get()) or '-',
+        sql,
+        params,
+        plano,
+    )
+
+
+@contextmanager
+def medir(nome: str):
+    """
+    Mede as consultas executadas no bloco, em todas as conexões configuradas.
+
+    Args:
+        nome: Identificação da medição (ex.: 'Atleta.buscar_participantes')
+
+    Yields:
+        Objeto Medicao, preenchido ao final do bloco
+    """
+    medicao = Medicao(nome)
+    token = _medicoes_ativas.set(_medicoes_ativas.get() + (medicao,))
+    inicio = time.perf_counter()
+    conexoes = _instalar_wrappers()
+
+    try:
+        yield medicao
+    finally:
+        medicao.tempo_total = time.perf_counter() - inicio
+        _medicoes_ativas.reset(token)
+        _remover_wrappers(conexoes)
+
+
+@asynccontextmanager
+async def amedir(nome: str):
+    """
+    Versão assíncrona de medir. O ORM assíncrono executa as consultas com as
+    conexões da thread de sync_to_async, por isso o wrapper é instalado nelas.
+    """
+    medicao = Medicao(nome)
+    token = _medicoes_ativas.set(_medicoes_ativas.get() + (medicao,))
+    inicio = time.perf_counter()
+    conexoes = await sync_to_async(_instalar_wrappers)()
+
+    try:
+        yield medicao
+    finally:
+        medicao.tempo_total = time.perf_counter() - inicio
+        _medicoes_ativas.reset(token)
+        await sync_to_async(_remover_wrappers)(conexoes)
+
+
+def _instalar_wrappers() -> list:
+    """
+    Instala _registrar_execucao nas conexões da thread atual. Medições aninhadas
+    ou concorrentes (tarefas assíncronas compartilham a conexão) usam o mesmo
+    wrapper, removido apenas quando a última delas termina.
+    """
+    conexoes = connections.all()
+    with _trava_wrappers:
+        for connection in conexoes:
+            usos = _usos_wrapper.get(connection, 0)
+            if not usos:
+                connection.execute_wrappers.append(_registrar_execucao)
+            _usos_wrapper[connection] = usos + 1
+    return conexoes
+
+
+def _remover_wrappers(conexoes: list) -> None:
+    with _trava_wrappers:
+        for connection in conexoes:
+            _usos_wrapper[connection] -= 1
+            if not _usos_wrapper[connection]:
+                del _usos_wrapper[connection]
+                connection.execute_wrappers.remove(_registrar_execucao)
+
+
+def _contar_linhas(resultado):
+    """Linhas do resultado, ou None se ele for um QuerySet ainda não avaliado"""
+    if isinstance(resultado, models.QuerySet):
+        # len() executaria a consulta inteira, mesmo que a view só use uma página
+        return None if resultado._result_cache is None else len(resultado._result_cache)
+    if isinstance(resultado, dict):
+        contagens = [_contar_linhas(valor) for valor in resultado.values()]
+        return None if None in contagens else sum(contagens)
+    if isinstance(resultado, (list, tuple)):
+        return len(resultado)
+    return 0 if resultado is None else 1
+
+
+def _acumular(medicao: Medicao) -> None:
+    with _trava_totais:
+        totais = _totais.setdefault(medicao.nome, {
+            'chamadas': 0, 'consultas': 0, 'linhas': 0, 'tempo_sql': 0.0, 'tempo_python': 0.0,
+        })
+        totais['chamadas'] += 1
+        totais['consultas'] += medicao.consultas
+        if medicao.linhas is not None:
+            totais['linhas'] += medicao.linhas
+        totais['tempo_sql'] += medicao.tempo_sql
+        totais['tempo_python'] += medicao.tempo_python
+
+
+def instrumentado(metodo):
+    """
+    Decorator para métodos de manager, síncronos ou assíncronos; sem efeito se
+    a instrumentação estiver desativada. O resultado nunca é avaliado pelo
+    decorator (ver _contar_linhas).
+    """
+    if inspect.iscoroutinefunction(metodo):
+        @wraps(metodo)
+        async def wrapper_assincrono(self, *args, **kwargs):
+            if not instrumentacao_ativa():
+                return await metodo(self, *args, **kwargs)
+
+            async with amedir(f'{self.model.__name__}.{metodo.__name__}') as medicao:
+                resultado = await metodo(self, *args, **kwargs)
+                medicao.linhas = _contar_linhas(resultado)
+            _acumular(medicao)
+            return resultado
+
+        return wrapper_assincrono
+
+    @wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        if not instrumentacao_ativa():
+            return metodo(self, *args, **kwargs)
+
+        with medir(f'{self.model.__name__}.{metodo.__name__}') as medicao:
+            resultado = metodo(self, *args, **kwargs)
+            medicao.linhas = _contar_linhas(resultado)
+        _acumular(medicao)
+        return resultado
+
+    return wrapper
+
+
+def relatorio_instrumentacao() -> dict:
+    """
+    Totais acumulados por método desde o início do processo (ou do último
+    zerar_instrumentacao): chamadas, consultas, linhas, tempo_sql e tempo_python
+    (em segundos).
+    """
+    with _trava_totais:
+        return {nome: dict(totais) for nome, totais in _totais.items()}
+
+
+def zerar_instrumentacao() -> None:
+    with _trava_totais:
+        _totais.clear()
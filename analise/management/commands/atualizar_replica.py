@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analise.replica import alias_replica, atualizar_replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Copia o banco principal sobre a réplica de leituras analíticas com a API de '
+        'backup online do SQLite; ver analise/replica.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            help='Repete a cópia a cada INTERVALO segundos até ser interrompido (padrão: copia uma vez)'
+        )
+        parser.add_argument(
+            '--paginas',
+            type=int,
+            default=-1,
+            help='Páginas copiadas por passo do backup (padrão: -1, tudo em um passo)'
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo']
+        if intervalo is not None and intervalo <= 0:
+            raise CommandError('--intervalo deve ser positivo')
+
+        while True:
+            inicio = time.perf_counter()
+            try:
+                atualizar_replica(paginas=options['paginas'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            decorrido = time.perf_counter() - inicio
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Réplica '{alias_replica()}' atualizada ({decorrido:.1f}s)."
+            ))
+            if intervalo is None:
+                return
+            time.sleep(max(intervalo - decorrido, 0))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analise.snapshot import exportar_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta as estatísticas em um snapshot colunar (um arquivo binário por coluna '
+        'e manifesto.json) para análises fora do ORM; ver analise/snapshot.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('diretorio', help='Diretório de destino do snapshot')
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=50000,
+            help='Quantidade de linhas lidas e gravadas por vez (padrão: 50000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['tamanho_lote'] < 1:
+            raise CommandError('--tamanho-lote deve ser positivo')
+
+        inicio = time.perf_counter()
+        manifesto = exportar_snapshot(options['diretorio'], tamanho_lote=options['tamanho_lote'])
+        decorrido = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot com {manifesto['linhas']} estatísticas gravado em {options['diretorio']} "
+            f"({decorrido:.1f}s)."
+        ))
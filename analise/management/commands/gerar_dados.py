@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analise.gerador import gerar_dados
+
+
+class Command(BaseCommand):
+    help = 'Gera atletas, eventos e estatísticas sintéticos válidos em escala configurável'
+
+    def add_arguments(self, parser):
+        parser.add_argument('estatisticas', type=int, help='Quantidade de estatísticas a gerar')
+        parser.add_argument('--semente', type=int, default=0, help='Semente do gerador (padrão: 0)')
+        parser.add_argument('--atletas', type=int, help='Quantidade de atletas (padrão: estatísticas / 20)')
+        parser.add_argument('--eventos', type=int, help='Quantidade de eventos (padrão: estatísticas / 200)')
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=5000,
+            help='Quantidade de linhas gravadas por transação (padrão: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            gerados = gerar_dados(
+                options['estatisticas'],
+                semente=options['semente'],
+                tamanho_lote=options['tamanho_lote'],
+                atletas=options['atletas'],
+                eventos=options['eventos'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Gerados {gerados['atletas']} atletas, {gerados['eventos']} eventos "
+            f"e {gerados['estatisticas']} estatísticas."
+        ))
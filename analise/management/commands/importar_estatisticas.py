@@ -0,0 +1,237 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from analise.models.atleta import Atleta
+from analise.models.evento import Evento
+from analise.models.estatistica import Estatistica
+from analise.models.progresso_importacao import ProgressoImportacao
+
+CAMPOS_INTEIROS = ('pontuacao', 'assistencias', 'faltas', 'cartoes', 'minutos_jogados')
+
+# Marca, no mapa de eventos, um (nome, data) compartilhado por mais de um evento
+EVENTO_AMBIGUO = object()
+
+# Ajustes do SQLite durante a carga; os valores anteriores são restaurados ao final
+PRAGMAS_CARGA = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': '-262144',  # 256 MiB (valor negativo é em KiB)
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa estatísticas de um arquivo CSV ou JSON Lines em lotes transacionais. '
+        'Cada linha referencia o atleta pela coluna atleta_cpf e o evento por '
+        'evento_nome + evento_data (AAAA-MM-DD); as demais colunas são os campos da '
+        'estatística. Uma importação interrompida é retomada após o último lote confirmado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo .csv ou .jsonl')
+        parser.add_argument(
+            '--formato',
+            choices=['csv', 'jsonl'],
+            help='Formato do arquivo (padrão: deduzido da extensão)'
+        )
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=10000,
+            help='Quantidade de linhas por transação (padrão: 10000)'
+        )
+        parser.add_argument(
+            '--reiniciar',
+            action='store_true',
+            help='Ignora o progresso salvo e importa o arquivo desde o início'
+        )
+        parser.add_argument(
+            '--sem-ajustes-sqlite',
+            action='store_true',
+            help='Não altera journal_mode/synchronous/cache_size durante a carga'
+        )
+
+    def handle(self, *args, **options):
+        caminho = os.path.abspath(options['arquivo'])
+        if not os.path.isfile(caminho):
+            raise CommandError(f'Arquivo não encontrado: {caminho}')
+
+        formato = options['formato'] or os.path.splitext(caminho)[1].lstrip('.').lower()
+        if formato not in ('csv', 'jsonl'):
+            raise CommandError('Não foi possível deduzir o formato; use --formato csv ou jsonl')
+
+        tamanho_lote = options['tamanho_lote']
+        if tamanho_lote < 1:
+            raise CommandError('--tamanho-lote deve ser positivo')
+
+        if options['reiniciar']:
+            ProgressoImportacao.objects.filter(arquivo=caminho).delete()
+        progresso, _ = ProgressoImportacao.objects.get_or_create(arquivo=caminho)
+
+        if progresso.concluido:
+            self.stdout.write(f'{caminho} já foi importado; use --reiniciar para importar novamente.')
+            return
+        if progresso.linhas_confirmadas:
+            self.stdout.write(f'Retomando após a linha {progresso.linhas_confirmadas}.')
+
+        # Mapas em memória para resolver as chaves naturais sem consultas por linha
+        atletas = dict(Atleta.objects.values_list('cpf', 'id').iterator())
+        eventos = {}
+        for nome, data, pk in Evento.objects.values_list('nome', 'data', 'id').iterator():
+            chave = (nome, data.isoformat())
+            eventos[chave] = EVENTO_AMBIGUO if chave in eventos else pk
+
+        totais = {'importadas': 0, 'invalidas': 0}
+        inicio = time.perf_counter()
+
+        with self._ajustes_sqlite(desativado=options['sem_ajustes_sqlite']):
+            lote = []
+            for numero, registro in self._ler(caminho, formato):
+                if numero <= progresso.linhas_confirmadas:
+                    continue
+                lote.append((numero, registro))
+                if len(lote) == tamanho_lote:
+                    self._gravar_lote(lote, atletas, eventos, progresso, totais, inicio)
+                    lote = []
+            if lote:
+                self._gravar_lote(lote, atletas, eventos, progresso, totais, inicio)
+
+        progresso.concluido = True
+        progresso.save(update_fields=['concluido', 'atualizado_em'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Importação concluída: {totais['importadas']} estatísticas importadas, "
+            f"{totais['invalidas']} linhas inválidas."
+        ))
+
+    def _ler(self, caminho, formato):
+        """Gera (número da linha de dados, dicionário) lendo o arquivo em streaming"""
+        with open(caminho, encoding='utf-8', newline='') as arquivo:
+            if formato == 'csv':
+                yield from enumerate(csv.DictReader(arquivo), start=1)
+            else:
+                numero = 0
+                for texto in arquivo:
+                    if not texto.strip():
+                        continue
+                    numero += 1
+                    try:
+                        yield numero, json.loads(texto)
+                    except json.JSONDecodeError:
+                        yield numero, None
+
+    def _converter(self, registro, atletas, eventos) -> dict:
+        """
+        Converte um registro do arquivo nos campos de Estatistica.
+
+        Raises:
+            ValueError: Se o registro for inválido ou referenciar atleta/evento
+                inexistente, ou um evento que não é identificado por nome e data
+        """
+        if not isinstance(registro, dict):
+            raise ValueError('Linha mal formada')
+
+        atleta_id = atletas.get(str(registro.get('atleta_cpf') or ''))
+        if atleta_id is None:
+            raise ValueError(f"Atleta com CPF {registro.get('atleta_cpf')!r} não encontrado")
+
+        evento_id = eventos.get((registro.get('evento_nome'), registro.get('evento_data')))
+        if evento_id is None:
+            raise ValueError(
+                f"Evento {registro.get('evento_nome')!r} em {registro.get('evento_data')!r} não encontrado"
+            )
+        if evento_id is EVENTO_AMBIGUO:
+            raise ValueError(
+                f"Há mais de um evento {registro.get('evento_nome')!r} em {registro.get('evento_data')!r}"
+            )
+
+        linha = {'atleta_id': atleta_id, 'evento_id': evento_id}
+        for campo in CAMPOS_INTEIROS:
+            valor = registro.get(campo)
+            linha[campo] = None if valor in (None, '') else self._inteiro(campo, valor)
+
+        distancia = registro.get('distancia')
+        try:
+            linha['distancia'] = None if distancia in (None, '') else Decimal(str(distancia))
+        except InvalidOperation:
+            raise ValueError(f'Distância inválida: {distancia!r}')
+
+        linha['observacoes'] = registro.get('observacoes') or ''
+        return linha
+
+    def _inteiro(self, campo, valor) -> int:
+        """
+        Converte o valor de um campo inteiro sem truncar casas decimais.
+
+        Raises:
+            ValueError: Se o valor não for numérico ou não for inteiro (ex.: "3.7")
+        """
+        try:
+            numero = Decimal(str(valor).strip())
+        except InvalidOperation:
+            raise ValueError(f'{campo} inválido: {valor!r}')
+        if not numero.is_finite() or numero != numero.to_integral_value():
+            raise ValueError(f'{campo} deve ser inteiro: {valor!r}')
+        return int(numero)
+
+    def _gravar_lote(self, lote, atletas, eventos, progresso, totais, inicio):
+        """Valida e grava um lote e avança o progresso na mesma transação"""
+        numeros = []
+        linhas = []
+        erros = {}
+
+        for numero, registro in lote:
+            try:
+                linhas.append(self._converter(registro, atletas, eventos))
+                numeros.append(numero)
+            except ValueError as e:
+                erros[numero] = [str(e)]
+
+        with transaction.atomic():
+            if linhas:
+                criadas, invalidas = Estatistica.objects.bulk_registrar(linhas, tamanho_lote=len(linhas))
+                totais['importadas'] += len(criadas)
+                for indice, mensagens in invalidas.items():
+                    erros[numeros[indice]] = mensagens
+
+            progresso.linhas_confirmadas = lote[-1][0]
+            progresso.save(update_fields=['linhas_confirmadas', 'atualizado_em'])
+
+        totais['invalidas'] += len(erros)
+        for numero in sorted(erros):
+            self.stderr.write(f"Linha {numero}: {'; '.join(erros[numero])}")
+
+        decorrido = time.perf_counter() - inicio
+        processadas = totais['importadas'] + totais['invalidas']
+        self.stdout.write(
+            f"Linha {progresso.linhas_confirmadas}: {totais['importadas']} importadas, "
+            f"{totais['invalidas']} inválidas ({processadas / decorrido:,.0f} linhas/s)"
+        )
+
+    @contextmanager
+    def _ajustes_sqlite(self, desativado=False):
+        """Aplica PRAGMAS_CARGA no SQLite e restaura os valores anteriores ao final"""
+        if desativado or connection.vendor != 'sqlite' or connection.in_atomic_block:
+            yield
+            return
+
+        with connection.cursor() as cursor:
+            anteriores = {}
+            for pragma, valor in PRAGMAS_CARGA.items():
+                cursor.execute(f'PRAGMA {pragma}')
+                anteriores[pragma] = cursor.fetchone()[0]
+                cursor.execute(f'PRAGMA {pragma} = {valor}')
+
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                for pragma, valor in anteriores.items():
+                    cursor.execute(f'PRAGMA {pragma} = {valor}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from analise.models.resumo_atleta import ResumoAtleta
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói a tabela ResumoAtleta a partir de todas as estatísticas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=500,
+            help='Quantidade de atletas recalculados por consulta (padrão: 500)'
+        )
+
+    def handle(self, *args, **options):
+        total = ResumoAtleta.objects.reconstruir(tamanho_lote=options['tamanho_lote'])
+        self.stdout.write(self.style.SUCCESS(f'{total} resumos reconstruídos.'))
@@ -1,4 +1,5 @@
 from .atleta_manager import AtletaManager
 from .evento_manager import EventoManager
+from .estatistica_manager import EstatisticaManager
 
-__all__ = ['AtletaManager', 'EventoManager']
\ No newline at end of file
+__all__ = ['AtletaManager', 'EventoManager', 'EstatisticaManager']
\ No newline at end of file
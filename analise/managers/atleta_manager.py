@@ -1,41 +1,111 @@
+from django.core.exceptions import FieldError
 from django.db import models
+from django.db.models.functions import Rank
+from django.utils.translation import gettext_lazy as _
 from datetime import date
+from ..cache import ConsultasEmCacheMixin
+from ..instrumentacao import instrumentado
+from ..replica import leitura_replica
 
 
-class AtletaManager(models.Manager):
+class MotivoInelegibilidade(models.TextChoices):
+    """Motivos de verificar_elegibilidade, na ordem em que são verificados"""
+    INATIVO = 'INATIVO', _('atleta inativo')
+    ESPORTE = 'ESPORTE', _('esporte diferente do evento')
+    IDADE = 'IDADE', _('menos de 12 anos na data do evento')
+
+
+class AtletaManager(ConsultasEmCacheMixin, models.Manager):
     """
     Manager customizado para o modelo Atleta com métodos de consulta específicos.
     """
     
-    def buscar_corredores_vencedores(self, data: date) -> list:
+    # Consultas disponíveis em Atleta.objects.em_cache()
+    metodos_em_cache = (
+        'buscar_corredores_vencedores',
+        'buscar_maiores_pontuadores_eventos_oficiais',
+        'buscar_ranking_eventos_oficiais',
+        'buscar_participantes',
+    )
+    # Maiores pontuadores e ranking leem ResumoAtleta, reconstruído sem sinais
+    modelos_dependentes = ConsultasEmCacheMixin.modelos_dependentes + ('analise.ResumoAtleta',)
+    
+    @instrumentado
+    @leitura_replica
+    def buscar_corredores_vencedores(self, data: date, *, preguicoso: bool = False, campos=None):
         """
         Consulta atletas de corrida que ganharam alguma prova (pontuacao = 1)
         em eventos realizados desde a data informada.
         
         Args:
             data: Data a partir da qual buscar eventos
+            preguicoso: Retorna o QuerySet sem avaliá-lo (ver _resultado)
+            campos: Campos projetados; cada atleta vira um dicionário só com eles
             
         Returns:
-            Lista de objetos Atleta que são corredores vencedores
+            Lista de objetos Atleta que são corredores vencedores, ou QuerySet
+            se preguicoso
             
         Raises:
-            ValueError: Se data for None ou inválida
+            ValueError: Se data for None ou inválida, ou campos for inválido
+        """
+        return self._resultado(self._consultar_corredores_vencedores(data), preguicoso, campos)
+    
+    @instrumentado
+    @leitura_replica
+    async def abuscar_corredores_vencedores(self, data: date) -> list:
+        """Versão assíncrona de buscar_corredores_vencedores"""
+        return [atleta async for atleta in self._consultar_corredores_vencedores(data)]
+    
+    def _resultado(self, consulta: models.QuerySet, preguicoso: bool, campos):
         """
+        Aplica a projeção e o modo de retorno dos métodos que devolvem listas.
+        
+        Com ``preguicoso`` o QuerySet é devolvido sem ser avaliado: pode ser
+        fatiado (LIMIT), contado, filtrado ou percorrido com iterator(). Com
+        ``campos`` apenas essas colunas são lidas, em dicionários (values()),
+        sem instanciar Atleta.
+        """
+        if campos is not None:
+            campos = list(campos)
+            if not campos:
+                raise ValueError('Campos deve ter ao menos um campo')
+            # DISTINCT sobre poucas colunas juntaria atletas diferentes (ex.: mesmo
+            # nome); a junção que repete atletas fica na subconsulta
+            if consulta.query.distinct:
+                consulta = self.filter(pk__in=consulta.values('pk'))
+            try:
+                consulta = consulta.values(*campos)
+            except FieldError as e:
+                raise ValueError(f'Campos inválidos: {e}') from e
+        
+        if preguicoso:
+            # Fixa o banco da leitura (réplica ou 'default') antes de o QuerySet sair do método
+            return consulta.using(consulta.db)
+        return list(consulta)
+    
+    def _consultar_corredores_vencedores(self, data: date) -> models.QuerySet:
+        """QuerySet de buscar_corredores_vencedores e abuscar_corredores_vencedores"""
         if not data or not isinstance(data, date):
             raise ValueError('Data deve ser um objeto date válido')
         
         from ..models.esporte import Esporte
         
-        # Buscar atletas de corrida que têm estatísticas com pontuação = 1
-        # (colocação = 1º lugar) em eventos desde a data informada
-        atletas = self.filter(
-            esporte=Esporte.CORRIDA,
-            estatisticas__pontuacao=1,
-            estatisticas__evento__data__gte=data
-        ).distinct()
+        from ..models.estatistica import Estatistica
         
-        return list(atletas)
+        # Buscar atletas de corrida que têm estatísticas com pontuação = 1
+        # (colocação = 1º lugar) em eventos desde a data informada. EXISTS em
+        # vez de junção com DISTINCT: a consulta paginada pela API percorre o
+        # índice (nome, id) na ordem da página, sem ordenar todos os vencedores
+        vitorias = Estatistica.objects.filter(
+            atleta=models.OuterRef('pk'),
+            pontuacao=1,
+            evento__data__gte=data
+        )
+        return self.filter(models.Exists(vitorias), esporte=Esporte.CORRIDA)
     
+    @instrumentado
+    @leitura_replica
     def buscar_maiores_pontuadores_eventos_oficiais(self, esporte) -> models.QuerySet:
         """
         Consulta atletas que possuem a maior pontuação em eventos oficiais.
@@ -50,77 +120,289 @@ class AtletaManager(models.Manager):
         Raises:
             ValueError: Se esporte for None ou inválido
         """
+        melhor_pontuacao = self._melhor_pontuacao_oficial(esporte).first()
+        atletas = self._consultar_maiores_pontuadores(esporte, melhor_pontuacao)
+        # Fixa o banco da leitura (réplica ou 'default') antes de o QuerySet sair do método
+        return atletas.using(atletas.db)
+    
+    @instrumentado
+    @leitura_replica
+    async def abuscar_maiores_pontuadores_eventos_oficiais(self, esporte) -> list:
+        """Versão assíncrona de buscar_maiores_pontuadores_eventos_oficiais; retorna uma lista"""
+        melhor_pontuacao = await self._melhor_pontuacao_oficial(esporte).afirst()
+        return [
+            atleta async for atleta in self._consultar_maiores_pontuadores(esporte, melhor_pontuacao)
+        ]
+    
+    def _melhor_pontuacao_oficial(self, esporte) -> models.QuerySet:
+        """QuerySet das melhores pontuações oficiais do esporte, da melhor para a pior"""
         if not esporte:
             raise ValueError('Esporte deve ser informado')
         
         from ..models.esporte import Esporte
+        from ..models.resumo_atleta import ResumoAtleta
         
-        # Filtrar atletas do esporte em eventos oficiais
-        atletas_com_stats = self.filter(
-            esporte=esporte,
-            estatisticas__evento__oficial=True
-        ).distinct()
+        # A melhor pontuação oficial de cada atleta é mantida em ResumoAtleta;
+        # para corrida, menor pontuação é melhor (1º lugar = 1)
+        ordem = 'melhor_pontuacao_oficial'
+        if esporte != Esporte.CORRIDA:
+            ordem = '-' + ordem
         
-        if not atletas_com_stats.exists():
+        return ResumoAtleta.objects.filter(
+            esporte=esporte,
+            atleta__esporte=esporte,
+            melhor_pontuacao_oficial__isnull=False
+        ).order_by(ordem).values_list('melhor_pontuacao_oficial', flat=True)
+    
+    def _consultar_maiores_pontuadores(self, esporte, melhor_pontuacao) -> models.QuerySet:
+        """Atletas do esporte cuja melhor pontuação oficial é ``melhor_pontuacao``"""
+        if melhor_pontuacao is None:
             return self.none()
         
-        # Para corrida, menor pontuação é melhor (1º lugar = 1)
-        if esporte == Esporte.CORRIDA:
-            # Buscar a menor pontuação (melhor colocação)
-            melhor_pontuacao = self.filter(
-                esporte=esporte,
-                estatisticas__evento__oficial=True
-            ).aggregate(
-                melhor=models.Min('estatisticas__pontuacao')
-            )['melhor']
-            
-            if melhor_pontuacao is None:
-                return self.none()
-            
-            # Retornar atletas com essa pontuação
-            return self.filter(
-                esporte=esporte,
-                estatisticas__evento__oficial=True,
-                estatisticas__pontuacao=melhor_pontuacao
-            ).distinct()
+        # Retornar atletas com essa pontuação
+        return self.filter(
+            esporte=esporte,
+            resumos__esporte=esporte,
+            resumos__melhor_pontuacao_oficial=melhor_pontuacao
+        )
+    
+    @instrumentado
+    @leitura_replica
+    def buscar_ranking_eventos_oficiais(self, limite: int = 1) -> dict:
+        """
+        Consulta, em uma única instrução SQL, os atletas mais bem colocados de
+        cada esporte considerando apenas eventos oficiais.
         
-        else:
-            # Para outros esportes, maior pontuação é melhor
-            melhor_pontuacao = self.filter(
-                esporte=esporte,
-                estatisticas__evento__oficial=True
-            ).aggregate(
-                melhor=models.Max('estatisticas__pontuacao')
-            )['melhor']
+        A melhor pontuação de cada atleta é a menor para corrida (1º lugar = 1)
+        e a maior para os demais esportes, lida de ResumoAtleta. Os atletas são classificados com
+        RANK() por esporte, de modo que empates ocupam a mesma posição e todos
+        os empatados dentro do limite são retornados, como em
+        buscar_maiores_pontuadores_eventos_oficiais.
+        
+        Args:
+            limite: Quantidade de posições do ranking retornadas por esporte
             
-            if melhor_pontuacao is None:
-                return self.none()
+        Returns:
+            Dicionário {esporte: [Atleta, ...]} ordenado por posição. Cada atleta
+            é anotado com ``melhor_pontuacao`` e ``posicao``
             
-            return self.filter(
-                esporte=esporte,
-                estatisticas__evento__oficial=True,
-                estatisticas__pontuacao=melhor_pontuacao
-            ).distinct()
+        Raises:
+            ValueError: Se limite não for um inteiro positivo
+        """
+        ranking = {}
+        for atleta in self._ranking_eventos_oficiais(limite):
+            ranking.setdefault(atleta.esporte, []).append(atleta)
+        
+        return ranking
     
-    def buscar_participantes(self, evento) -> list:
+    @instrumentado
+    @leitura_replica
+    async def abuscar_ranking_eventos_oficiais(self, limite: int = 1) -> dict:
+        """Versão assíncrona de buscar_ranking_eventos_oficiais"""
+        ranking = {}
+        async for atleta in self._ranking_eventos_oficiais(limite):
+            ranking.setdefault(atleta.esporte, []).append(atleta)
+        
+        return ranking
+    
+    def _ranking_eventos_oficiais(self, limite: int = None) -> models.QuerySet:
+        """
+        QuerySet de atletas anotados com melhor pontuação oficial e posição no
+        esporte, restrito às ``limite`` primeiras posições quando informado.
+        """
+        if limite is not None and (not isinstance(limite, int) or limite < 1):
+            raise ValueError('Limite deve ser um inteiro positivo')
+        
+        from ..models.esporte import Esporte
+        
+        eh_corrida = models.Q(esporte=Esporte.CORRIDA)
+        
+        # A melhor pontuação oficial vem do ResumoAtleta do próprio esporte do atleta
+        ranking = self.filter(
+            resumos__esporte=models.F('esporte'),
+            resumos__melhor_pontuacao_oficial__isnull=False
+        ).annotate(
+            melhor_pontuacao=models.F('resumos__melhor_pontuacao_oficial')
+        ).annotate(
+            posicao=models.Window(
+                expression=Rank(),
+                partition_by=models.F('esporte'),
+                # Ordenação crescente para corrida e decrescente para os demais
+                order_by=models.Case(
+                    models.When(eh_corrida, then=models.F('melhor_pontuacao')),
+                    default=-models.F('melhor_pontuacao')
+                ).asc()
+            )
+        ).order_by('esporte', 'posicao', 'nome')
+        
+        if limite is not None:
+            ranking = ranking.filter(posicao__lte=limite)
+        return ranking
+    
+    @instrumentado
+    @leitura_replica
+    def buscar_participantes(self, evento, *, preguicoso: bool = False, campos=None):
         """
         Consulta os atletas que participaram de um evento específico.
         
         Args:
             evento: Objeto Evento
+            preguicoso: Retorna o QuerySet sem avaliá-lo (ver _resultado)
+            campos: Campos projetados; cada atleta vira um dicionário só com eles
             
         Returns:
-            Lista de objetos Atleta que participaram do evento
+            Lista de objetos Atleta que participaram do evento, ou QuerySet
+            se preguicoso
             
         Raises:
-            ValueError: Se evento for None
+            ValueError: Se evento for None, ou campos for inválido
         """
+        return self._resultado(self._consultar_participantes(evento), preguicoso, campos)
+    
+    @instrumentado
+    @leitura_replica
+    async def abuscar_participantes(self, evento) -> list:
+        """Versão assíncrona de buscar_participantes"""
+        return [atleta async for atleta in self._consultar_participantes(evento)]
+    
+    def _consultar_participantes(self, evento) -> models.QuerySet:
+        """QuerySet de buscar_participantes e abuscar_participantes"""
         if not evento:
             raise ValueError('Evento deve ser informado')
         
         # Buscar atletas que têm estatísticas neste evento
-        atletas = self.filter(
+        return self.filter(
             estatisticas__evento=evento
         ).distinct()
+    
+    @instrumentado
+    @leitura_replica
+    def buscar_participantes_eventos(self, eventos) -> dict:
+        """
+        Consulta, em uma única instrução SQL, os participantes de vários eventos.
         
-        return list(atletas)
\ No newline at end of file
+        Args:
+            eventos: Iterável de objetos Evento ou ids
+            
+        Returns:
+            Dicionário {evento_id: [Atleta, ...]} com todos os eventos informados
+            (lista vazia para eventos sem participantes), atletas ordenados por id
+            
+        Raises:
+            ValueError: Se eventos for None
+        """
+        participantes, consulta = self._consultar_participantes_eventos(eventos)
+        for atleta in consulta:
+            participantes[atleta.evento_participado].append(atleta)
+        return participantes
+    
+    @instrumentado
+    @leitura_replica
+    async def abuscar_participantes_eventos(self, eventos) -> dict:
+        """Versão assíncrona de buscar_participantes_eventos"""
+        participantes, consulta = self._consultar_participantes_eventos(eventos)
+        async for atleta in consulta:
+            participantes[atleta.evento_participado].append(atleta)
+        return participantes
+    
+    def _consultar_participantes_eventos(self, eventos) -> tuple:
+        """Dicionário vazio de cada evento e QuerySet de atletas anotados com ``evento_participado``"""
+        if eventos is None:
+            raise ValueError('Eventos devem ser informados')
+        
+        participantes = {getattr(evento, 'pk', evento): [] for evento in eventos}
+        if not participantes:
+            return participantes, self.none()
+        
+        # O filtro e a anotação usam a mesma junção com estatísticas; o DISTINCT
+        # elimina as repetições de um atleta com várias estatísticas no mesmo evento
+        consulta = self.filter(
+            estatisticas__evento__in=list(participantes)
+        ).annotate(
+            evento_participado=models.F('estatisticas__evento')
+        ).distinct().order_by('evento_participado', 'pk')
+        return participantes, consulta
+    
+    @instrumentado
+    def verificar_elegibilidade(self, evento, atletas) -> tuple:
+        """
+        Verifica, em uma única instrução SQL, quais atletas podem ser inscritos
+        no evento: ativos, do esporte do evento e com ao menos 12 anos na data
+        do evento (mesmas regras de Estatistica.clean).
+        
+        A idade é comparada com a data limite de nascimento calculada a partir
+        da data do evento, e não calculada linha a linha, para que a condição
+        use o índice (esporte, ativo, data_nascimento).
+        
+        Args:
+            evento: Objeto Evento (ou id, ao custo de uma consulta para carregá-lo)
+            atletas: Iterável de objetos Atleta ou ids, ou QuerySet de Atleta
+                (usado como subconsulta)
+            
+        Returns:
+            Tupla (elegiveis, inelegiveis) de listas de Atleta ordenadas por id.
+            Os inelegíveis são anotados com ``motivo_inelegibilidade``
+            (MotivoInelegibilidade); atletas inexistentes são ignorados
+            
+        Raises:
+            ValueError: Se evento ou atletas for None
+        """
+        if atletas is None:
+            raise ValueError('Atletas devem ser informados')
+        evento = self._evento_elegibilidade(evento)
+        
+        if isinstance(atletas, models.QuerySet):
+            ids = atletas.values('pk')
+        else:
+            ids = {getattr(atleta, 'pk', atleta) for atleta in atletas}
+            if not ids:
+                return [], []
+        
+        from ..models.validators import data_limite_nascimento
+        
+        # Um único motivo por atleta, na ordem de MotivoInelegibilidade
+        consulta = self.filter(pk__in=ids).annotate(
+            motivo_inelegibilidade=models.Case(
+                models.When(ativo=False, then=models.Value(MotivoInelegibilidade.INATIVO)),
+                models.When(~models.Q(esporte=evento.esporte), then=models.Value(MotivoInelegibilidade.ESPORTE)),
+                models.When(
+                    data_nascimento__gt=data_limite_nascimento(evento.data),
+                    then=models.Value(MotivoInelegibilidade.IDADE)
+                ),
+                default=None,
+                output_field=models.CharField()
+            )
+        ).order_by('pk')
+        
+        elegiveis, inelegiveis = [], []
+        for atleta in consulta:
+            (inelegiveis if atleta.motivo_inelegibilidade else elegiveis).append(atleta)
+        return elegiveis, inelegiveis
+    
+    def buscar_elegiveis(self, evento) -> models.QuerySet:
+        """
+        QuerySet de todos os atletas que podem ser inscritos no evento (ver
+        verificar_elegibilidade), resolvido pelo índice (esporte, ativo, data_nascimento).
+        
+        Raises:
+            ValueError: Se evento for None
+        """
+        from ..models.validators import data_limite_nascimento
+        
+        evento = self._evento_elegibilidade(evento)
+        return self.filter(
+            esporte=evento.esporte,
+            ativo=True,
+            data_nascimento__lte=data_limite_nascimento(evento.data)
+        )
+    
+    def _evento_elegibilidade(self, evento):
+        """Evento com data e esporte, carregado se for informado pelo id"""
+        if not evento:
+            raise ValueError('Evento deve ser informado')
+        if isinstance(evento, models.Model):
+            return evento
+        
+        from ..models.evento import Evento
+        return Evento.objects.db_manager(self.db).only('data', 'esporte').get(pk=evento)
+
@@ -0,0 +1,237 @@
+from collections import deque
+
+from django.db import connections, models, transaction
+from django.db.models.functions import Lag
+from django.core.exceptions import ValidationError
+from ..cache import ConsultasEmCacheMixin, invalidar_ao_confirmar
+from ..instrumentacao import instrumentado
+from ..replica import leitura_replica
+
+
+# Métricas com média móvel em buscar_serie_desempenho
+METRICAS_SERIE = ('pontuacao', 'assistencias', 'minutos_jogados')
+
+
+class EstatisticaManager(ConsultasEmCacheMixin, models.Manager):
+    """
+    Manager customizado para o modelo Estatistica com métodos de carga em lote
+    e séries de desempenho.
+    """
+
+    # Consultas disponíveis em Estatistica.objects.em_cache()
+    metodos_em_cache = (
+        'buscar_serie_desempenho',
+    )
+
+    @instrumentado
+    @leitura_replica
+    def buscar_serie_desempenho(self, atleta, janela: int = 5) -> list:
+        """
+        Série temporal do desempenho de um atleta, um item por estatística em
+        ordem de data do evento, com médias móveis das últimas ``janela``
+        participações (incluindo a atual).
+
+        A série é calculada em uma única consulta com funções de janela; em
+        bancos sem suporte a OVER, as médias são calculadas em Python sobre as
+        mesmas colunas.
+
+        Args:
+            atleta: Objeto Atleta ou id
+            janela: Quantidade de eventos de cada média móvel
+
+        Returns:
+            Lista de dicionários com evento_id, evento, data, esporte, as
+            métricas de METRICAS_SERIE, ``media_<métrica>`` de cada uma e
+            ``variacao_pontuacao`` (diferença para a participação anterior;
+            para corrida é a variação da colocação, negativa quando melhora)
+
+        Raises:
+            ValueError: Se atleta não for informado ou janela não for um inteiro positivo
+        """
+        if not atleta:
+            raise ValueError('Atleta deve ser informado')
+        if not isinstance(janela, int) or janela < 1:
+            raise ValueError('Janela deve ser um inteiro positivo')
+
+        # Ordem cronológica; evento e id desempatam eventos na mesma data
+        ordem = [models.F('evento__data').asc(), models.F('evento_id').asc(), models.F('id').asc()]
+        linhas = self.filter(atleta=atleta).annotate(
+            evento_nome=models.F('evento__nome'),
+            data=models.F('evento__data'),
+            esporte=models.F('evento__esporte'),
+        ).order_by(*ordem)
+        campos = ('evento_id', 'evento_nome', 'data', 'esporte') + METRICAS_SERIE
+
+        if not connections[self.db].features.supports_over_clause:
+            return _serie_em_python(linhas.values_list(*campos), janela)
+
+        medias = {
+            f'media_{metrica}': models.Window(
+                expression=models.Avg(metrica),
+                order_by=ordem,
+                frame=models.RowRange(start=-(janela - 1), end=0),
+            )
+            for metrica in METRICAS_SERIE
+        }
+        anterior = models.Window(expression=Lag('pontuacao'), order_by=ordem)
+
+        return [
+            _item_serie(linha[:len(campos)], linha[len(campos):-1], linha[-1])
+            for linha in linhas.annotate(**medias, pontuacao_anterior=anterior).values_list(
+                *campos, *medias, 'pontuacao_anterior'
+            )
+        ]
+
+    def bulk_registrar(self, linhas, tamanho_lote: int = 1000) -> tuple:
+        """
+        Registra várias estatísticas de uma vez, aplicando as mesmas regras de
+        validação do ``save()`` sem consultar atleta e evento linha a linha.
+
+        Os atletas e eventos referenciados são carregados do banco do manager
+        em poucas consultas (``in_bulk``) e compartilhados entre todas as linhas. As linhas válidas
+        são gravadas com ``bulk_create`` em lotes, cada lote em sua própria
+        transação junto com o recálculo dos resumos dos atletas do lote.
+
+        Args:
+            linhas: Iterável de dicionários com os campos da estatística. Atleta e
+                evento podem ser informados como objeto (``atleta``/``evento``)
+                ou como id (``atleta_id``/``evento_id``)
+            tamanho_lote: Quantidade de estatísticas gravadas por transação
+
+        Returns:
+            Tupla ``(criadas, erros)``: lista de Estatisticas gravadas e dicionário
+            que associa o índice de cada linha inválida às suas mensagens de erro
+
+        Raises:
+            ValueError: Se tamanho_lote não for positivo
+        """
+        if tamanho_lote < 1:
+            raise ValueError('Tamanho do lote deve ser positivo')
+
+        from ..models.atleta import Atleta
+        from ..models.evento import Evento
+        from ..models.resumo_atleta import ResumoAtleta
+
+        linhas = [self._normalizar_linha(linha) for linha in linhas]
+
+        # Atletas e eventos do mesmo banco em que as estatísticas serão gravadas
+        atletas = Atleta._base_manager.db_manager(self.db).in_bulk(
+            {linha['atleta_id'] for linha in linhas} - {None}
+        )
+        eventos = Evento._base_manager.db_manager(self.db).in_bulk(
+            {linha['evento_id'] for linha in linhas} - {None}
+        )
+
+        validas = []
+        erros = {}
+
+        for indice, linha in enumerate(linhas):
+            atleta = atletas.get(linha.pop('atleta_id'))
+            evento = eventos.get(linha.pop('evento_id'))
+
+            if atleta is None or evento is None:
+                erros[indice] = ['Atleta ou evento inexistente']
+                continue
+
+            try:
+                estatistica = self.model(
+                    atleta=atleta,
+                    evento=evento,
+                    estrangeiro=atleta.nacionalidade != evento.pais,
+                    **linha
+                )
+            except TypeError as e:
+                # Campo inexistente na linha
+                erros[indice] = [str(e)]
+                continue
+            try:
+                # As chaves estrangeiras já foram resolvidas acima
+                estatistica.full_clean(exclude=['atleta', 'evento'])
+            except ValidationError as e:
+                erros[indice] = e.messages
+                continue
+
+            validas.append(estatistica)
+
+        criadas = []
+        for inicio in range(0, len(validas), tamanho_lote):
+            lote = validas[inicio:inicio + tamanho_lote]
+            with transaction.atomic(using=self.db):
+                criadas.extend(self.bulk_create(lote))
+                ResumoAtleta.objects.db_manager(self.db).recalcular(
+                    {estatistica.atleta_id for estatistica in lote}
+                )
+        
+        # bulk_create não envia post_save
+        if criadas:
+            invalidar_ao_confirmar(self.model, self.db)
+
+        return criadas, erros
+
+    def atualizar_estrangeiro(self, **filtros) -> int:
+        """
+        Recalcula o indicador ``estrangeiro`` das estatísticas filtradas, usado
+        quando a nacionalidade do atleta ou o país do evento muda e após cargas
+        feitas com bulk_create. Apenas as linhas cujo valor muda são escritas.
+
+        Args:
+            **filtros: Filtros das estatísticas a recalcular (ex.: atleta=atleta)
+
+        Returns:
+            Quantidade de estatísticas alteradas
+        """
+        estatisticas = self.filter(**filtros)
+        mesmo_pais = models.Q(atleta__nacionalidade=models.F('evento__pais'))
+
+        return (
+            estatisticas.filter(mesmo_pais, estrangeiro=True).update(estrangeiro=False)
+            + estatisticas.exclude(mesmo_pais).filter(estrangeiro=False).update(estrangeiro=True)
+        )
+
+    @staticmethod
+    def _normalizar_linha(linha) -> dict:
+        """Converte atleta/evento da linha para atleta_id/evento_id."""
+        linha = dict(linha)
+        for campo in ('atleta', 'evento'):
+            if campo in linha:
+                valor = linha.pop(campo)
+                linha[f'{campo}_id'] = getattr(valor, 'pk', valor)
+            else:
+                linha.setdefault(f'{campo}_id', None)
+        return linha
+
+
+def _item_serie(valores, medias, pontuacao_anterior) -> dict:
+    """Monta um item de buscar_serie_desempenho a partir das colunas da consulta"""
+    evento_id, evento, data, esporte, *metricas = valores
+    item = {'evento_id': evento_id, 'evento': evento, 'data': data, 'esporte': esporte}
+    item.update(zip(METRICAS_SERIE, metricas))
+    item.update((f'media_{metrica}', media) for metrica, media in zip(METRICAS_SERIE, medias))
+
+    pontuacao = item['pontuacao']
+    item['variacao_pontuacao'] = (
+        None if pontuacao is None or pontuacao_anterior is None else pontuacao - pontuacao_anterior
+    )
+    return item
+
+
+def _serie_em_python(linhas, janela: int) -> list:
+    """Mesmo resultado das funções de janela, calculado sobre as linhas já ordenadas"""
+    recentes = deque(maxlen=janela)
+    serie = []
+    pontuacao_anterior = None
+
+    for valores in linhas:
+        metricas = valores[-len(METRICAS_SERIE):]
+        recentes.append(metricas)
+
+        medias = []
+        for indice in range(len(METRICAS_SERIE)):
+            # AVG ignora nulos, como no SQL
+            presentes = [linha[indice] for linha in recentes if linha[indice] is not None]
+            medias.append(sum(presentes) / len(presentes) if presentes else None)
+
+        serie.append(_item_serie(valores, medias, pontuacao_anterior))
+        pontuacao_anterior = metricas[0]
+
+    return serie
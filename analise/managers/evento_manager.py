@@ -1,12 +1,41 @@
 from django.db import models
 from datetime import date
+from ..cache import ConsultasEmCacheMixin
+from ..instrumentacao import instrumentado
+from ..replica import leitura_replica
 
 
-class EventoManager(models.Manager):
+def prefetch_participantes(queryset=None, to_attr=None) -> models.Prefetch:
+    """
+    Prefetch dos participantes de cada evento em uma consulta para todos os
+    eventos, sem repetir atletas com várias estatísticas no mesmo evento.
+    
+    Args:
+        queryset: QuerySet de Atleta a usar (ex.: com only() ou filtros)
+        to_attr: Atributo que recebe a lista (padrão: cache de evento.participantes.all())
+        
+    Returns:
+        Objeto Prefetch para ``prefetch_related``
+    """
+    if queryset is None:
+        from ..models.atleta import Atleta
+        queryset = Atleta.objects.all()
+    
+    return models.Prefetch('participantes', queryset=queryset.distinct(), to_attr=to_attr)
+
+
+class EventoManager(ConsultasEmCacheMixin, models.Manager):
     """
     Manager customizado para o modelo Evento com métodos de consulta específicos.
     """
     
+    # Consultas disponíveis em Evento.objects.em_cache()
+    metodos_em_cache = (
+        'buscar_evento_participantes_estrangeiros',
+    )
+    
+    @instrumentado
+    @leitura_replica
     def buscar_evento_participantes_estrangeiros(self, data: date) -> models.QuerySet:
         """
         Consulta eventos que tiveram participantes estrangeiros desde a data informada.
@@ -24,16 +53,34 @@ class EventoManager(models.Manager):
         Raises:
             ValueError: Se data for None ou inválida
         """
+        eventos = self._consultar_evento_participantes_estrangeiros(data)
+        # Fixa o banco da leitura (réplica ou 'default') antes de o QuerySet sair do método
+        return eventos.using(eventos.db)
+    
+    @instrumentado
+    @leitura_replica
+    async def abuscar_evento_participantes_estrangeiros(self, data: date) -> list:
+        """Versão assíncrona de buscar_evento_participantes_estrangeiros; retorna uma lista"""
+        return [evento async for evento in self._consultar_evento_participantes_estrangeiros(data)]
+    
+    def _consultar_evento_participantes_estrangeiros(self, data: date) -> models.QuerySet:
+        """QuerySet de buscar_evento_participantes_estrangeiros"""
         if not data or not isinstance(data, date):
             raise ValueError('Data deve ser um objeto date válido')
         
-        # Buscar eventos desde a data informada que têm estatísticas
-        # de atletas cuja nacionalidade é diferente do país do evento
-        eventos = self.filter(
-            data__gte=data,
-            estatisticas__atleta__isnull=False
-        ).exclude(
-            estatisticas__atleta__nacionalidade=models.F('pais')
-        ).distinct().order_by('-data')
+        from ..models.estatistica import Estatistica
         
-        return eventos
\ No newline at end of file
+        # O indicador estrangeiro é calculado ao gravar a estatística; a subconsulta
+        # usa estat_evento_estrangeiro_idx e o filtro por data usa evento_data_idx
+        return self.filter(
+            models.Exists(Estatistica.objects.filter(evento=models.OuterRef('pk'), estrangeiro=True)),
+            data__gte=data
+        ).order_by('-data')
+    
+    def com_participantes(self, queryset=None, to_attr=None) -> models.QuerySet:
+        """
+        Eventos com os participantes pré-carregados (ver prefetch_participantes):
+        iterar ``evento.participantes.all()`` não executa novas consultas.
+        """
+        return self.prefetch_related(prefetch_participantes(queryset, to_attr))
+
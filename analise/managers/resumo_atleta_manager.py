@@ -0,0 +1,117 @@
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+from ..cache import invalidar_ao_confirmar
+
+
+def _melhor(esporte, atual, nova):
+    """Retorna a melhor entre duas pontuações: a menor para corrida, a maior para os demais"""
+    from ..models.esporte import Esporte
+
+    if nova is None:
+        return atual
+    if atual is None:
+        return nova
+    return min(atual, nova) if esporte == Esporte.CORRIDA else max(atual, nova)
+
+
+class ResumoAtletaManager(models.Manager):
+    """
+    Manager customizado para o modelo ResumoAtleta com métodos de manutenção do resumo.
+    """
+
+    def registrar(self, estatistica):
+        """
+        Soma uma nova estatística ao resumo do atleta no esporte do evento.
+
+        Args:
+            estatistica: Objeto Estatistica recém-criado
+        """
+        esporte = estatistica.evento.esporte
+        pontuacao = estatistica.pontuacao
+
+        with transaction.atomic(using=self.db):
+            resumo, _ = self.select_for_update().get_or_create(
+                atleta_id=estatistica.atleta_id,
+                esporte=esporte
+            )
+            resumo.total_estatisticas += 1
+            resumo.total_pontuacao += pontuacao or 0
+            resumo.melhor_pontuacao = _melhor(esporte, resumo.melhor_pontuacao, pontuacao)
+            if estatistica.evento.oficial:
+                resumo.melhor_pontuacao_oficial = _melhor(
+                    esporte, resumo.melhor_pontuacao_oficial, pontuacao
+                )
+            resumo.save()
+
+    def recalcular(self, atleta_ids, tamanho_lote: int = 500):
+        """
+        Recalcula a partir das estatísticas os resumos dos atletas informados.
+
+        Usado quando uma estatística é alterada ou removida, casos em que a
+        melhor pontuação não pode ser atualizada incrementalmente.
+
+        Args:
+            atleta_ids: Iterável com os ids dos atletas
+            tamanho_lote: Quantidade de atletas recalculados por consulta
+        """
+        from ..models.estatistica import Estatistica
+        from ..models.esporte import Esporte
+
+        atleta_ids = list(set(atleta_ids))
+        oficial = models.Q(evento__oficial=True)
+
+        with transaction.atomic(using=self.db):
+            for inicio in range(0, len(atleta_ids), tamanho_lote):
+                lote = atleta_ids[inicio:inicio + tamanho_lote]
+
+                agregados = Estatistica.objects.using(self.db).filter(
+                    atleta_id__in=lote
+                ).values(
+                    'atleta_id', 'evento__esporte'
+                ).annotate(
+                    total=models.Count('id'),
+                    soma=Coalesce(models.Sum('pontuacao'), 0),
+                    menor=models.Min('pontuacao'),
+                    maior=models.Max('pontuacao'),
+                    menor_oficial=models.Min('pontuacao', filter=oficial),
+                    maior_oficial=models.Max('pontuacao', filter=oficial),
+                ).order_by()
+
+                resumos = []
+                for agregado in agregados:
+                    corrida = agregado['evento__esporte'] == Esporte.CORRIDA
+                    resumos.append(self.model(
+                        atleta_id=agregado['atleta_id'],
+                        esporte=agregado['evento__esporte'],
+                        total_estatisticas=agregado['total'],
+                        total_pontuacao=agregado['soma'],
+                        melhor_pontuacao=agregado['menor' if corrida else 'maior'],
+                        melhor_pontuacao_oficial=agregado['menor_oficial' if corrida else 'maior_oficial'],
+                    ))
+
+                self.filter(atleta_id__in=lote).delete()
+                self.bulk_create(resumos)
+
+    def reconstruir(self, tamanho_lote: int = 500) -> int:
+        """
+        Reconstrói todos os resumos a partir das estatísticas.
+
+        Args:
+            tamanho_lote: Quantidade de atletas recalculados por consulta
+
+        Returns:
+            Quantidade de resumos existentes ao final
+        """
+        from ..models.atleta import Atleta
+
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            self.recalcular(
+                Atleta.objects.filter(estatisticas__isnull=False).values_list('id', flat=True).distinct(),
+                tamanho_lote=tamanho_lote
+            )
+            # As consultas em cache de maiores pontuadores e ranking leem os resumos
+            invalidar_ao_confirmar(self.model, self.db)
+
+        return self.count()
@@ -0,0 +1,485 @@
+"""
+Motor de consultas em memória para as consultas dos managers.
+
+MotorConsultas carrega atletas, eventos e estatísticas em registros com
+``__slots__`` e mantém índices compactos que respondem às consultas de
+AtletaManager e EventoManager sem SQL, com as mesmas assinaturas:
+
+- vitórias em corrida: array ordenado por (data do evento, id da estatística)
+  com o atleta de cada vitória em um array paralelo (busca binária pela data);
+- eventos com participantes estrangeiros: array ordenado por (data, id);
+- melhor pontuação oficial: por esporte, {pontuação: {ids dos atletas}},
+  alimentado por um Counter das pontuações oficiais de cada atleta;
+- participantes: por evento, Counter das estatísticas de cada atleta.
+
+Os índices são atualizados incrementalmente pelos sinais post_save e
+post_delete de Atleta, Evento e Estatistica. Escritas que não enviam sinais
+(bulk_create, update) são detectadas pela versão dos modelos no cache de
+consultas (ver analise/cache.py), incrementada por ``invalidar``: se a versão
+mudou sem passar pelo motor, ele é recarregado por completo. Os sinais são
+aplicados na hora, mas a versão só é conferida quando a transação é
+confirmada, depois do incremento feito pela invalidação do cache; alterações
+desfeitas por rollback só deixam o motor após ``recarregar()``.
+
+As consultas retornam registros (RegistroAtleta, RegistroEvento e
+AtletaRanqueado), não instâncias dos modelos, ordenados por id quando o ORM
+não define ordem.
+
+Uso:
+    motor = motor_consultas()
+    motor.buscar_participantes(evento)
+"""
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import versoes
+from .models.atleta import Atleta
+from .models.esporte import Esporte
+from .models.estatistica import Estatistica
+from .models.evento import Evento
+
+# Chaves dos arrays ordenados: data (ordinal) nos bits altos, id nos 40 bits baixos
+_BITS_ID = 40
+_MASCARA_ID = (1 << _BITS_ID) - 1
+
+
+def _chave(data: date, pk: int) -> int:
+    return (data.toordinal() << _BITS_ID) | pk
+
+
+def _inserir_ordenado(chaves: array, chave: int, paralelo: array = None, valor: int = None) -> None:
+    posicao = bisect_left(chaves, chave)
+    chaves.insert(posicao, chave)
+    if paralelo is not None:
+        paralelo.insert(posicao, valor)
+
+
+def _remover_ordenado(chaves: array, chave: int, paralelo: array = None) -> None:
+    posicao = bisect_left(chaves, chave)
+    if posicao < len(chaves) and chaves[posicao] == chave:
+        del chaves[posicao]
+        if paralelo is not None:
+            del paralelo[posicao]
+
+
+def _eh_melhor(esporte, nova, atual) -> bool:
+    """Se a pontuação nova é melhor que a atual: menor para corrida, maior para os demais"""
+    return nova < atual if esporte == Esporte.CORRIDA else nova > atual
+
+
+class RegistroAtleta:
+    __slots__ = ('id', 'nome', 'esporte', 'nacionalidade', 'estatisticas')
+
+    def __init__(self, id, nome, esporte, nacionalidade):
+        self.id = id
+        self.nome = nome
+        self.esporte = esporte
+        self.nacionalidade = nacionalidade
+        # Ids das estatísticas do atleta
+        self.estatisticas = set()
+
+    @property
+    def pk(self):
+        return self.id
+
+
+class RegistroEvento:
+    __slots__ = ('id', 'nome', 'data', 'esporte', 'oficial', 'pais', 'estatisticas', 'participantes', 'estrangeiros')
+
+    def __init__(self, id, nome, data, esporte, oficial, pais):
+        self.id = id
+        self.nome = nome
+        self.data = data
+        self.esporte = esporte
+        self.oficial = oficial
+        self.pais = pais
+        self.estatisticas = set()
+        # {atleta_id: quantidade de estatísticas no evento}
+        self.participantes = Counter()
+        # Quantidade de estatísticas de atletas estrangeiros
+        self.estrangeiros = 0
+
+    @property
+    def pk(self):
+        return self.id
+
+
+class RegistroEstatistica:
+    __slots__ = ('id', 'atleta_id', 'evento_id', 'pontuacao')
+
+    def __init__(self, id, atleta_id, evento_id, pontuacao):
+        self.id = id
+        self.atleta_id = atleta_id
+        self.evento_id = evento_id
+        self.pontuacao = pontuacao
+
+
+class AtletaRanqueado:
+    """Item de buscar_ranking_eventos_oficiais"""
+    __slots__ = ('id', 'nome', 'esporte', 'melhor_pontuacao', 'posicao')
+
+    def __init__(self, atleta, melhor_pontuacao, posicao):
+        self.id = atleta.id
+        self.nome = atleta.nome
+        self.esporte = atleta.esporte
+        self.melhor_pontuacao = melhor_pontuacao
+        self.posicao = posicao
+
+    @property
+    def pk(self):
+        return self.id
+
+
+class MotorConsultas:
+    """
+    Índices em memória das consultas dos managers. Use ativar() para carregar
+    e passar a acompanhar os sinais, e desativar() para parar.
+    """
+
+    MODELOS = (Atleta, Evento, Estatistica)
+
+    def __init__(self):
+        self._trava = threading.RLock()
+        self._versoes = None
+        self._limpar()
+
+    def _limpar(self) -> None:
+        self.atletas = {}
+        self.eventos = {}
+        self.estatisticas = {}
+        # Vitórias (pontuacao = 1) de atletas de corrida
+        self._vitorias = array('q')
+        self._vitorias_atletas = array('q')
+        # Eventos com ao menos uma estatística de atleta estrangeiro
+        self._eventos_estrangeiros = array('q')
+        # {(atleta_id, esporte do evento): Counter das pontuações em eventos oficiais}
+        self._pontuacoes_oficiais = {}
+        # {esporte: {melhor pontuação oficial: {atleta_id}}}, apenas atleta.esporte == esporte,
+        # e as pontuações de cada esporte em ordem crescente
+        self._melhores = {}
+        self._pontuacoes_ordenadas = {}
+
+    # ----------------------------------------------------------------------------------------------
+    # Carga e sinais
+    # ----------------------------------------------------------------------------------------------
+
+    def recarregar(self) -> None:
+        """Recarrega todos os registros e índices do banco"""
+        with self._trava:
+            self._limpar()
+            versoes_modelos = versoes(*self.MODELOS)
+
+            for pk, nome, esporte, nacionalidade in Atleta.objects.values_list(
+                'id', 'nome', 'esporte', 'nacionalidade'
+            ).iterator(chunk_size=10000):
+                self.atletas[pk] = RegistroAtleta(pk, nome, esporte, nacionalidade)
+
+            for pk, nome, data, esporte, oficial, pais in Evento.objects.values_list(
+                'id', 'nome', 'data', 'esporte', 'oficial', 'pais'
+            ).iterator(chunk_size=10000):
+                self.eventos[pk] = RegistroEvento(pk, nome, data, esporte, oficial, pais)
+
+            for valores in Estatistica.objects.values_list(
+                'id', 'atleta_id', 'evento_id', 'pontuacao'
+            ).iterator(chunk_size=10000):
+                self._adicionar_estatistica(RegistroEstatistica(*valores))
+
+            self._versoes = versoes_modelos
+
+    def ativar(self) -> 'MotorConsultas':
+        """Carrega os dados e conecta os sinais de atualização incremental"""
+        for modelo in self.MODELOS:
+            post_save.connect(self._ao_salvar, sender=modelo, dispatch_uid=(id(self), 'salvar', modelo))
+            post_delete.connect(self._ao_remover, sender=modelo, dispatch_uid=(id(self), 'remover', modelo))
+        self.recarregar()
+        return self
+
+    def desativar(self) -> None:
+        for modelo in self.MODELOS:
+            post_save.disconnect(sender=modelo, dispatch_uid=(id(self), 'salvar', modelo))
+            post_delete.disconnect(sender=modelo, dispatch_uid=(id(self), 'remover', modelo))
+        with self._trava:
+            self._limpar()
+            self._versoes = None
+
+    def _ao_salvar(self, sender, instance, raw=False, **kwargs):
+        with self._trava:
+            if sender is Estatistica:
+                self._remover_estatistica(instance.pk)
+                self._adicionar_estatistica(RegistroEstatistica(
+                    instance.pk, instance.atleta_id, instance.evento_id, instance.pontuacao
+                ))
+            elif sender is Atleta:
+                self._substituir(self.atletas, instance.pk, RegistroAtleta(
+                    instance.pk, instance.nome, instance.esporte, instance.nacionalidade
+                ))
+            else:
+                self._substituir(self.eventos, instance.pk, RegistroEvento(
+                    instance.pk, instance.nome, instance.data, instance.esporte, instance.oficial, instance.pais
+                ))
+        self._acompanhar_versoes_ao_confirmar(sender, kwargs.get('using'))
+
+    def _ao_remover(self, sender, instance, **kwargs):
+        with self._trava:
+            if sender is Estatistica:
+                self._remover_estatistica(instance.pk)
+            else:
+                # As estatísticas removidas em cascata já enviaram post_delete
+                registros = self.atletas if sender is Atleta else self.eventos
+                self._substituir(registros, instance.pk, None)
+        self._acompanhar_versoes_ao_confirmar(sender, kwargs.get('using'))
+
+    def _acompanhar_versoes_ao_confirmar(self, sender, using) -> None:
+        """
+        Executa _acompanhar_versoes após a confirmação da transação: o sinal de
+        invalidação do cache foi recebido antes e seu incremento já terá ocorrido.
+        """
+        def acompanhar():
+            with self._trava:
+                self._acompanhar_versoes(sender)
+
+        transaction.on_commit(acompanhar, using=using)
+
+    def _acompanhar_versoes(self, sender) -> None:
+        """
+        Registra a versão do modelo do sinal após a atualização incremental.
+
+        O receptor de invalidação de analise/signals.py é conectado antes do
+        motor, e os callbacks de on_commit rodam na ordem de registro: a
+        escrita do sinal incrementou a versão do seu modelo exatamente uma vez
+        e não alterou as demais. Qualquer outra diferença é uma escrita que não
+        passou pelo motor (bulk_create seguido de ``invalidar``), mesmo no
+        modelo do sinal, e a próxima consulta recarrega tudo.
+        """
+        if self._versoes is None:
+            return
+        esperadas = tuple(
+            anterior + 1 if modelo is sender else anterior
+            for modelo, anterior in zip(self.MODELOS, self._versoes)
+        )
+        atuais = versoes(*self.MODELOS)
+        self._versoes = atuais if atuais == esperadas else None
+
+    def _atualizar_se_necessario(self) -> None:
+        """Recarrega se o motor não está ativo ou houve escritas sem sinais"""
+        if self._versoes is None or versoes(*self.MODELOS) != self._versoes:
+            self.recarregar()
+
+    # ----------------------------------------------------------------------------------------------
+    # Manutenção dos índices
+    # ----------------------------------------------------------------------------------------------
+
+    def _substituir(self, registros: dict, pk: int, novo) -> None:
+        """Troca o registro de um atleta/evento, reindexando suas estatísticas"""
+        anterior = registros.get(pk)
+        ids = list(anterior.estatisticas) if anterior is not None else []
+        removidas = [self.estatisticas[id_] for id_ in ids]
+        for id_ in ids:
+            self._remover_estatistica(id_)
+
+        if novo is None:
+            registros.pop(pk, None)
+            return
+        registros[pk] = novo
+        for estatistica in removidas:
+            self._adicionar_estatistica(estatistica)
+
+    def _adicionar_estatistica(self, estatistica: RegistroEstatistica) -> None:
+        atleta = self.atletas.get(estatistica.atleta_id)
+        evento = self.eventos.get(estatistica.evento_id)
+        if atleta is None or evento is None:
+            return
+
+        self.estatisticas[estatistica.id] = estatistica
+        atleta.estatisticas.add(estatistica.id)
+        evento.estatisticas.add(estatistica.id)
+        evento.participantes[atleta.id] += 1
+
+        if atleta.nacionalidade != evento.pais:
+            evento.estrangeiros += 1
+            if evento.estrangeiros == 1:
+                _inserir_ordenado(self._eventos_estrangeiros, _chave(evento.data, evento.id))
+
+        pontuacao = estatistica.pontuacao
+        if pontuacao == 1 and atleta.esporte == Esporte.CORRIDA:
+            _inserir_ordenado(
+                self._vitorias, _chave(evento.data, estatistica.id), self._vitorias_atletas, atleta.id
+            )
+
+        if evento.oficial and pontuacao is not None:
+            self._atualizar_pontuacoes_oficiais(atleta, evento.esporte, pontuacao, 1)
+
+    def _remover_estatistica(self, pk: int) -> None:
+        estatistica = self.estatisticas.pop(pk, None)
+        if estatistica is None:
+            return
+        atleta = self.atletas[estatistica.atleta_id]
+        evento = self.eventos[estatistica.evento_id]
+
+        atleta.estatisticas.discard(pk)
+        evento.estatisticas.discard(pk)
+        evento.participantes[atleta.id] -= 1
+        if not evento.participantes[atleta.id]:
+            del evento.participantes[atleta.id]
+
+        if atleta.nacionalidade != evento.pais:
+            evento.estrangeiros -= 1
+            if not evento.estrangeiros:
+                _remover_ordenado(self._eventos_estrangeiros, _chave(evento.data, evento.id))
+
+        pontuacao = estatistica.pontuacao
+        if pontuacao == 1 and atleta.esporte == Esporte.CORRIDA:
+            _remover_ordenado(self._vitorias, _chave(evento.data, pk), self._vitorias_atletas)
+
+        if evento.oficial and pontuacao is not None:
+            self._atualizar_pontuacoes_oficiais(atleta, evento.esporte, pontuacao, -1)
+
+    def _atualizar_pontuacoes_oficiais(self, atleta, esporte, pontuacao: int, delta: int) -> None:
+        """Soma/remove uma pontuação oficial e move o atleta para o balde da nova melhor"""
+        chave = (atleta.id, esporte)
+        pontuacoes = self._pontuacoes_oficiais.setdefault(chave, Counter())
+        anterior = self._melhor_de(esporte, pontuacoes)
+
+        pontuacoes[pontuacao] += delta
+        if pontuacoes[pontuacao] <= 0:
+            del pontuacoes[pontuacao]
+        if not pontuacoes:
+            del self._pontuacoes_oficiais[chave]
+        atual = self._melhor_de(esporte, pontuacoes)
+
+        if anterior == atual or atleta.esporte != esporte:
+            return
+        baldes = self._melhores.setdefault(esporte, {})
+        ordenadas = self._pontuacoes_ordenadas.setdefault(esporte, [])
+        if anterior is not None:
+            baldes[anterior].discard(atleta.id)
+            if not baldes[anterior]:
+                del baldes[anterior]
+                del ordenadas[bisect_left(ordenadas, anterior)]
+        if atual is not None:
+            if atual not in baldes:
+                baldes[atual] = set()
+                insort(ordenadas, atual)
+            baldes[atual].add(atleta.id)
+
+    @staticmethod
+    def _melhor_de(esporte, pontuacoes: Counter):
+        if not pontuacoes:
+            return None
+        return min(pontuacoes) if esporte == Esporte.CORRIDA else max(pontuacoes)
+
+    def _baldes_ordenados(self, esporte):
+        """(pontuação, {atleta_id}) da melhor para a pior"""
+        ordenadas = self._pontuacoes_ordenadas.get(esporte, [])
+        baldes = self._melhores[esporte] if ordenadas else None
+        for pontuacao in (ordenadas if esporte == Esporte.CORRIDA else reversed(ordenadas)):
+            yield pontuacao, baldes[pontuacao]
+
+    # ----------------------------------------------------------------------------------------------
+    # Consultas (mesmas assinaturas de AtletaManager e EventoManager)
+    # ----------------------------------------------------------------------------------------------
+
+    def buscar_corredores_vencedores(self, data: date) -> list:
+        """Mesma consulta de AtletaManager.buscar_corredores_vencedores; registros ordenados por id"""
+        if not data or not isinstance(data, date):
+            raise ValueError('Data deve ser um objeto date válido')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            inicio = bisect_left(self._vitorias, _chave(data, 0))
+            return [self.atletas[pk] for pk in sorted(set(self._vitorias_atletas[inicio:]))]
+
+    def buscar_maiores_pontuadores_eventos_oficiais(self, esporte) -> list:
+        """Mesma consulta de AtletaManager.buscar_maiores_pontuadores_eventos_oficiais; ordenados por id"""
+        if not esporte:
+            raise ValueError('Esporte deve ser informado')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            melhor = next(self._baldes_ordenados(esporte), None)
+            if melhor is None:
+                return []
+            return [self.atletas[pk] for pk in sorted(melhor[1])]
+
+    def buscar_ranking_eventos_oficiais(self, limite: int = 1) -> dict:
+        """Mesma consulta de AtletaManager.buscar_ranking_eventos_oficiais"""
+        if not isinstance(limite, int) or limite < 1:
+            raise ValueError('Limite deve ser um inteiro positivo')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            ranking = {}
+            for esporte in sorted(self._melhores):
+                posicao = 1
+                for pontuacao, ids in self._baldes_ordenados(esporte):
+                    if posicao > limite:
+                        break
+                    atletas = sorted((self.atletas[pk] for pk in ids), key=lambda atleta: (atleta.nome, atleta.id))
+                    ranking.setdefault(esporte, []).extend(
+                        AtletaRanqueado(atleta, pontuacao, posicao) for atleta in atletas
+                    )
+                    # RANK(): empatados ocupam a mesma posição e a seguinte pula os empates
+                    posicao += len(ids)
+            return ranking
+
+    def buscar_participantes(self, evento) -> list:
+        """Mesma consulta de AtletaManager.buscar_participantes; registros ordenados por id"""
+        if not evento:
+            raise ValueError('Evento deve ser informado')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            registro = self.eventos.get(getattr(evento, 'pk', evento))
+            if registro is None:
+                return []
+            return [self.atletas[pk] for pk in sorted(registro.participantes)]
+
+    def buscar_participantes_eventos(self, eventos) -> dict:
+        """Mesma consulta de AtletaManager.buscar_participantes_eventos"""
+        if eventos is None:
+            raise ValueError('Eventos devem ser informados')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            participantes = {}
+            for evento in eventos:
+                evento_id = getattr(evento, 'pk', evento)
+                registro = self.eventos.get(evento_id)
+                ids = sorted(registro.participantes) if registro is not None else []
+                participantes[evento_id] = [self.atletas[pk] for pk in ids]
+            return participantes
+
+    def buscar_evento_participantes_estrangeiros(self, data: date) -> list:
+        """
+        Mesma consulta de EventoManager.buscar_evento_participantes_estrangeiros;
+        da data mais recente para a mais antiga (e do maior id ao menor na mesma data).
+        """
+        if not data or not isinstance(data, date):
+            raise ValueError('Data deve ser um objeto date válido')
+
+        with self._trava:
+            self._atualizar_se_necessario()
+            inicio = bisect_left(self._eventos_estrangeiros, _chave(data, 0))
+            return [
+                self.eventos[chave & _MASCARA_ID]
+                for chave in reversed(self._eventos_estrangeiros[inicio:])
+            ]
+
+
+_motor = None
+_trava_motor = threading.Lock()
+
+
+def motor_consultas() -> MotorConsultas:
+    """Motor de consultas do processo, ativado (e carregado) no primeiro uso"""
+    global _motor
+    with _trava_motor:
+        if _motor is None:
+            _motor = MotorConsultas().ativar()
+        return _motor
@@ -0,0 +1,54 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentacao import amedir, instrumentacao_ativa, medir
+
+
+class InstrumentacaoConsultasMiddleware:
+    """
+    Adiciona à resposta os totais de SQL da requisição:
+
+    - X-Analise-Consultas: quantidade de consultas
+    - X-Analise-Tempo-SQL: tempo em SQL (ms)
+    - X-Analise-Tempo-Python: tempo fora do SQL (ms)
+
+    Desativado quando ANALISE_INSTRUMENTACAO é falso. Em respostas em
+    streaming, apenas as consultas feitas antes do envio são contadas.
+
+    Síncrono ou assíncrono conforme a cadeia: sob ASGI as requisições não
+    passam por um adaptador async -> sync só por causa deste middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not instrumentacao_ativa():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with medir(self._nome(request)) as medicao:
+            resposta = self.get_response(request)
+        return self._adicionar_cabecalhos(resposta, medicao)
+
+    async def __acall__(self, request):
+        async with amedir(self._nome(request)) as medicao:
+            resposta = await self.get_response(request)
+        return self._adicionar_cabecalhos(resposta, medicao)
+
+    @staticmethod
+    def _nome(request) -> str:
+        return f'{request.method} {request.path}'
+
+    @staticmethod
+    def _adicionar_cabecalhos(resposta, medicao):
+        resposta['X-Analise-Consultas'] = str(medicao.consultas)
+        resposta['X-Analise-Tempo-SQL'] = f'{medicao.tempo_sql * 1000:.2f}'
+        resposta['X-Analise-Tempo-Python'] = f'{medicao.tempo_python * 1000:.2f}'
+        return resposta
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(fields=['esporte'], name='atleta_esporte_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estatistica',
+            index=models.Index(fields=['evento', 'pontuacao'], name='estat_evento_pontuacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estatistica',
+            index=models.Index(fields=['atleta', 'evento'], name='estat_atleta_evento_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['esporte', 'oficial', 'data'], name='evento_esp_oficial_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['data'], name='evento_data_idx'),
+        ),
+    ]
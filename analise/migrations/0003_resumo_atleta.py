@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0002_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoAtleta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('esporte', models.CharField(choices=[('FUTEBOL', 'futebol'), ('BASQUETE', 'basquete'), ('CORRIDA', 'corrida'), ('VÔLEI', 'vôlei'), ('NATAÇÃO', 'natação'), ('ATLETISMO', 'atletismo'), ('TÊNIS', 'tênis'), ('Não Especificado', 'não especificado')], max_length=20, verbose_name='Esporte')),
+                ('total_estatisticas', models.PositiveIntegerField(default=0, verbose_name='Total de Estatísticas')),
+                ('total_pontuacao', models.IntegerField(default=0, verbose_name='Total de Pontuação')),
+                ('melhor_pontuacao', models.IntegerField(blank=True, null=True, verbose_name='Melhor Pontuação')),
+                ('melhor_pontuacao_oficial', models.IntegerField(blank=True, null=True, verbose_name='Melhor Pontuação Oficial')),
+                ('atleta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos', to='analise.atleta', verbose_name='Atleta')),
+            ],
+            options={
+                'verbose_name': 'Resumo do Atleta',
+                'verbose_name_plural': 'Resumos dos Atletas',
+                'indexes': [models.Index(fields=['esporte', 'melhor_pontuacao_oficial'], name='resumo_esp_melhor_ofic_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumoatleta',
+            constraint=models.UniqueConstraint(fields=('atleta', 'esporte'), name='resumo_atleta_esporte_unico'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0003_resumo_atleta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressoImportacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arquivo', models.CharField(max_length=500, unique=True, verbose_name='Arquivo')),
+                ('linhas_confirmadas', models.PositiveBigIntegerField(default=0, verbose_name='Linhas Confirmadas')),
+                ('concluido', models.BooleanField(default=False, verbose_name='Concluído')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Progresso de Importação',
+                'verbose_name_plural': 'Progressos de Importação',
+            },
+        ),
+    ]
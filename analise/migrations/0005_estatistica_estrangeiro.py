@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:40
+
+from django.db import migrations, models
+
+
+def preencher_estrangeiro(apps, schema_editor):
+    """Calcula o indicador das estatísticas existentes em uma única atualização"""
+    Estatistica = apps.get_model('analise', 'Estatistica')
+    Estatistica.objects.using(schema_editor.connection.alias).exclude(
+        atleta__nacionalidade=models.F('evento__pais')
+    ).update(estrangeiro=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0004_progresso_importacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estatistica',
+            name='estrangeiro',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Estrangeiro'),
+        ),
+        # Preenchido antes de criar o índice, para não mantê-lo durante a atualização
+        migrations.RunPython(preencher_estrangeiro, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='estatistica',
+            index=models.Index(fields=['evento', 'estrangeiro'], name='estat_evento_estrangeiro_idx'),
+        ),
+    ]
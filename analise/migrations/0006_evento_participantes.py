@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0005_estatistica_estrangeiro'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='participantes',
+            field=models.ManyToManyField(related_name='eventos', through='analise.Estatistica', to='analise.atleta', verbose_name='Participantes'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0006_evento_participantes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='atleta',
+            name='atleta_esporte_idx',
+        ),
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(fields=['esporte', 'ativo', 'data_nascimento'], name='atleta_esp_ativo_nasc_idx'),
+        ),
+    ]
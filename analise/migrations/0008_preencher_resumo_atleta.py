@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def preencher_resumos(apps, schema_editor):
+    """
+    Reconstrói os resumos a partir das estatísticas existentes, como
+    ResumoAtleta.objects.reconstruir(): a 0003 criou a tabela vazia e as
+    consultas de maiores pontuadores e ranking leem apenas os resumos.
+    """
+    Estatistica = apps.get_model('analise', 'Estatistica')
+    ResumoAtleta = apps.get_model('analise', 'ResumoAtleta')
+    banco = schema_editor.connection.alias
+    oficial = models.Q(evento__oficial=True)
+
+    agregados = Estatistica.objects.using(banco).values(
+        'atleta_id', 'evento__esporte'
+    ).annotate(
+        total=models.Count('id'),
+        soma=Coalesce(models.Sum('pontuacao'), 0),
+        menor=models.Min('pontuacao'),
+        maior=models.Max('pontuacao'),
+        menor_oficial=models.Min('pontuacao', filter=oficial),
+        maior_oficial=models.Max('pontuacao', filter=oficial),
+    ).order_by()
+
+    ResumoAtleta.objects.using(banco).all().delete()
+    lote = []
+    for agregado in agregados.iterator(chunk_size=2000):
+        # Na corrida a melhor pontuação é a menor (colocação)
+        corrida = agregado['evento__esporte'] == 'CORRIDA'
+        lote.append(ResumoAtleta(
+            atleta_id=agregado['atleta_id'],
+            esporte=agregado['evento__esporte'],
+            total_estatisticas=agregado['total'],
+            total_pontuacao=agregado['soma'],
+            melhor_pontuacao=agregado['menor' if corrida else 'maior'],
+            melhor_pontuacao_oficial=agregado['menor_oficial' if corrida else 'maior_oficial'],
+        ))
+        if len(lote) >= 2000:
+            ResumoAtleta.objects.using(banco).bulk_create(lote)
+            lote = []
+    ResumoAtleta.objects.using(banco).bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0007_atleta_elegibilidade_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(preencher_resumos, migrations.RunPython.noop),
+    ]
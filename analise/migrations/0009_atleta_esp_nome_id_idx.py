@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analise', '0008_preencher_resumo_atleta'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(fields=['esporte', 'nome', 'id'], name='atleta_esp_nome_id_idx'),
+        ),
+    ]
@@ -5,6 +5,7 @@ from .base_model import BaseModel
 from .validators import validate_cpf, validate_data_nascimento
 from .esporte import Esporte
 from ..managers.atleta_manager import AtletaManager
+from ..validacao import CAMPOS_UNICOS_ATLETA, contexto_atual
 
 
 class Atleta(BaseModel):
@@ -73,10 +74,29 @@ class Atleta(BaseModel):
     # Manager customizado
     objects = AtletaManager()
     
+    class Meta:
+        indexes = [
+            # Filtros por esporte e elegibilidade para eventos (AtletaManager.buscar_elegiveis)
+            models.Index(fields=['esporte', 'ativo', 'data_nascimento'], name='atleta_esp_ativo_nasc_idx'),
+            # Ordenação e cursor da paginação keyset da API (views.ORDENACAO_ATLETA),
+            # dentro de um esporte (AtletaManager.buscar_corredores_vencedores)
+            models.Index(fields=['esporte', 'nome', 'id'], name='atleta_esp_nome_id_idx'),
+        ]
+    
     def __str__(self):
         """Retorna o nome do atleta e o esporte"""
         return f"{self.nome} - {self.esporte}"
     
+    def validate_unique(self, exclude=None):
+        """Dentro de contexto_validacao(), cpf e e-mail são verificados em memória"""
+        contexto = contexto_atual()
+        if contexto is None:
+            return super().validate_unique(exclude)
+        
+        exclude = set(exclude or ())
+        contexto.validar_unicos_atleta(self, exclude)
+        super().validate_unique(exclude | set(CAMPOS_UNICOS_ATLETA))
+    
     def clean(self):
         """Validação adicional do modelo"""
         super().clean()
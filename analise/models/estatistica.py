@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from .base_model import BaseModel
 from .validators import validate_estatistica_por_esporte, validate_atleta_idade_minima
+from ..validacao import contexto_atual
+from ..managers.estatistica_manager import EstatisticaManager
 
 
 class Estatistica(BaseModel):
@@ -19,6 +21,8 @@ class Estatistica(BaseModel):
         minutos_jogados: Minutos jogados (apenas basquete e futebol)
         distancia: Distância percorrida (apenas corrida)
         observacoes: Observações adicionais
+        estrangeiro: Se a nacionalidade do atleta difere do país do evento
+            (calculado no save e mantido pelos sinais de Atleta e Evento)
     """
     atleta = models.ForeignKey(
         'Atleta',
@@ -76,10 +80,26 @@ class Estatistica(BaseModel):
         blank=True,
         default=''
     )
+    estrangeiro = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Estrangeiro'
+    )
+    
+    # Manager customizado
+    objects = EstatisticaManager()
     
     class Meta:
         verbose_name = 'Estatística'
         verbose_name_plural = 'Estatisticas'
+        indexes = [
+            # Participantes de um evento e filtros por pontuação dentro do evento
+            models.Index(fields=['evento', 'pontuacao'], name='estat_evento_pontuacao_idx'),
+            # Junções atleta -> evento (corredores vencedores, ranking)
+            models.Index(fields=['atleta', 'evento'], name='estat_atleta_evento_idx'),
+            # Eventos com participantes estrangeiros (a data fica em evento_data_idx)
+            models.Index(fields=['evento', 'estrangeiro'], name='estat_evento_estrangeiro_idx'),
+        ]
     
     def __str__(self):
         """Retorna o nome do atleta, nome do evento, esporte e a pontuação"""
@@ -104,7 +124,25 @@ class Estatistica(BaseModel):
         if self.evento:
             validate_estatistica_por_esporte(self)
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Guarda o atleta original para que alterações recalculem o resumo anterior"""
+        instance = super().from_db(db, field_names, values)
+        instance._atleta_id_original = instance.__dict__.get('atleta_id')
+        return instance
+    
     def save(self, *args, **kwargs):
         """Override do save para executar validações"""
-        self.full_clean()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        contexto = contexto_atual()
+        if contexto is not None:
+            # Atleta e evento compartilhados; a transação e o resumo ficam com o contexto
+            contexto.validar_estatistica(self)
+            self.estrangeiro = self.atleta.nacionalidade != self.evento.pais
+            super().save(*args, **kwargs)
+        else:
+            self.full_clean()
+            self.estrangeiro = self.atleta.nacionalidade != self.evento.pais
+            # O resumo do atleta é atualizado no post_save, na mesma transação
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+        self._atleta_id_original = self.atleta_id
\ No newline at end of file
@@ -19,6 +19,7 @@ class Evento(BaseModel):
         oficial: Indica se é um evento oficial
         organizador: Nome do organizador (mínimo 2 caracteres)
         capacidade: Capacidade de público do evento
+        participantes: Atletas com estatísticas no evento (relação através de Estatistica)
     """
     nome = models.CharField(
         max_length=100, 
@@ -62,10 +63,32 @@ class Evento(BaseModel):
         validators=[MinValueValidator(0)],  
         verbose_name='Capacidade'
     )
+    # Sem tabela própria: usa as chaves de Estatistica e permite Prefetch dos participantes
+    participantes = models.ManyToManyField(
+        'analise.Atleta',
+        through='analise.Estatistica',
+        related_name='eventos',
+        verbose_name='Participantes'
+    )
     
     # Manager customizado
     objects = EventoManager()
     
+    class Meta:
+        indexes = [
+            # Eventos oficiais por esporte (ranking) e filtros por data
+            models.Index(fields=['esporte', 'oficial', 'data'], name='evento_esp_oficial_data_idx'),
+            # Eventos desde uma data, independente do esporte (participantes estrangeiros)
+            models.Index(fields=['data'], name='evento_data_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Guarda esporte e oficialidade originais: só a alteração deles recalcula os resumos"""
+        instance = super().from_db(db, field_names, values)
+        instance._classificacao_original = (instance.__dict__.get('esporte'), instance.__dict__.get('oficial'))
+        return instance
+    
     def __str__(self):
         """Retorna o nome do evento, esporte, cidade, país e a data no formato DD/MM/AAAA"""
         return f"{self.nome} - {self.esporte} - {self.cidade}, {self.pais} - {self.data.strftime('%d/%m/%Y')}"
\ No newline at end of file
@@ -0,0 +1,42 @@
+from django.db import models
+from .base_model import BaseModel
+
+
+class ProgressoImportacao(BaseModel):
+    """
+    Ponto de retomada de uma importação de arquivo (manage.py importar_estatisticas).
+    
+    Atualizado na mesma transação de cada lote gravado, de modo que após uma
+    interrupção a importação recomeça exatamente após o último lote confirmado.
+    
+    Attributes:
+        arquivo: Caminho absoluto do arquivo importado
+        linhas_confirmadas: Quantidade de linhas de dados já processadas e confirmadas
+        concluido: Indica se o arquivo foi importado até o fim
+        atualizado_em: Data e hora da última atualização
+    """
+    arquivo = models.CharField(
+        max_length=500,
+        unique=True,
+        verbose_name='Arquivo'
+    )
+    linhas_confirmadas = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Linhas Confirmadas'
+    )
+    concluido = models.BooleanField(
+        default=False,
+        verbose_name='Concluído'
+    )
+    atualizado_em = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Atualizado em'
+    )
+    
+    class Meta:
+        verbose_name = 'Progresso de Importação'
+        verbose_name_plural = 'Progressos de Importação'
+    
+    def __str__(self):
+        """Retorna o arquivo e a quantidade de linhas confirmadas"""
+        return f"{self.arquivo} - Linhas: {self.linhas_confirmadas}"
@@ -0,0 +1,70 @@
+from django.db import models
+from .base_model import BaseModel
+from .esporte import Esporte
+from ..managers.resumo_atleta_manager import ResumoAtletaManager
+
+
+class ResumoAtleta(BaseModel):
+    """
+    Resumo desnormalizado das estatísticas de um atleta em um esporte.
+
+    Mantido incrementalmente a cada Estatistica salva ou removida (ver
+    analise/signals.py) e reconstruído com ``manage.py reconstruir_resumos``.
+    A "melhor pontuação" segue a regra do esporte: menor valor para corrida
+    (1º lugar = 1) e maior valor para os demais.
+
+    Attributes:
+        atleta: Atleta resumido
+        esporte: Esporte dos eventos das estatísticas resumidas
+        total_estatisticas: Quantidade de estatísticas do atleta no esporte
+        total_pontuacao: Soma das pontuações do atleta no esporte
+        melhor_pontuacao: Melhor pontuação em qualquer evento
+        melhor_pontuacao_oficial: Melhor pontuação em eventos oficiais
+    """
+    atleta = models.ForeignKey(
+        'Atleta',
+        on_delete=models.CASCADE,
+        related_name='resumos',
+        verbose_name='Atleta'
+    )
+    esporte = models.CharField(
+        max_length=20,
+        choices=Esporte.choices,
+        verbose_name='Esporte'
+    )
+    total_estatisticas = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total de Estatísticas'
+    )
+    total_pontuacao = models.IntegerField(
+        default=0,
+        verbose_name='Total de Pontuação'
+    )
+    melhor_pontuacao = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Melhor Pontuação'
+    )
+    melhor_pontuacao_oficial = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Melhor Pontuação Oficial'
+    )
+
+    # Manager customizado
+    objects = ResumoAtletaManager()
+
+    class Meta:
+        verbose_name = 'Resumo do Atleta'
+        verbose_name_plural = 'Resumos dos Atletas'
+        constraints = [
+            models.UniqueConstraint(fields=['atleta', 'esporte'], name='resumo_atleta_esporte_unico'),
+        ]
+        indexes = [
+            # Ranking por esporte em eventos oficiais
+            models.Index(fields=['esporte', 'melhor_pontuacao_oficial'], name='resumo_esp_melhor_ofic_idx'),
+        ]
+
+    def __str__(self):
+        """Retorna o atleta, o esporte e o total de estatísticas"""
+        return f"{self.atleta_id} - {self.esporte} - Estatísticas: {self.total_estatisticas}"
@@ -1,12 +1,27 @@
 import re
 from datetime import date
+from functools import lru_cache
 from django.core.exceptions import ValidationError
 
 
+_NAO_NUMERICOS = re.compile(r'[^0-9]')
+
+# Idade mínima (anos) dos atletas, na data de hoje e na data de cada evento
+IDADE_MINIMA = 12
+
+# Soma dos pesos de cada dígito verificador (10..2 e 11..2), usada para
+# descontar o código ASCII de '0' na validação em lote
+_SOMA_PESOS_DV1 = sum(range(2, 11))
+_SOMA_PESOS_DV2 = sum(range(2, 12))
+
+
 def validate_cpf(cpf: str) -> bool:
     """
     Valida um CPF (Cadastro de Pessoa Física) brasileiro.
     
+    O resultado é memoizado por verificar_cpf, de modo que validações
+    repetidas do mesmo CPF (ex.: a cada full_clean) não refazem o cálculo.
+    
     Args:
         cpf: String contendo o CPF a ser validado
         
@@ -16,25 +31,102 @@ def validate_cpf(cpf: str) -> bool:
     Raises:
         ValidationError: Se o CPF for inválido
     """
+    motivo = verificar_cpf(cpf)
+    if motivo:
+        raise ValidationError(motivo)
+
+    return True
+
+
+@lru_cache(maxsize=65536)
+def verificar_cpf(cpf: str):
+    """
+    Verifica um CPF sem lançar exceção, com memoização por valor.
+    
+    Args:
+        cpf: String contendo o CPF a ser verificado
+        
+    Returns:
+        None se o CPF for válido, ou a mensagem com o motivo da invalidade
+    """
     # Remove caracteres não numéricos
-    cpf = re.sub(r'[^0-9]', '', cpf)
+    cpf = _NAO_NUMERICOS.sub('', cpf)
 
     # Verifica se tem 11 dígitos
     if len(cpf) != 11:
-        raise ValidationError('CPF deve ter 11 dígitos')
+        return 'CPF deve ter 11 dígitos'
 
     # Elimina CPFs com todos os dígitos iguais
     if cpf == cpf[0] * 11:
-        raise ValidationError('CPF inválido')
+        return 'CPF inválido'
 
     # Calcula os dígitos verificadores
     for i in range(9, 11):
         soma = sum(int(cpf[num]) * ((i + 1) - num) for num in range(0, i))
         digito = ((soma * 10) % 11) % 10
         if int(cpf[i]) != digito:
-            raise ValidationError('CPF inválido')
+            return 'CPF inválido'
 
-    return True
+    return None
+
+
+def validar_cpfs(cpfs) -> list:
+    """
+    Valida um lote de CPFs de uma vez, com o mesmo resultado de validate_cpf.
+    
+    Os dígitos verificadores são calculados por coluna: os CPFs normalizados
+    são concatenados em um único buffer e cada posição do CPF vira uma fatia
+    ``buffer[posicao::11]``, acumulada sobre todo o lote em uma única passada.
+    
+    Args:
+        cpfs: Iterável de strings com os CPFs
+        
+    Returns:
+        Lista de tuplas ``(valido, motivo)`` na ordem de entrada; motivo é None
+        para CPFs válidos
+    """
+    resultados = []
+    indices = []
+    normalizados = []
+
+    for indice, cpf in enumerate(cpfs):
+        if not (cpf.isascii() and cpf.isdigit()):
+            cpf = _NAO_NUMERICOS.sub('', cpf)
+
+        if len(cpf) != 11:
+            resultados.append((False, 'CPF deve ter 11 dígitos'))
+        elif cpf == cpf[0] * 11:
+            resultados.append((False, 'CPF inválido'))
+        else:
+            resultados.append((True, None))
+            indices.append(indice)
+            normalizados.append(cpf)
+
+    if not normalizados:
+        return resultados
+
+    buffer = ''.join(normalizados).encode('ascii')
+    colunas = [buffer[posicao::11] for posicao in range(11)]
+
+    # Somas ponderadas sobre os códigos ASCII; o deslocamento de '0' (48) é
+    # descontado de uma vez ao final
+    soma_dv1 = [0] * len(normalizados)
+    for posicao in range(9):
+        peso = 10 - posicao
+        soma_dv1 = [soma + peso * digito for soma, digito in zip(soma_dv1, colunas[posicao])]
+    soma_dv2 = [0] * len(normalizados)
+    for posicao in range(10):
+        peso = 11 - posicao
+        soma_dv2 = [soma + peso * digito for soma, digito in zip(soma_dv2, colunas[posicao])]
+
+    ascii_zero = ord('0')
+    for indice, soma1, soma2, dv1, dv2 in zip(indices, soma_dv1, soma_dv2, colunas[9], colunas[10]):
+        esperado1 = (((soma1 - ascii_zero * _SOMA_PESOS_DV1) * 10) % 11) % 10
+        esperado2 = (((soma2 - ascii_zero * _SOMA_PESOS_DV2) * 10) % 11) % 10
+        if dv1 - ascii_zero != esperado1 or dv2 - ascii_zero != esperado2:
+            resultados[indice] = (False, 'CPF inválido')
+
+    return resultados
 
 
 def validate_data_nascimento(data_nascimento):
@@ -63,6 +155,24 @@ def validate_data_nascimento(data_nascimento):
         raise ValidationError('Atleta deve ter no mínimo 12 anos de idade')
 
 
+def data_limite_nascimento(data_referencia: date, idade: int = IDADE_MINIMA) -> date:
+    """
+    Data de nascimento mais recente com ``idade`` anos completos na data de
+    referência: quem nasceu até ela tem a idade, como em validate_atleta_idade_minima.
+    
+    Args:
+        data_referencia: Data em que a idade é calculada (ex.: data do evento)
+        idade: Idade em anos
+        
+    Returns:
+        Data limite de nascimento (29/02 vira 28/02 em anos não bissextos)
+    """
+    try:
+        return data_referencia.replace(year=data_referencia.year - idade)
+    except ValueError:
+        return data_referencia.replace(year=data_referencia.year - idade, day=28)
+
+
 def validate_atleta_idade_minima(atleta, evento):
     """
     Valida que o atleta tinha pelo menos 12 anos na data do evento.
@@ -0,0 +1,163 @@
+"""
+Paginação para tabelas grandes.
+
+Paginação por chave (keyset/seek) para as consultas da API: em vez de OFFSET,
+cada página filtra as linhas posteriores à última linha da página anterior
+segundo a ordenação, de modo que páginas profundas custam o mesmo que a
+primeira quando há índice nos campos de ordenação.
+
+PaginadorContagemEstimada para o admin: evita o COUNT(*) completo a cada
+página, estimando o total da tabela sem filtros e limitando e guardando em
+cache a contagem das listagens filtradas.
+"""
+import base64
+import binascii
+import json
+
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import AutoField, BigAutoField, Max, Q, SmallAutoField
+from django.utils.functional import cached_property
+
+from .cache import montar_chave, obter_cache, versoes
+
+# Contagem máxima das listagens filtradas do admin (acima disso o total é aproximado)
+LIMITE_CONTAGEM = 10000
+
+# Validade das contagens filtradas em cache, em segundos
+TIMEOUT_CONTAGEM = 300
+
+
+def codificar_cursor(valores: list) -> str:
+    """Codifica os valores da chave da última linha em um cursor opaco"""
+    texto = json.dumps(valores, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> list:
+    """
+    Decodifica um cursor gerado por codificar_cursor.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valores = json.loads(texto)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError('Cursor inválido')
+
+    if not isinstance(valores, list):
+        raise ValueError('Cursor inválido')
+    return valores
+
+
+def _filtro_apos(ordenacao, valores) -> Q:
+    """
+    Condição "linha posterior à chave" para a ordenação informada, por exemplo
+    para ('-data', '-id'): data <= d AND (data < d OR (data = d AND id < i)).
+
+    O primeiro termo é redundante, mas é um intervalo simples no primeiro
+    campo: sem ele o OR impede o banco de iniciar a busca no índice da ordenação.
+    """
+    filtro = Q()
+    for i, campo in enumerate(ordenacao):
+        nome = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        condicao = Q(**{f'{nome}__{operador}': valores[i]})
+        for anterior, valor in zip(ordenacao[:i], valores):
+            condicao &= Q(**{anterior.lstrip('-'): valor})
+        filtro |= condicao
+
+    primeiro = ordenacao[0]
+    operador = 'lte' if primeiro.startswith('-') else 'gte'
+    return Q(**{f'{primeiro.lstrip("-")}__{operador}': valores[0]}) & filtro
+
+
+def paginar_keyset(queryset, ordenacao, cursor: str = None, tamanho: int = 50) -> tuple:
+    """
+    Retorna uma página de um QuerySet de ``values()`` ordenado pela chave informada.
+
+    Args:
+        queryset: QuerySet de dicionários contendo os campos da ordenação
+        ordenacao: Campos da chave, terminando em um campo único (ex.: ('-data', '-id'))
+        cursor: Cursor devolvido pela página anterior, ou None para a primeira
+        tamanho: Quantidade de itens por página
+
+    Returns:
+        Tupla ``(itens, proximo_cursor)``; proximo_cursor é None na última página
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    queryset = queryset.order_by(*ordenacao)
+
+    if cursor:
+        valores = decodificar_cursor(cursor)
+        if len(valores) != len(ordenacao):
+            raise ValueError('Cursor inválido')
+        queryset = queryset.filter(_filtro_apos(ordenacao, valores))
+
+    # Busca um item a mais para saber se existe próxima página
+    itens = list(queryset[:tamanho + 1])
+
+    proximo_cursor = None
+    if len(itens) > tamanho:
+        itens = itens[:tamanho]
+        proximo_cursor = codificar_cursor([itens[-1][campo.lstrip('-')] for campo in ordenacao])
+
+    return itens, proximo_cursor
+
+
+class PaginadorContagemEstimada(Paginator):
+    """
+    Paginator com contagem barata para tabelas grandes.
+
+    - Sem filtros e com chave primária autoincremental, o total é estimado
+      pelo maior id (uma busca no índice da chave primária). Após remoções a
+      estimativa fica acima do real: uma página além da última real é
+      substituída por ela, contando as linhas de fato.
+    - Com filtros (ou DISTINCT, fatia ou combinação de consultas), conta no
+      máximo LIMITE_CONTAGEM linhas e guarda o resultado no cache de
+      consultas, invalidado por qualquer escrita no modelo.
+    """
+
+    @cached_property
+    def estimada(self) -> bool:
+        """Se count é a estimativa pelo maior id, que ignora as linhas removidas"""
+        query = self.object_list.query
+        return (
+            not query.has_filters()
+            and not query.distinct
+            and not query.is_sliced
+            and not query.combinator
+            and isinstance(self.object_list.model._meta.pk, (AutoField, BigAutoField, SmallAutoField))
+        )
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        modelo = queryset.model
+
+        if self.estimada:
+            return queryset.order_by().aggregate(maior=Max('pk'))['maior'] or 0
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        chave = montar_chave(f'{modelo.__name__}.contagem', (sql, params), {}, versoes(modelo))
+        cache = obter_cache()
+
+        total = cache.get(chave)
+        if total is None:
+            total = queryset.order_by()[:LIMITE_CONTAGEM].count()
+            cache.set(chave, total, timeout=TIMEOUT_CONTAGEM)
+        return total
+
+    def page(self, number):
+        pagina = super().page(number)
+        if pagina.object_list or pagina.number == 1 or not self.estimada:
+            return pagina
+
+        # A estimativa passou do fim real: conta de fato e devolve a última página
+        self.__dict__['count'] = self.object_list.count()
+        self.__dict__.pop('num_pages', None)
+        return super().page(self.num_pages)
@@ -0,0 +1,162 @@
+"""
+Relatório de estatísticas renderizado em paralelo, em vários processos.
+
+Os atletas são divididos em fatias: intervalos contíguos de nomes, na ordem do
+relatório, com cerca de ``tamanho_fatia`` estatísticas cada. Cada fatia é lida
+e formatada por um processo de um ProcessPoolExecutor, com sua própria conexão
+ao banco, e os corpos das fatias são escritos na ordem dos nomes entre o
+cabeçalho e o rodapé. Como os atletas de um mesmo nome nunca ficam em fatias
+diferentes, o resultado é idêntico, byte a byte, ao de
+``gerar_relatorio_estatisticas``.
+
+Os processos são iniciados com 'spawn' (um interpretador novo, que configura o
+Django e abre a própria conexão, em vez de herdar a do processo principal) e
+por isso o banco precisa ser um arquivo: um SQLite em memória só existe no
+processo que o criou.
+
+Os modelos só são importados dentro das funções: os processos importam este
+módulo antes de executar django.setup().
+
+Uso:
+    escrever_relatorio_estatisticas(sys.stdout, 'csv', trabalhadores=4)
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+# Estatísticas por fatia: fatias maiores diluem o custo de cada tarefa, menores
+# distribuem melhor a carga entre os processos
+TAMANHO_FATIA = 20000
+
+
+def planejar_fatias(alias: str, tamanho_fatia: int = TAMANHO_FATIA) -> list[tuple[str, str]]:
+    """
+    Divide os nomes dos atletas em intervalos com cerca de ``tamanho_fatia`` estatísticas.
+
+    Args:
+        alias: Banco consultado
+        tamanho_fatia: Estatísticas por fatia; uma fatia só é fechada entre
+            dois nomes e pode passar desse valor
+
+    Returns:
+        Lista de (primeiro nome, último nome) de cada fatia, na ordem do relatório
+    """
+    from django.db.models import Count
+    from .models.estatistica import Estatistica
+
+    contagens = Estatistica.objects.using(alias).values_list('atleta__nome').annotate(
+        total=Count('id')
+    ).order_by('atleta__nome')
+
+    fatias = []
+    primeiro, acumulado = None, 0
+    for nome, total in contagens.iterator():
+        if primeiro is None:
+            primeiro = nome
+        acumulado += total
+        if acumulado >= tamanho_fatia:
+            fatias.append((primeiro, nome))
+            primeiro, acumulado = None, 0
+    if primeiro is not None:
+        fatias.append((primeiro, nome))
+    return fatias
+
+
+def gerar_relatorio_paralelo(
+    formato: str = 'texto', trabalhadores: int = None,
+    tamanho_fatia: int = TAMANHO_FATIA, tamanho_lote: int = 2000
+):
+    """
+    Gera o relatório de estatísticas em partes, renderizando as fatias em paralelo.
+
+    O banco é escolhido como em gerar_relatorio_estatisticas (a réplica, dentro
+    de ler_da_replica()). No máximo duas fatias por processo ficam pendentes:
+    a memória usada não depende do tamanho do histórico.
+
+    Args:
+        formato: 'texto', 'csv' ou 'jsonl'
+        trabalhadores: Quantidade de processos (padrão: os.cpu_count())
+        tamanho_fatia: Estatísticas por fatia (ver planejar_fatias)
+        tamanho_lote: Quantidade de linhas buscadas do banco por vez em cada processo
+
+    Yields:
+        Trechos do relatório, os mesmos de gerar_relatorio_estatisticas
+
+    Raises:
+        ValueError: Se o formato for desconhecido, os tamanhos não forem
+            positivos ou o banco for SQLite em memória
+    """
+    from .relatorios import FORMATOS, consultar_estatisticas
+
+    if formato not in FORMATOS:
+        raise ValueError(f'Formato deve ser um de: {", ".join(FORMATOS)}')
+    if trabalhadores is None:
+        trabalhadores = os.cpu_count() or 1
+    if trabalhadores < 1:
+        raise ValueError('trabalhadores deve ser positivo')
+    if tamanho_fatia < 1 or tamanho_lote < 1:
+        raise ValueError('tamanho_fatia e tamanho_lote devem ser positivos')
+
+    alias = consultar_estatisticas().db
+    conexao = connections[alias]
+    if conexao.vendor == 'sqlite' and conexao.is_in_memory_db():
+        raise ValueError('O relatório paralelo requer um banco em arquivo')
+
+    fatias = planejar_fatias(alias, tamanho_fatia)
+    return _gerar(formato, alias, fatias, min(trabalhadores, len(fatias)), tamanho_lote)
+
+
+def _gerar(formato: str, alias: str, fatias: list, trabalhadores: int, tamanho_lote: int):
+    from .relatorios import cabecalho, rodape
+
+    inicio, fim = cabecalho(formato), rodape(formato)
+    if inicio:
+        yield inicio
+
+    if fatias:
+        executor = ProcessPoolExecutor(
+            trabalhadores,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_iniciar_processo,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'], alias, dict(connections[alias].settings_dict)),
+        )
+        try:
+            pendentes = deque()
+            for primeiro, ultimo in fatias:
+                pendentes.append(executor.submit(_renderizar_fatia, formato, alias, primeiro, ultimo, tamanho_lote))
+                if len(pendentes) >= 2 * trabalhadores:
+                    yield pendentes.popleft().result()
+            while pendentes:
+                yield pendentes.popleft().result()
+        finally:
+            # Se o consumo for interrompido, as fatias ainda não iniciadas são descartadas
+            executor.shutdown(cancel_futures=True)
+
+    if fim:
+        yield fim
+
+
+def _iniciar_processo(modulo_configuracao: str, alias: str, configuracao_banco: dict) -> None:
+    """Configura o Django no processo e aponta ``alias`` para o mesmo banco do processo principal"""
+    import django
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = modulo_configuracao
+    django.setup()
+    # O processo principal pode usar outro arquivo que o de settings.DATABASES
+    # (bancos de teste); uma conexão já criada com a configuração anterior é descartada
+    connections.settings[alias] = configuracao_banco
+    connections[alias].close()
+    del connections[alias]
+
+
+def _renderizar_fatia(formato: str, alias: str, primeiro: str, ultimo: str, tamanho_lote: int) -> str:
+    """Corpo do relatório para os atletas com nome entre ``primeiro`` e ``ultimo``"""
+    from .relatorios import consultar_estatisticas, gerar_corpo, gerar_linhas
+
+    valores = consultar_estatisticas().using(alias).filter(
+        atleta__nome__gte=primeiro, atleta__nome__lte=ultimo
+    )
+    return gerar_corpo(formato, gerar_linhas(valores.iterator(chunk_size=tamanho_lote)))
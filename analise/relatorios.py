@@ -0,0 +1,212 @@
+"""
+Relatórios de estatísticas gerados de forma incremental.
+
+As estatísticas são lidas com ``QuerySet.iterator(chunk_size=...)`` e cada linha
+é formatada assim que chega do banco, de modo que o consumo de memória não
+depende do tamanho do histórico.
+
+As linhas vêm de ``values_list`` e são convertidas em LinhaRelatorio (tupla
+nomeada, sem instanciar Estatistica, Atleta e Evento), com a data já formatada
+em DD/MM/AAAA; cada data distinta é formatada uma única vez.
+
+Cada formato é dividido em cabeçalho, corpo e rodapé: o corpo de um
+intervalo de atletas não depende dos demais, o que permite renderizá-los em
+paralelo (ver analise/relatorio_paralelo.py).
+"""
+import csv
+import json
+from datetime import date
+from typing import NamedTuple
+
+from .models.estatistica import Estatistica
+from .relatorio_paralelo import TAMANHO_FATIA, gerar_relatorio_paralelo
+
+FORMATOS = ('texto', 'csv', 'jsonl')
+
+TIPOS_CONTEUDO = {
+    'texto': 'text/plain; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+CAMPOS = ['atleta', 'esporte', 'evento', 'data', 'pontuacao', 'observacoes']
+
+SEPARADOR = '=' * 80
+
+
+class LinhaRelatorio(NamedTuple):
+    """Campos de uma estatística usados no relatório e nas exportações"""
+    atleta: str
+    esporte: str
+    evento: str
+    data: date
+    data_formatada: str  # DD/MM/AAAA
+    pontuacao: int | None
+    observacoes: str | None
+
+
+def consultar_estatisticas():
+    """
+    Valores das estatísticas, agrupadas por atleta e ordenadas pela data do
+    evento, na ordem de LinhaRelatorio (sem data_formatada).
+
+    O id desempata a ordem, para que o relatório seja sempre o mesmo para os
+    mesmos dados, seja gerado de uma vez ou por intervalos de atletas.
+    """
+    return Estatistica.objects.order_by('atleta__nome', 'evento__data', 'id').values_list(
+        'atleta__nome', 'atleta__esporte', 'evento__nome', 'evento__data', 'pontuacao', 'observacoes'
+    )
+
+
+def gerar_linhas(valores):
+    """
+    Converte as tuplas de consultar_estatisticas() em LinhaRelatorio.
+
+    Args:
+        valores: Iterável de tuplas (por exemplo, o iterator() da consulta)
+
+    Yields:
+        LinhaRelatorio de cada estatística
+    """
+    datas_formatadas = {}
+    for atleta, esporte, evento, data, pontuacao, observacoes in valores:
+        data_formatada = datas_formatadas.get(data)
+        if data_formatada is None:
+            data_formatada = datas_formatadas[data] = data.strftime('%d/%m/%Y')
+        yield LinhaRelatorio(atleta, esporte, evento, data, data_formatada, pontuacao, observacoes)
+
+
+def gerar_relatorio_estatisticas(formato: str = 'texto', tamanho_lote: int = 2000):
+    """
+    Gera o relatório de estatísticas em partes (strings), sem materializar a consulta.
+
+    Args:
+        formato: 'texto', 'csv' ou 'jsonl'
+        tamanho_lote: Quantidade de linhas buscadas do banco por vez
+
+    Yields:
+        Trechos do relatório no formato solicitado
+
+    Raises:
+        ValueError: Se o formato for desconhecido
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f'Formato deve ser um de: {", ".join(FORMATOS)}')
+
+    estatisticas = consultar_estatisticas()
+    # O banco é escolhido agora: em uma resposta em streaming a iteração ocorre
+    # depois que a view retorna, fora de ler_da_replica()
+    estatisticas = estatisticas.using(estatisticas.db)
+    return gerar_trechos(formato, gerar_linhas(estatisticas.iterator(chunk_size=tamanho_lote)))
+
+
+def escrever_relatorio_estatisticas(
+    saida, formato: str = 'texto', tamanho_lote: int = 2000,
+    trabalhadores: int = None, tamanho_fatia: int = TAMANHO_FATIA
+) -> None:
+    """
+    Escreve o relatório de estatísticas em qualquer objeto com método ``write``.
+
+    Args:
+        saida: Destino do relatório (arquivo, sys.stdout, StringIO...)
+        formato: 'texto', 'csv' ou 'jsonl'
+        tamanho_lote: Quantidade de linhas buscadas do banco por vez
+        trabalhadores: Se informado, renderiza o relatório em paralelo nessa
+            quantidade de processos (ver gerar_relatorio_paralelo)
+        tamanho_fatia: Estatísticas por fatia no modo paralelo
+    """
+    if trabalhadores is None:
+        trechos = gerar_relatorio_estatisticas(formato, tamanho_lote)
+    else:
+        trechos = gerar_relatorio_paralelo(formato, trabalhadores, tamanho_fatia, tamanho_lote)
+    for trecho in trechos:
+        saida.write(trecho)
+
+
+def gerar_trechos(formato: str, linhas):
+    """Cabeçalho, corpo (das LinhaRelatorio recebidas) e rodapé do relatório"""
+    inicio, fim = cabecalho(formato), rodape(formato)
+    # O formato jsonl não tem cabeçalho nem rodapé
+    if inicio:
+        yield inicio
+    yield from _CORPOS[formato](linhas)
+    if fim:
+        yield fim
+
+
+def cabecalho(formato: str) -> str:
+    """Início do relatório, escrito antes da primeira linha ('' se o formato não tiver)"""
+    if formato == 'texto':
+        return f"{SEPARADOR}\nRELATÓRIO FINAL: ESTATÍSTICAS POR ATLETA\n{SEPARADOR}\n"
+    if formato == 'csv':
+        return csv.writer(_Eco()).writerow(CAMPOS)
+    return ''
+
+
+def rodape(formato: str) -> str:
+    """Fim do relatório, escrito após a última linha ('' se o formato não tiver)"""
+    if formato == 'texto':
+        return f"\n{SEPARADOR}\nFIM DO RELATÓRIO.\n{SEPARADOR}\n\n"
+    return ''
+
+
+def gerar_corpo(formato: str, linhas) -> str:
+    """Corpo do relatório para as LinhaRelatorio recebidas, sem cabeçalho e rodapé"""
+    return ''.join(_CORPOS[formato](linhas))
+
+
+def _corpo_texto(linhas):
+    """Formato texto, idêntico ao impresso por test_aplicacao.imprimir_relatorio_estatisticas"""
+    atleta_atual = None
+
+    for linha in linhas:
+        # Se o atleta mudar, escreve o cabeçalho do novo grupo
+        if linha.atleta != atleta_atual:
+            yield f"\n--- ATLETA: {linha.atleta} ({linha.esporte}) ---\n"
+            atleta_atual = linha.atleta
+
+        # Apenas a primeira linha da observação
+        observacao = linha.observacoes.splitlines()[0] if linha.observacoes else 'N/A'
+        yield (
+            f"  > Evento: {linha.evento} ({linha.data_formatada})\n"
+            f"    - Pontuação: {linha.pontuacao} | Observação: {observacao}\n"
+        )
+
+
+class _Eco:
+    """Pseudo-arquivo que devolve o que for escrito, para uso com csv.writer"""
+
+    def write(self, valor):
+        return valor
+
+
+def _corpo_csv(linhas):
+    """Formato CSV, uma linha por estatística (o cabeçalho vem de cabecalho())"""
+    escritor = csv.writer(_Eco())
+    for linha in linhas:
+        yield escritor.writerow(_valores(linha))
+
+
+def _corpo_jsonl(linhas):
+    """Formato JSON Lines, um objeto por estatística"""
+    for linha in linhas:
+        yield json.dumps(dict(zip(CAMPOS, _valores(linha))), ensure_ascii=False) + '\n'
+
+
+def _valores(linha: LinhaRelatorio) -> list:
+    """Valores de uma linha na ordem de CAMPOS"""
+    return [
+        linha.atleta,
+        linha.esporte,
+        linha.evento,
+        linha.data.isoformat(),
+        linha.pontuacao,
+        linha.observacoes,
+    ]
+
+
+_CORPOS = {
+    'texto': _corpo_texto,
+    'csv': _corpo_csv,
+    'jsonl': _corpo_jsonl,
+}
@@ -0,0 +1,204 @@
+"""
+Leituras analíticas em uma réplica do banco SQLite.
+
+A réplica (alias ``ANALISE_REPLICA_ALIAS``, padrão 'replica') é uma cópia do
+banco principal gravada por ``atualizar_replica`` com a API de backup online
+do SQLite, que copia o banco sem bloquear as escritas por mais que uma
+leitura; o comando ``atualizar_replica`` a atualiza periodicamente.
+
+RoteadorReplica envia para a réplica as leituras feitas dentro de
+``ler_da_replica()`` (ou de funções decoradas com ``leitura_replica``): os
+métodos de consulta dos managers, a API JSON e o relatório. As demais
+leituras, inclusive as validações feitas ao gravar, e todas as escritas vão
+para 'default'. A réplica só é usada se ``ANALISE_LEITURA_REPLICA`` estiver
+ativo e a última atualização tiver ocorrido há no máximo
+``ANALISE_REPLICA_ATRASO_MAXIMO`` segundos; caso contrário as leituras voltam
+para o banco principal.
+
+Uso:
+    atualizar_replica()
+    with ler_da_replica():
+        Atleta.objects.buscar_ranking_eventos_oficiais(3)
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+# Tabela gravada na réplica com o instante (epoch) da última atualização
+TABELA_SINCRONIZACAO = 'analise_sincronizacao_replica'
+
+_leitura_replica = ContextVar('analise_leitura_replica', default=False)
+
+# Instante da última atualização lido da réplica, reconsultado a cada ANALISE_REPLICA_VERIFICACAO segundos
+_sincronizacao = {'sincronizada_em': None, 'verificada_em': None}
+_trava_sincronizacao = threading.Lock()
+
+
+def alias_replica() -> str:
+    return getattr(settings, 'ANALISE_REPLICA_ALIAS', 'replica')
+
+
+def _caminho(alias: str) -> str:
+    return os.fspath(connections.settings[alias]['NAME'])
+
+
+def atualizar_replica(origem: str = DEFAULT_DB_ALIAS, destino: str = None, paginas: int = -1) -> float:
+    """
+    Copia o banco ``origem`` sobre o arquivo da réplica com a API de backup do SQLite.
+
+    Apenas transações confirmadas são copiadas. A cópia é feita no próprio
+    arquivo da réplica: conexões abertas nela passam a ver os dados novos
+    quando a cópia termina, sem precisar reconectar.
+
+    Args:
+        origem: Alias do banco copiado
+        destino: Alias da réplica (padrão: ANALISE_REPLICA_ALIAS)
+        paginas: Páginas copiadas por passo; -1 copia tudo em um passo, com o
+            menor intervalo de bloqueio da réplica
+
+    Returns:
+        Instante (epoch) da atualização gravado na réplica
+
+    Raises:
+        ValueError: Se os bancos não forem SQLite em arquivo ou forem o mesmo arquivo
+    """
+    destino = destino or alias_replica()
+    for alias in (origem, destino):
+        if connections.settings[alias]['ENGINE'] != 'django.db.backends.sqlite3':
+            raise ValueError(f'O banco {alias} deve ser SQLite')
+    caminho = _caminho(destino)
+    if caminho == ':memory:' or caminho.startswith('file:'):
+        raise ValueError('A réplica deve ser um arquivo')
+    if caminho == _caminho(origem):
+        raise ValueError('A réplica deve ser um arquivo diferente do banco de origem')
+
+    # Uma conexão própria copia apenas dados confirmados: o backup a partir de uma
+    # conexão com transação de escrita aberta ficaria aguardando indefinidamente
+    banco_origem = connections[origem]
+    conexao_origem = banco_origem.get_new_connection(banco_origem.get_connection_params())
+    sincronizada_em = time.time()
+
+    timeout = connections.settings[destino].get('OPTIONS', {}).get('timeout', 5)
+    conexao_destino = sqlite3.connect(caminho, timeout=timeout)
+    try:
+        conexao_origem.backup(conexao_destino, pages=paginas)
+        with conexao_destino:
+            conexao_destino.execute(f'CREATE TABLE IF NOT EXISTS {TABELA_SINCRONIZACAO} (sincronizada_em REAL)')
+            conexao_destino.execute(f'DELETE FROM {TABELA_SINCRONIZACAO}')
+            conexao_destino.execute(f'INSERT INTO {TABELA_SINCRONIZACAO} VALUES (?)', [sincronizada_em])
+    finally:
+        conexao_destino.close()
+        conexao_origem.close()
+
+    with _trava_sincronizacao:
+        _sincronizacao.update(sincronizada_em=sincronizada_em, verificada_em=time.monotonic())
+    return sincronizada_em
+
+
+def _consultar_sincronizacao(alias: str):
+    """Instante da última atualização gravado na réplica, ou None se ela nunca foi atualizada"""
+    if alias not in connections.settings or not os.path.exists(_caminho(alias)):
+        # Conectar criaria um arquivo vazio no lugar da réplica
+        return None
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'SELECT MAX(sincronizada_em) FROM {TABELA_SINCRONIZACAO}')
+            return cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+
+
+def sincronizada_em():
+    """Instante (epoch) da última atualização da réplica, ou None"""
+    intervalo = getattr(settings, 'ANALISE_REPLICA_VERIFICACAO', 5)
+    with _trava_sincronizacao:
+        verificada_em = _sincronizacao['verificada_em']
+        if verificada_em is not None and time.monotonic() - verificada_em < intervalo:
+            return _sincronizacao['sincronizada_em']
+
+    valor = _consultar_sincronizacao(alias_replica())
+    with _trava_sincronizacao:
+        _sincronizacao.update(sincronizada_em=valor, verificada_em=time.monotonic())
+    return valor
+
+
+def atraso_replica():
+    """Segundos desde a última atualização da réplica, ou None se ela nunca foi atualizada"""
+    valor = sincronizada_em()
+    return None if valor is None else max(time.time() - valor, 0.0)
+
+
+def alias_leitura() -> str:
+    """
+    Alias das leituras analíticas: a réplica, se habilitada e dentro do
+    atraso máximo, ou 'default'.
+    """
+    if not getattr(settings, 'ANALISE_LEITURA_REPLICA', False):
+        return DEFAULT_DB_ALIAS
+
+    atraso = atraso_replica()
+    if atraso is None or atraso > getattr(settings, 'ANALISE_REPLICA_ATRASO_MAXIMO', 300):
+        return DEFAULT_DB_ALIAS
+    return alias_replica()
+
+
+@contextmanager
+def ler_da_replica():
+    """Envia para a réplica as leituras feitas no bloco (ver RoteadorReplica)"""
+    token = _leitura_replica.set(True)
+    try:
+        yield
+    finally:
+        _leitura_replica.reset(token)
+
+
+def leitura_replica(funcao):
+    """Executa a função (síncrona ou assíncrona) dentro de ler_da_replica()"""
+    if iscoroutinefunction(funcao):
+        @wraps(funcao)
+        async def wrapper_assincrono(*args, **kwargs):
+            with ler_da_replica():
+                return await funcao(*args, **kwargs)
+        return wrapper_assincrono
+
+    @wraps(funcao)
+    def wrapper(*args, **kwargs):
+        with ler_da_replica():
+            return funcao(*args, **kwargs)
+    return wrapper
+
+
+class RoteadorReplica:
+    """
+    Leituras dentro de ler_da_replica() vão para alias_leitura(); escritas
+    sempre vão para 'default'. A réplica não recebe migrações: seu esquema
+    vem da cópia do banco principal.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _leitura_replica.get():
+            return None
+        return alias_leitura()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A réplica é uma cópia do banco principal: os objetos podem se relacionar
+        bancos = {DEFAULT_DB_ALIAS, alias_replica()}
+        if obj1._state.db in bancos and obj2._state.db in bancos:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db == alias_replica():
+            return False
+        return None
@@ -0,0 +1,126 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import invalidar_ao_confirmar
+from .models.atleta import Atleta
+from .models.estatistica import Estatistica
+from .models.evento import Evento
+from .models.resumo_atleta import ResumoAtleta
+from .validacao import contexto_atual
+
+
+def _campo_alterado(campo, update_fields) -> bool:
+    """Se o save pode ter alterado o campo (update_fields=None grava todos)"""
+    return update_fields is None or campo in update_fields
+
+
+# --------------------------------------------------------------------------------------------------
+# Manutenção do ResumoAtleta
+# --------------------------------------------------------------------------------------------------
+
+@receiver(post_save, sender=Estatistica)
+def atualizar_resumo_estatistica_salva(sender, instance, created, raw=False, **kwargs):
+    """Soma a nova estatística ao resumo ou recalcula os resumos afetados pela alteração"""
+    if raw:
+        return
+    
+    contexto = contexto_atual()
+    if contexto is not None:
+        # Recalculado uma vez ao final do contexto de validação
+        contexto.adiar_resumo(instance.atleta_id, getattr(instance, '_atleta_id_original', None))
+        return
+    
+    if created:
+        ResumoAtleta.objects.registrar(instance)
+    else:
+        # O atleta pode ter sido trocado; recalcula o anterior e o atual
+        ResumoAtleta.objects.recalcular(
+            {instance.atleta_id, getattr(instance, '_atleta_id_original', instance.atleta_id)}
+        )
+
+
+@receiver(post_delete, sender=Estatistica)
+def atualizar_resumo_estatistica_removida(sender, instance, **kwargs):
+    """Recalcula o resumo do atleta da estatística removida"""
+    contexto = contexto_atual()
+    if contexto is not None:
+        contexto.adiar_resumo(instance.atleta_id)
+        return
+    
+    ResumoAtleta.objects.recalcular({instance.atleta_id})
+
+
+@receiver(post_save, sender=Evento)
+def atualizar_resumo_evento_alterado(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Recalcula os resumos dos participantes quando esporte ou oficialidade do evento mudam"""
+    if raw:
+        return
+    if created:
+        instance._classificacao_original = (instance.esporte, instance.oficial)
+        return
+    if not (_campo_alterado('esporte', update_fields) or _campo_alterado('oficial', update_fields)):
+        return
+    
+    # Sem os valores originais (instância não lida do banco), recalcula por segurança
+    original = getattr(instance, '_classificacao_original', None)
+    instance._classificacao_original = (instance.esporte, instance.oficial)
+    if original == instance._classificacao_original:
+        return
+    
+    ResumoAtleta.objects.recalcular(
+        Estatistica.objects.filter(evento=instance).values_list('atleta_id', flat=True)
+    )
+
+
+# --------------------------------------------------------------------------------------------------
+# Manutenção do indicador Estatistica.estrangeiro
+# --------------------------------------------------------------------------------------------------
+
+@receiver(post_save, sender=Atleta)
+def atualizar_estrangeiro_atleta_alterado(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Recalcula o indicador das estatísticas do atleta quando a nacionalidade pode ter mudado"""
+    if raw or created or not _campo_alterado('nacionalidade', update_fields):
+        return
+    
+    Estatistica.objects.atualizar_estrangeiro(atleta=instance)
+
+
+@receiver(post_save, sender=Evento)
+def atualizar_estrangeiro_evento_alterado(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Recalcula o indicador das estatísticas do evento quando o país pode ter mudado"""
+    if raw or created or not _campo_alterado('pais', update_fields):
+        return
+    
+    Estatistica.objects.atualizar_estrangeiro(evento=instance)
+
+
+# --------------------------------------------------------------------------------------------------
+# Invalidação do cache de consultas
+# --------------------------------------------------------------------------------------------------
+
+@receiver(post_save, sender=Atleta)
+@receiver(post_save, sender=Evento)
+@receiver(post_save, sender=Estatistica)
+@receiver(post_delete, sender=Atleta)
+@receiver(post_delete, sender=Evento)
+@receiver(post_delete, sender=Estatistica)
+def invalidar_cache_consultas(sender, using=None, **kwargs):
+    """Incrementa a versão do modelo alterado no cache de consultas após a confirmação"""
+    invalidar_ao_confirmar(sender, using)
+
+
+# --------------------------------------------------------------------------------------------------
+# Configuração das conexões SQLite
+# --------------------------------------------------------------------------------------------------
+
+@receiver(connection_created)
+def aplicar_pragmas_sqlite(sender, connection, **kwargs):
+    """Aplica os PRAGMAs da chave 'PRAGMAS' do banco (ver perfil 'producao' em settings.py)"""
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    
+    with connection.cursor() as cursor:
+        for pragma, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {pragma} = {valor}')
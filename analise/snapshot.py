@@ -0,0 +1,295 @@
+"""
+Snapshot colunar de Estatistica para análises fora do ORM.
+
+``exportar_snapshot`` grava cada coluna em um arquivo binário little-endian
+de tipo fixo (``<coluna>.bin``) e um ``manifesto.json`` com a quantidade de
+linhas, o dtype de cada coluna (no formato do NumPy, ex.: '<i8') e os
+dicionários das colunas de texto, gravadas como códigos inteiros:
+
+- esporte, nacionalidade (do atleta) e pais (do evento) são códigos que
+  indexam ``manifesto['dicionarios'][coluna]``;
+- data é o número de dias desde 1970-01-01 (compatível com datetime64[D]);
+- valores nulos são representados por NULO_INTEIRO nas colunas inteiras e
+  por NaN em distancia.
+
+``abrir_snapshot`` mapeia os arquivos em memória (mmap) e expõe cada coluna
+como memoryview tipada, sem copiar os dados: abrir um snapshot de milhões de
+linhas custa o mesmo que abrir um pequeno, e só as páginas lidas são
+carregadas. Os arquivos também podem ser abertos com
+``numpy.memmap(arquivo, dtype=manifesto['colunas'][nome]['dtype'], mode='r')``.
+
+O mapeamento evita a cópia e a leitura pelo ORM, mas ``Snapshot.agregar`` é um
+laço em Python sobre as memoryviews: cada linha vira um objeto int/float e o
+custo cresce linearmente com o total, na ordem de segundos por dezena de
+milhões de linhas. Para agregações pesadas, use as colunas com o NumPy
+(numpy.memmap acima), que opera sobre os mesmos arquivos sem esse custo por linha.
+
+Uso:
+    exportar_snapshot('/tmp/snapshot')
+    with abrir_snapshot('/tmp/snapshot') as snapshot:
+        snapshot.agregar('esporte', 'pontuacao')
+"""
+import json
+import math
+import mmap
+import os
+import sys
+from array import array
+from datetime import date, datetime, timezone
+
+from django.db.models import F
+
+from .models.estatistica import Estatistica
+
+VERSAO = 1
+
+MANIFESTO = 'manifesto.json'
+
+# Representação de nulo nas colunas inteiras (as métricas nunca são negativas)
+NULO_INTEIRO = -1
+
+_EPOCA = date(1970, 1, 1).toordinal()
+
+# Colunas do snapshot: (nome, campo no ORM, typecode do array, dtype do NumPy)
+COLUNAS = (
+    ('id', 'id', 'q', '<i8'),
+    ('atleta_id', 'atleta_id', 'q', '<i8'),
+    ('evento_id', 'evento_id', 'q', '<i8'),
+    ('data', 'evento__data', 'i', '<i4'),
+    ('esporte', 'evento__esporte', 'i', '<i4'),
+    ('oficial', 'evento__oficial', 'b', '|i1'),
+    ('pais', 'evento__pais', 'i', '<i4'),
+    ('nacionalidade', 'atleta__nacionalidade', 'i', '<i4'),
+    ('estrangeiro', 'estrangeiro', 'b', '|i1'),
+    ('pontuacao', 'pontuacao', 'i', '<i4'),
+    ('assistencias', 'assistencias', 'i', '<i4'),
+    ('faltas', 'faltas', 'i', '<i4'),
+    ('cartoes', 'cartoes', 'i', '<i4'),
+    ('minutos_jogados', 'minutos_jogados', 'i', '<i4'),
+    ('distancia', 'distancia', 'd', '<f8'),
+)
+
+COLUNAS_DICIONARIO = ('esporte', 'pais', 'nacionalidade')
+
+
+def _converter(nome, valor, dicionarios):
+    """Valor do banco para o valor gravado na coluna"""
+    if nome in COLUNAS_DICIONARIO:
+        codigos = dicionarios[nome]
+        if valor not in codigos:
+            codigos[valor] = len(codigos)
+        return codigos[valor]
+    if nome == 'data':
+        return valor.toordinal() - _EPOCA
+    if nome == 'distancia':
+        return math.nan if valor is None else float(valor)
+    if valor is None:
+        return NULO_INTEIRO
+    return int(valor)
+
+
+def _gravar(arquivo, coluna: array) -> None:
+    if sys.byteorder == 'big':
+        coluna.byteswap()
+    coluna.tofile(arquivo)
+
+
+def exportar_snapshot(diretorio: str, queryset=None, tamanho_lote: int = 50000) -> dict:
+    """
+    Exporta as estatísticas em colunas binárias no diretório.
+
+    As linhas são lidas com iterator() e gravadas em lotes, de modo que a
+    memória usada não cresce com o total. O manifesto é gravado por último:
+    um diretório sem manifesto é um snapshot incompleto.
+
+    Args:
+        diretorio: Diretório de destino (criado se não existir)
+        queryset: Estatísticas exportadas (padrão: todas, em ordem de id)
+        tamanho_lote: Linhas lidas do banco e gravadas por vez
+
+    Returns:
+        Manifesto do snapshot
+
+    Raises:
+        ValueError: Se tamanho_lote não for positivo
+    """
+    if tamanho_lote < 1:
+        raise ValueError('Tamanho do lote deve ser positivo')
+    if queryset is None:
+        queryset = Estatistica.objects.order_by('id')
+
+    os.makedirs(diretorio, exist_ok=True)
+    caminho_manifesto = os.path.join(diretorio, MANIFESTO)
+    if os.path.exists(caminho_manifesto):
+        os.remove(caminho_manifesto)
+
+    linhas = queryset.annotate(**{
+        f'_snapshot_{nome}': F(campo) for nome, campo, _, _ in COLUNAS
+    }).values_list(*(f'_snapshot_{nome}' for nome, _, _, _ in COLUNAS))
+
+    dicionarios = {nome: {} for nome in COLUNAS_DICIONARIO}
+    arquivos = {nome: open(os.path.join(diretorio, f'{nome}.bin'), 'wb') for nome, _, _, _ in COLUNAS}
+    total = 0
+
+    try:
+        lote = {nome: array(typecode) for nome, _, typecode, _ in COLUNAS}
+        for linha in linhas.iterator(chunk_size=tamanho_lote):
+            for (nome, _, _, _), valor in zip(COLUNAS, linha):
+                lote[nome].append(_converter(nome, valor, dicionarios))
+            total += 1
+
+            if total % tamanho_lote == 0:
+                for nome, coluna in lote.items():
+                    _gravar(arquivos[nome], coluna)
+                lote = {nome: array(typecode) for nome, _, typecode, _ in COLUNAS}
+
+        for nome, coluna in lote.items():
+            _gravar(arquivos[nome], coluna)
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+
+    manifesto = {
+        'versao': VERSAO,
+        'linhas': total,
+        'criado_em': datetime.now(timezone.utc).isoformat(),
+        'nulo_inteiro': NULO_INTEIRO,
+        'colunas': {
+            nome: {'arquivo': f'{nome}.bin', 'tipo': typecode, 'dtype': dtype}
+            for nome, _, typecode, dtype in COLUNAS
+        },
+        # Lista na ordem dos códigos: dicionarios['esporte'][codigo] é o valor original
+        'dicionarios': {nome: list(codigos) for nome, codigos in dicionarios.items()},
+    }
+
+    temporario = caminho_manifesto + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, indent=2, ensure_ascii=False)
+    os.replace(temporario, caminho_manifesto)
+
+    return manifesto
+
+
+class Snapshot:
+    """
+    Snapshot aberto: cada coluna é uma memoryview somente leitura sobre o
+    arquivo mapeado em memória. Use como context manager ou chame fechar().
+    """
+
+    def __init__(self, diretorio: str):
+        caminho_manifesto = os.path.join(diretorio, MANIFESTO)
+        if not os.path.exists(caminho_manifesto):
+            raise ValueError(f'{diretorio} não contém um snapshot completo ({MANIFESTO} ausente)')
+
+        with open(caminho_manifesto, encoding='utf-8') as arquivo:
+            self.manifesto = json.load(arquivo)
+        if self.manifesto['versao'] != VERSAO:
+            raise ValueError(f"Versão de snapshot não suportada: {self.manifesto['versao']}")
+        if sys.byteorder == 'big':
+            raise ValueError('abrir_snapshot requer uma plataforma little-endian')
+
+        self.linhas = self.manifesto['linhas']
+        self.dicionarios = self.manifesto['dicionarios']
+        self._mapas = []
+        self._colunas = {}
+
+        try:
+            for nome, coluna in self.manifesto['colunas'].items():
+                with open(os.path.join(diretorio, coluna['arquivo']), 'rb') as arquivo:
+                    if self.linhas:
+                        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+                        self._mapas.append(mapa)
+                        visao = memoryview(mapa).cast(coluna['tipo'])
+                    else:
+                        visao = memoryview(array(coluna['tipo']))
+                self._colunas[nome] = visao
+                if len(visao) != self.linhas:
+                    raise ValueError(f'Coluna {nome} tem {len(visao)} linhas; o manifesto indica {self.linhas}')
+        except BaseException:
+            # Libera as colunas já mapeadas: o chamador não recebe o objeto para fechá-lo
+            self.fechar()
+            raise
+
+    def __len__(self) -> int:
+        return self.linhas
+
+    def __getitem__(self, nome: str) -> memoryview:
+        return self._colunas[nome]
+
+    @property
+    def colunas(self) -> tuple:
+        return tuple(self._colunas)
+
+    def decodificar(self, coluna: str, codigo: int):
+        """Valor original de um código das colunas dicionarizadas (e data)"""
+        if coluna == 'data':
+            return date.fromordinal(codigo + _EPOCA)
+        return self.dicionarios[coluna][codigo]
+
+    def agregar(self, por: str, coluna: str) -> dict:
+        """
+        Agrupa as linhas por uma coluna e agrega outra, ignorando nulos.
+
+        Percorre todas as linhas em Python, sem vetorização (ver a docstring
+        do módulo): conveniente para consultas pontuais, não para varreduras
+        repetidas de snapshots grandes.
+
+        Args:
+            por: Coluna de agrupamento (colunas dicionarizadas são decodificadas)
+            coluna: Coluna numérica agregada
+
+        Returns:
+            Dicionário {valor do grupo: {'quantidade', 'soma', 'media', 'minimo', 'maximo'}}
+        """
+        nulo = math.nan if coluna == 'distancia' else NULO_INTEIRO
+        grupos = {}
+
+        for chave, valor in zip(self._colunas[por], self._colunas[coluna]):
+            if valor == nulo or valor != valor:  # valor != valor para NaN
+                continue
+            grupo = grupos.get(chave)
+            if grupo is None:
+                grupos[chave] = [1, valor, valor, valor]
+            else:
+                grupo[0] += 1
+                grupo[1] += valor
+                if valor < grupo[2]:
+                    grupo[2] = valor
+                if valor > grupo[3]:
+                    grupo[3] = valor
+
+        decodificar = por in self.dicionarios or por == 'data'
+        return {
+            (self.decodificar(por, chave) if decodificar else chave): {
+                'quantidade': quantidade,
+                'soma': soma,
+                'media': soma / quantidade,
+                'minimo': minimo,
+                'maximo': maximo,
+            }
+            for chave, (quantidade, soma, minimo, maximo) in grupos.items()
+        }
+
+    def fechar(self) -> None:
+        for visao in self._colunas.values():
+            visao.release()
+        self._colunas.clear()
+        for mapa in self._mapas:
+            mapa.close()
+        self._mapas.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def abrir_snapshot(diretorio: str) -> Snapshot:
+    """
+    Abre um snapshot gravado por exportar_snapshot.
+
+    Raises:
+        ValueError: Se o diretório não contiver um snapshot completo e compatível
+    """
+    return Snapshot(diretorio)
@@ -1,3 +1,1854 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import math
+import mmap
+import os
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+from array import array
+from datetime import date
+from importlib import import_module
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import Count, F, Max, Min, Sum
+from django.http import HttpResponse
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .cache import estatisticas_cache, obter_cache, versoes, zerar_estatisticas_cache
+from .gerador import CAPACIDADE_CPF, gerar_cpf, gerar_dados
+from .instrumentacao import relatorio_instrumentacao, zerar_instrumentacao
+from .managers.atleta_manager import MotivoInelegibilidade
+from .memoria import MotorConsultas
+from .middleware import InstrumentacaoConsultasMiddleware
+from .models.atleta import Atleta
+from .models.evento import Evento
+from .models.estatistica import Estatistica
+from .models.esporte import Esporte
+from .models.progresso_importacao import ProgressoImportacao
+from .models.resumo_atleta import ResumoAtleta
+from .models.validators import (
+    data_limite_nascimento, validar_cpfs, validate_atleta_idade_minima, validate_cpf, verificar_cpf
+)
+from .paginacao import PaginadorContagemEstimada, codificar_cursor
+from .relatorios import LinhaRelatorio, consultar_estatisticas, escrever_relatorio_estatisticas, gerar_linhas
+from . import relatorio_paralelo, replica
+from .replica import RoteadorReplica, alias_leitura, atualizar_replica, ler_da_replica
+from .signals import aplicar_pragmas_sqlite
+from .snapshot import COLUNAS, COLUNAS_DICIONARIO, NULO_INTEIRO, abrir_snapshot, exportar_snapshot
+from .validacao import contexto_validacao
+
+
+def criar_atleta(**kwargs):
+    """Cria um atleta com valores padrão válidos."""
+    n = Atleta.objects.count() + 1
+    dados = {
+        'nome': f'Atleta Teste {n}',
+        'cpf': f'{n:011d}',
+        'email': f'atleta{n}@email.com',
+        'data_nascimento': date(2000, 1, 1),
+        'nacionalidade': 'Brasil',
+        'altura': 1.80,
+        'peso': 70.0,
+        'esporte': Esporte.CORRIDA,
+    }
+    dados.update(kwargs)
+    return Atleta.objects.create(**dados)
+
+
+def criar_evento(**kwargs):
+    """Cria um evento com valores padrão válidos."""
+    dados = {
+        'nome': 'Evento Teste',
+        'local': 'Local Teste',
+        'cidade': 'São Paulo',
+        'pais': 'Brasil',
+        'data': date(2025, 1, 1),
+        'esporte': Esporte.CORRIDA,
+        'oficial': True,
+        'organizador': 'Organizador',
+        'capacidade': 1000,
+    }
+    dados.update(kwargs)
+    return Evento.objects.create(**dados)
+
+
+class BulkRegistrarTest(TestCase):
+    """Testes do EstatisticaManager.bulk_registrar."""
+
+    def setUp(self):
+        self.corredor = criar_atleta()
+        self.jogador = criar_atleta(esporte=Esporte.FUTEBOL)
+        self.corrida = criar_evento()
+        self.partida = criar_evento(esporte=Esporte.FUTEBOL)
+
+    def test_registra_linhas_validas_e_reporta_invalidas(self):
+        linhas = [
+            {'atleta': self.corredor, 'evento': self.corrida, 'pontuacao': 1, 'distancia': 10},
+            # Esporte do atleta diferente do evento
+            {'atleta': self.jogador, 'evento': self.corrida, 'pontuacao': 2, 'distancia': 10},
+            # Corrida sem distância
+            {'atleta_id': self.corredor.pk, 'evento_id': self.corrida.pk, 'pontuacao': 3},
+            # Atleta inexistente
+            {'atleta_id': 0, 'evento': self.partida, 'pontuacao': 1},
+            {
+                'atleta_id': self.jogador.pk, 'evento_id': self.partida.pk, 'pontuacao': 2,
+                'assistencias': 1, 'faltas': 0, 'cartoes': 0, 'minutos_jogados': 90,
+            },
+        ]
+
+        criadas, erros = Estatistica.objects.bulk_registrar(linhas, tamanho_lote=1)
+
+        self.assertEqual(len(criadas), 2)
+        self.assertEqual(Estatistica.objects.count(), 2)
+        self.assertEqual(sorted(erros), [1, 2, 3])
+
+    def test_quantidade_de_consultas_nao_depende_do_numero_de_linhas(self):
+        linhas = [
+            {'atleta': self.corredor, 'evento': self.corrida, 'pontuacao': i, 'distancia': 5}
+            for i in range(1, 51)
+        ]
+
+        # 2 consultas de pré-carga + 1 INSERT e 3 consultas de recálculo do resumo
+        # (agregação, DELETE e INSERT), cada etapa entre SAVEPOINT e RELEASE
+        with self.assertNumQueries(10):
+            criadas, erros = Estatistica.objects.bulk_registrar(linhas, tamanho_lote=50)
+
+        self.assertEqual(len(criadas), 50)
+        self.assertEqual(erros, {})
+
+    def test_campo_inexistente_invalida_apenas_a_linha(self):
+        criadas, erros = Estatistica.objects.bulk_registrar([
+            {'atleta': self.corredor, 'evento': self.corrida, 'pontuacao': 1, 'distancia': 10, 'tempo': 30},
+            {'atleta': self.corredor, 'evento': self.corrida, 'pontuacao': 2, 'distancia': 10},
+        ])
+
+        self.assertEqual(len(criadas), 1)
+        self.assertEqual(list(erros), [0])
+        self.assertIn('tempo', erros[0][0])
+
+    def test_tamanho_lote_invalido(self):
+        with self.assertRaises(ValueError):
+            Estatistica.objects.bulk_registrar([], tamanho_lote=0)
+
+
+class RankingEventosOficiaisTest(TestCase):
+    """Testes do AtletaManager.buscar_ranking_eventos_oficiais."""
+
+    def setUp(self):
+        self.corredores = [criar_atleta(nome=f'Corredor {i}') for i in range(4)]
+        self.jogadores = [criar_atleta(nome=f'Jogador {i}', esporte=Esporte.FUTEBOL) for i in range(3)]
+        corrida = criar_evento()
+        corrida_nao_oficial = criar_evento(oficial=False)
+        partida = criar_evento(esporte=Esporte.FUTEBOL)
+
+        # Dois corredores empatados em 1º lugar; o não oficial não conta
+        for atleta, colocacao in zip(self.corredores, [1, 1, 2, 3]):
+            Estatistica.objects.create(atleta=atleta, evento=corrida, pontuacao=colocacao, distancia=10)
+        Estatistica.objects.create(
+            atleta=self.corredores[3], evento=corrida_nao_oficial, pontuacao=1, distancia=10
+        )
+        for atleta, gols in zip(self.jogadores, [3, 1, 2]):
+            Estatistica.objects.create(
+                atleta=atleta, evento=partida, pontuacao=gols,
+                assistencias=0, faltas=0, cartoes=0, minutos_jogados=90
+            )
+
+    def test_equivale_ao_metodo_por_esporte_com_limite_1(self):
+        ranking = Atleta.objects.buscar_ranking_eventos_oficiais()
+
+        for esporte in (Esporte.CORRIDA, Esporte.FUTEBOL):
+            esperado = Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(esporte)
+            self.assertEqual({a.pk for a in ranking[esporte]}, {a.pk for a in esperado})
+
+    def test_top_n_por_esporte_em_uma_consulta(self):
+        with self.assertNumQueries(1):
+            ranking = Atleta.objects.buscar_ranking_eventos_oficiais(limite=2)
+
+        corrida = [(a.nome, a.melhor_pontuacao, a.posicao) for a in ranking[Esporte.CORRIDA]]
+        futebol = [(a.nome, a.melhor_pontuacao, a.posicao) for a in ranking[Esporte.FUTEBOL]]
+        # Empate em 1º faz com que o próximo colocado fique em 3º, fora do limite
+        self.assertEqual(corrida, [('Corredor 0', 1, 1), ('Corredor 1', 1, 1)])
+        self.assertEqual(futebol, [('Jogador 0', 3, 1), ('Jogador 2', 2, 2)])
+
+    def test_limite_invalido(self):
+        with self.assertRaises(ValueError):
+            Atleta.objects.buscar_ranking_eventos_oficiais(limite=0)
+
+
+class PlanoConsultaTest(TestCase):
+    """Garante que os métodos dos managers usam índices nas tabelas grandes."""
+
+    TABELAS_GRANDES = ('analise_atleta', 'analise_estatistica')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.atleta = criar_atleta()
+        cls.evento = criar_evento()
+        Estatistica.objects.create(atleta=cls.atleta, evento=cls.evento, pontuacao=1, distancia=10)
+
+    def assertSemVarreduraCompleta(self, consulta):
+        """Executa EXPLAIN QUERY PLAN em cada SELECT emitido pela consulta"""
+        with CaptureQueriesContext(connection) as capturadas:
+            consulta()
+
+        self.assertTrue(capturadas.captured_queries)
+        with connection.cursor() as cursor:
+            for capturada in capturadas.captured_queries:
+                cursor.execute(f"EXPLAIN QUERY PLAN {capturada['sql']}")
+                for linha in cursor.fetchall():
+                    detalhe = linha[-1]
+                    for tabela in self.TABELAS_GRANDES:
+                        self.assertIsNone(
+                            self.varredura_completa(tabela).match(detalhe),
+                            f'Varredura completa em {tabela}: {detalhe}\n{capturada["sql"]}'
+                        )
+
+    @staticmethod
+    def varredura_completa(tabela):
+        """
+        'SCAN <tabela>' (SQLite >= 3.36) ou 'SCAN TABLE <tabela>' (anteriores),
+        com alias opcional, sem 'USING ... INDEX'
+        """
+        return re.compile(rf'SCAN (TABLE )?{tabela}\b(?!.*\bUSING\b.*\bINDEX\b)')
+
+    def test_buscar_corredores_vencedores(self):
+        self.assertSemVarreduraCompleta(
+            lambda: Atleta.objects.buscar_corredores_vencedores(date(2024, 1, 1))
+        )
+
+    def test_buscar_maiores_pontuadores_eventos_oficiais(self):
+        self.assertSemVarreduraCompleta(
+            lambda: list(Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(Esporte.CORRIDA))
+        )
+
+    def test_buscar_ranking_eventos_oficiais(self):
+        self.assertSemVarreduraCompleta(
+            lambda: Atleta.objects.buscar_ranking_eventos_oficiais(3)
+        )
+
+    def test_buscar_participantes(self):
+        self.assertSemVarreduraCompleta(
+            lambda: Atleta.objects.buscar_participantes(self.evento)
+        )
+
+    def test_paginas_de_corredores_vencedores_seguem_o_indice(self):
+        cursor = codificar_cursor([self.atleta.nome, self.atleta.pk])
+        with CaptureQueriesContext(connection) as capturadas:
+            self.client.get('/analise/api/atletas/corredores-vencedores/', {'data': '2000-01-01', 'cursor': cursor})
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {capturadas.captured_queries[-1]['sql']}")
+            plano = [linha[-1] for linha in cursor.fetchall()]
+        # A página começa no cursor dentro do índice, sem ordenar todos os vencedores
+        self.assertIn('atleta_esp_nome_id_idx (esporte=? AND nome>?)', plano[0])
+        self.assertFalse([detalhe for detalhe in plano if 'ORDER BY' in detalhe], plano)
+
+    def test_deteccao_de_varredura(self):
+        for detalhe in ('SCAN analise_atleta', 'SCAN TABLE analise_atleta', 'SCAN TABLE analise_atleta AS U0'):
+            self.assertTrue(self.varredura_completa('analise_atleta').match(detalhe), detalhe)
+        for detalhe in (
+            'SCAN analise_atleta USING INDEX atleta_esp_ativo_nasc_idx',
+            'SCAN TABLE analise_atleta USING COVERING INDEX atleta_esp_ativo_nasc_idx',
+            'SEARCH analise_atleta USING INTEGER PRIMARY KEY (rowid=?)',
+            'SCAN analise_atleta_x',
+        ):
+            self.assertIsNone(self.varredura_completa('analise_atleta').match(detalhe), detalhe)
+
+    def test_buscar_evento_participantes_estrangeiros(self):
+        self.assertSemVarreduraCompleta(
+            lambda: list(Evento.objects.buscar_evento_participantes_estrangeiros(date(2024, 1, 1)))
+        )
+
+    def test_elegibilidade(self):
+        self.assertSemVarreduraCompleta(lambda: list(Atleta.objects.buscar_elegiveis(self.evento)))
+        self.assertSemVarreduraCompleta(
+            lambda: Atleta.objects.verificar_elegibilidade(self.evento, [self.atleta.pk])
+        )
+
+
+class EstrangeiroTest(TestCase):
+    """Testes do indicador Estatistica.estrangeiro e da consulta que o usa."""
+
+    def setUp(self):
+        self.brasileiro = criar_atleta(nacionalidade='Brasil')
+        self.queniano = criar_atleta(nacionalidade='Quênia')
+        self.misto = criar_evento(nome='Corrida Mista', data=date(2025, 3, 1))
+        self.nacional = criar_evento(nome='Corrida Nacional', data=date(2025, 2, 1))
+
+        Estatistica.objects.create(atleta=self.brasileiro, evento=self.misto, pontuacao=1, distancia=10)
+        Estatistica.objects.create(atleta=self.queniano, evento=self.misto, pontuacao=2, distancia=10)
+        Estatistica.objects.create(atleta=self.brasileiro, evento=self.nacional, pontuacao=1, distancia=10)
+
+    def estrangeiros(self):
+        return list(Evento.objects.buscar_evento_participantes_estrangeiros(date(2024, 1, 1)))
+
+    def test_calculado_no_save(self):
+        self.assertEqual(
+            sorted(Estatistica.objects.values_list('atleta__nacionalidade', 'estrangeiro')),
+            [('Brasil', False), ('Brasil', False), ('Quênia', True)]
+        )
+        # Evento com participantes nacionais e estrangeiros também é retornado
+        self.assertEqual(self.estrangeiros(), [self.misto])
+
+    def test_recalculado_quando_nacionalidade_ou_pais_mudam(self):
+        self.brasileiro.nacionalidade = 'Argentina'
+        self.brasileiro.save()
+        self.assertEqual(self.estrangeiros(), [self.misto, self.nacional])
+
+        self.nacional.pais = 'Argentina'
+        self.nacional.save()
+        self.assertEqual(self.estrangeiros(), [self.misto])
+
+        # Saves que não gravam nacionalidade/país não recalculam
+        with self.assertNumQueries(1):
+            self.queniano.save(update_fields=['nome'])
+
+    def test_bulk_registrar_calcula_indicador(self):
+        evento = criar_evento(nome='Corrida Nova', data=date(2025, 4, 1), pais='Quênia')
+        criadas, _ = Estatistica.objects.bulk_registrar([
+            {'atleta': self.brasileiro, 'evento': evento, 'pontuacao': 1, 'distancia': 10},
+            {'atleta': self.queniano, 'evento': evento, 'pontuacao': 2, 'distancia': 10},
+        ])
+
+        self.assertEqual([estatistica.estrangeiro for estatistica in criadas], [True, False])
+        self.assertEqual(self.estrangeiros(), [evento, self.misto])
+
+    def test_atualizar_estrangeiro_corrige_apenas_linhas_divergentes(self):
+        Estatistica.objects.update(estrangeiro=False)
+
+        self.assertEqual(Estatistica.objects.atualizar_estrangeiro(), 1)
+        self.assertEqual(Estatistica.objects.atualizar_estrangeiro(), 0)
+        self.assertEqual(Estatistica.objects.get(atleta=self.queniano).estrangeiro, True)
+
+
+class ContextoValidacaoTest(TestCase):
+    """Testes do contexto de validação para gravações em lote."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corredores = [criar_atleta(nome=f'Corredor {i}') for i in range(3)]
+        cls.eventos = [criar_evento(nome=f'Corrida {i}') for i in range(2)]
+
+    def test_save_executa_apenas_o_insert(self):
+        with contexto_validacao() as contexto:
+            contexto.precarregar(atletas=self.corredores, eventos=self.eventos)
+            for atleta in self.corredores:
+                for evento in self.eventos:
+                    with self.assertNumQueries(1):
+                        Estatistica.objects.create(
+                            atleta_id=atleta.pk, evento_id=evento.pk, pontuacao=1, distancia=10
+                        )
+
+        # Resumos recalculados uma vez, na saída do contexto
+        self.assertEqual(
+            sorted(ResumoAtleta.objects.values_list('atleta_id', 'total_estatisticas')),
+            [(atleta.pk, 2) for atleta in self.corredores]
+        )
+
+    def test_relacionados_carregados_sob_demanda_uma_vez(self):
+        with contexto_validacao():
+            with self.assertNumQueries(3):  # atleta, evento e INSERT
+                Estatistica.objects.create(
+                    atleta_id=self.corredores[0].pk, evento_id=self.eventos[0].pk, pontuacao=1, distancia=10
+                )
+            with self.assertNumQueries(1):
+                Estatistica.objects.create(
+                    atleta_id=self.corredores[0].pk, evento_id=self.eventos[0].pk, pontuacao=2, distancia=10
+                )
+
+    def test_mantem_as_regras_de_validacao(self):
+        evento_futebol = criar_evento(esporte=Esporte.FUTEBOL)
+        with contexto_validacao():
+            with self.assertRaisesMessage(ValidationError, 'mas o evento é de'):
+                Estatistica.objects.create(atleta=self.corredores[0], evento=evento_futebol, pontuacao=1)
+            with self.assertRaisesMessage(ValidationError, 'distância é obrigatória'):
+                Estatistica.objects.create(
+                    atleta_id=self.corredores[0].pk, evento_id=self.eventos[0].pk, pontuacao=1
+                )
+
+    def test_erro_desfaz_o_lote(self):
+        with self.assertRaises(ValidationError):
+            with contexto_validacao():
+                Estatistica.objects.create(atleta=self.corredores[0], evento=self.eventos[0], pontuacao=1, distancia=10)
+                Estatistica.objects.create(atleta=self.corredores[0], evento=self.eventos[0], pontuacao=0, distancia=10)
+
+        self.assertFalse(Estatistica.objects.exists())
+        self.assertFalse(ResumoAtleta.objects.exists())
+
+    def test_unicidade_de_atleta_verificada_em_memoria(self):
+        def novo(n, **kwargs):
+            return Atleta(**{
+                'nome': f'Atleta Novo {n}', 'cpf': gerar_cpf(n), 'email': f'novo{n}@email.com',
+                'data_nascimento': date(1995, 1, 1), 'nacionalidade': 'Brasil',
+                'altura': 1.75, 'peso': 65.0, 'esporte': Esporte.CORRIDA, **kwargs
+            })
+
+        with self.assertRaises(ValidationError) as fora:
+            novo(1, cpf=self.corredores[0].cpf).full_clean()
+
+        existente = self.corredores[1]
+        email_anterior, existente.email = existente.email, 'alterado@email.com'
+        lote = [
+            novo(0),
+            novo(1, cpf=self.corredores[0].cpf),
+            novo(2, email='novo0@email.com'),
+            existente,
+            novo(3, email=email_anterior),
+        ]
+
+        with contexto_validacao() as contexto:
+            # Uma consulta, restrita aos cpfs e e-mails do lote
+            with CaptureQueriesContext(connection) as consultas:
+                contexto.precarregar(novos_atletas=lote)
+            self.assertEqual(len(consultas), 1)
+            self.assertIn(' IN (', consultas[0]['sql'])
+
+            with self.assertNumQueries(0):
+                lote[0].full_clean()
+                with self.assertRaises(ValidationError) as dentro:
+                    lote[1].full_clean()
+                # Valores reservados por outro atleta do mesmo lote
+                with self.assertRaisesMessage(ValidationError, 'E-mail'):
+                    lote[2].full_clean()
+                # O próprio atleta, alterado, continua válido
+                existente.validate_unique()
+                # O e-mail anterior fica livre
+                lote[4].full_clean()
+
+        self.assertEqual(dentro.exception.message_dict, fora.exception.message_dict)
+
+    def test_unicidade_sob_demanda_consulta_apenas_o_atleta(self):
+        existente = Atleta.objects.get(pk=self.corredores[0].pk)
+        with contexto_validacao():
+            with CaptureQueriesContext(connection) as consultas:
+                existente.validate_unique()
+            self.assertEqual(len(consultas), 1)
+            self.assertIn(existente.cpf, consultas[0]['sql'])
+            # Valores já consultados não são consultados de novo
+            with self.assertNumQueries(0):
+                existente.validate_unique()
+
+
+class AdminGrandesVolumesTest(TestCase):
+    """Garante número fixo de consultas por página das listagens do admin."""
+
+    # Sessão, usuário, contagem e página
+    CONSULTAS_POR_PAGINA = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth.models import User
+        cls.usuario = User.objects.create_superuser('admin', 'admin@email.com', 'senha')
+
+    def setUp(self):
+        self.client.force_login(self.usuario)
+
+    def test_changelist_de_estatisticas_independe_do_volume(self):
+        for estatisticas in (30, 300):
+            gerar_dados(estatisticas, semente=estatisticas)
+            for parametros in ({}, {'p': 2}):
+                with self.assertNumQueries(self.CONSULTAS_POR_PAGINA):
+                    resposta = self.client.get('/admin/analise/estatistica/', parametros)
+                self.assertEqual(resposta.status_code, 200)
+
+    def test_contagem_filtrada_fica_em_cache_ate_uma_escrita(self):
+        gerar_dados(60, semente=1)
+        url = '/admin/analise/estatistica/'
+        filtro = {'evento__esporte': Esporte.CORRIDA}
+        total = Estatistica.objects.filter(evento__esporte=Esporte.CORRIDA).count()
+
+        with self.assertNumQueries(self.CONSULTAS_POR_PAGINA):
+            resposta = self.client.get(url, filtro)
+        self.assertContains(resposta, f'{total} Estatisticas')
+        with self.assertNumQueries(self.CONSULTAS_POR_PAGINA - 1):
+            self.client.get(url, filtro)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Estatistica.objects.filter(evento__esporte=Esporte.CORRIDA).first().delete()
+        resposta = self.client.get(url, filtro)
+        self.assertContains(resposta, f'{total - 1} Estatisticas')
+
+    def test_demais_changelists(self):
+        gerar_dados(30)
+        for url in ('/admin/analise/atleta/', '/admin/analise/resumoatleta/'):
+            with self.assertNumQueries(self.CONSULTAS_POR_PAGINA):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class PaginadorContagemEstimadaTest(TestCase):
+    """Testes da contagem estimada do paginador do admin."""
+
+    def setUp(self):
+        obter_cache().clear()
+        self.atletas = [criar_atleta(cpf=f'{n:011d}', email=f'paginador{n}@email.com') for n in range(1, 11)]
+        # Mantém o maior id: a estimativa continua em 10
+        Atleta.objects.filter(pk__in=[atleta.pk for atleta in self.atletas[3:-1]]).delete()
+
+    def test_pagina_alem_do_fim_real_vira_a_ultima(self):
+        paginador = PaginadorContagemEstimada(Atleta.objects.order_by('pk'), 2)
+        self.assertTrue(paginador.estimada)
+        self.assertEqual(paginador.num_pages, 5)
+
+        pagina = paginador.page(5)
+
+        self.assertEqual(pagina.number, 2)
+        self.assertEqual(list(pagina), [self.atletas[2], self.atletas[-1]])
+        self.assertEqual((paginador.count, paginador.num_pages), (4, 2))
+
+    def test_listagem_filtrada_nao_usa_a_estimativa(self):
+        paginador = PaginadorContagemEstimada(Atleta.objects.filter(esporte=Esporte.CORRIDA).order_by('pk'), 2)
+        self.assertFalse(paginador.estimada)
+        self.assertEqual(paginador.count, 4)
+        self.assertFalse(PaginadorContagemEstimada(Atleta.objects.distinct().order_by('pk'), 2).estimada)
+
+
+class ResumoAtletaTest(TestCase):
+    """Testes da manutenção incremental do ResumoAtleta."""
+
+    def setUp(self):
+        self.corredor = criar_atleta()
+        self.oficial = criar_evento()
+        self.nao_oficial = criar_evento(oficial=False)
+
+    def resumo(self):
+        return ResumoAtleta.objects.get(atleta=self.corredor, esporte=Esporte.CORRIDA)
+
+    def test_criacao_atualiza_resumo_incrementalmente(self):
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=3, distancia=10)
+        Estatistica.objects.create(atleta=self.corredor, evento=self.nao_oficial, pontuacao=1, distancia=10)
+
+        resumo = self.resumo()
+        self.assertEqual(resumo.total_estatisticas, 2)
+        self.assertEqual(resumo.total_pontuacao, 4)
+        self.assertEqual(resumo.melhor_pontuacao, 1)
+        self.assertEqual(resumo.melhor_pontuacao_oficial, 3)
+
+    def test_alteracao_e_remocao_recalculam_resumo(self):
+        estatistica = Estatistica.objects.create(
+            atleta=self.corredor, evento=self.oficial, pontuacao=1, distancia=10
+        )
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=4, distancia=10)
+
+        estatistica.pontuacao = 2
+        estatistica.save()
+        self.assertEqual(self.resumo().melhor_pontuacao_oficial, 2)
+
+        estatistica.delete()
+        self.assertEqual(self.resumo().melhor_pontuacao_oficial, 4)
+
+        Estatistica.objects.all().delete()
+        self.assertFalse(ResumoAtleta.objects.exists())
+
+    def test_evento_deixa_de_ser_oficial(self):
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=1, distancia=10)
+
+        self.oficial.oficial = False
+        self.oficial.save()
+
+        self.assertIsNone(self.resumo().melhor_pontuacao_oficial)
+
+    def test_alteracoes_sem_efeito_no_resumo_nao_recalculam(self):
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=1, distancia=10)
+        evento = Evento.objects.get(pk=self.oficial.pk)
+
+        with mock.patch.object(ResumoAtleta.objects, 'recalcular') as recalcular:
+            evento.nome = 'Evento Renomeado'
+            evento.save()
+            evento.oficial = False
+            evento.save(update_fields=['nome'])
+            self.assertFalse(recalcular.called)
+
+            evento.save()
+            self.assertTrue(recalcular.called)
+
+    def test_migracao_preenche_resumos_existentes(self):
+        from django.apps import apps
+        migracao = import_module('analise.migrations.0008_preencher_resumo_atleta')
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=3, distancia=10)
+        Estatistica.objects.create(atleta=self.corredor, evento=self.nao_oficial, pontuacao=1, distancia=10)
+        campos = ('atleta_id', 'esporte', 'total_estatisticas', 'total_pontuacao',
+                  'melhor_pontuacao', 'melhor_pontuacao_oficial')
+        incremental = list(ResumoAtleta.objects.values_list(*campos))
+        ResumoAtleta.objects.all().delete()
+
+        migracao.preencher_resumos(apps, mock.Mock(connection=connection))
+
+        self.assertEqual(list(ResumoAtleta.objects.values_list(*campos)), incremental)
+
+    def test_reconstruir_equivale_a_manutencao_incremental(self):
+        jogador = criar_atleta(esporte=Esporte.FUTEBOL)
+        partida = criar_evento(esporte=Esporte.FUTEBOL)
+        Estatistica.objects.create(atleta=self.corredor, evento=self.oficial, pontuacao=2, distancia=10)
+        Estatistica.objects.create(atleta=self.corredor, evento=self.nao_oficial, pontuacao=1, distancia=10)
+        Estatistica.objects.bulk_registrar([{
+            'atleta': jogador, 'evento': partida, 'pontuacao': 2,
+            'assistencias': 0, 'faltas': 0, 'cartoes': 0, 'minutos_jogados': 90,
+        }])
+        campos = ('atleta_id', 'esporte', 'total_estatisticas', 'total_pontuacao',
+                  'melhor_pontuacao', 'melhor_pontuacao_oficial')
+        incremental = sorted(ResumoAtleta.objects.values_list(*campos))
+
+        call_command('reconstruir_resumos', stdout=StringIO())
+
+        self.assertEqual(sorted(ResumoAtleta.objects.values_list(*campos)), incremental)
+
+
+class RelatorioEstatisticasTest(TestCase):
+    """Testes do relatório de estatísticas em streaming."""
+
+    @classmethod
+    def setUpTestData(cls):
+        joao = criar_atleta(nome='João Silva')
+        ana = criar_atleta(nome='Ana Souza')
+        maratona = criar_evento(nome='Maratona', data=date(2025, 6, 15))
+        silvestre = criar_evento(nome='São Silvestre', data=date(2024, 12, 31))
+        Estatistica.objects.create(
+            atleta=joao, evento=maratona, pontuacao=1, distancia=42,
+            observacoes='Vencedor\nTempo recorde'
+        )
+        Estatistica.objects.create(atleta=joao, evento=silvestre, pontuacao=3, distancia=15)
+        Estatistica.objects.create(atleta=ana, evento=silvestre, pontuacao=2, distancia=15)
+
+    def relatorio(self, formato):
+        saida = StringIO()
+        escrever_relatorio_estatisticas(saida, formato, tamanho_lote=1)
+        return saida.getvalue()
+
+    def test_formato_texto(self):
+        self.assertEqual(self.relatorio('texto'), (
+            f"{'=' * 80}\nRELATÓRIO FINAL: ESTATÍSTICAS POR ATLETA\n{'=' * 80}\n"
+            "\n--- ATLETA: Ana Souza (CORRIDA) ---\n"
+            "  > Evento: São Silvestre (31/12/2024)\n"
+            "    - Pontuação: 2 | Observação: N/A\n"
+            "\n--- ATLETA: João Silva (CORRIDA) ---\n"
+            "  > Evento: São Silvestre (31/12/2024)\n"
+            "    - Pontuação: 3 | Observação: N/A\n"
+            "  > Evento: Maratona (15/06/2025)\n"
+            "    - Pontuação: 1 | Observação: Vencedor\n"
+            f"\n{'=' * 80}\nFIM DO RELATÓRIO.\n{'=' * 80}\n\n"
+        ))
+
+    def test_formatos_csv_e_jsonl(self):
+        linhas_csv = list(csv.DictReader(StringIO(self.relatorio('csv'))))
+        linhas_jsonl = [json.loads(linha) for linha in self.relatorio('jsonl').splitlines()]
+
+        self.assertEqual([linha['atleta'] for linha in linhas_csv], ['Ana Souza', 'João Silva', 'João Silva'])
+        self.assertEqual(linhas_jsonl[2]['data'], '2025-06-15')
+        self.assertEqual(linhas_jsonl[2]['observacoes'], 'Vencedor\nTempo recorde')
+
+    def test_linhas_sem_instanciar_modelos(self):
+        with mock.patch.object(Estatistica, 'from_db', side_effect=AssertionError('instanciou Estatistica')):
+            linhas = list(gerar_linhas(consultar_estatisticas()))
+
+        self.assertEqual(linhas[0], LinhaRelatorio(
+            'Ana Souza', 'CORRIDA', 'São Silvestre', date(2024, 12, 31), '31/12/2024', 2, ''
+        ))
+        # Datas iguais compartilham o mesmo texto formatado
+        self.assertIs(linhas[0].data_formatada, linhas[1].data_formatada)
+
+    def test_endpoint_streaming(self):
+        resposta = self.client.get('/analise/relatorios/estatisticas/', {'formato': 'csv'})
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertTrue(resposta.streaming)
+        conteudo = b''.join(resposta.streaming_content).decode()
+        self.assertEqual(conteudo, self.relatorio('csv'))
+
+    def test_formato_invalido(self):
+        resposta = self.client.get('/analise/relatorios/estatisticas/', {'formato': 'xml'})
+        self.assertEqual(resposta.status_code, 400)
+
+
+def _materializar(resultado):
+    """Lista (ou dicionário de listas) de pks, para comparar resultados de consultas"""
+    if isinstance(resultado, dict):
+        return {chave: _materializar(valor) for chave, valor in resultado.items()}
+    return [objeto.pk for objeto in resultado]
+
+
+class ApiConsultasTest(TestCase):
+    """Testes da API JSON das consultas dos managers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corredores = [
+            criar_atleta(nome=f'Corredor {i}', nacionalidade='Quênia' if i % 2 else 'Brasil')
+            for i in range(5)
+        ]
+        # Datas repetidas para exercitar o desempate pelo id na chave (data, id)
+        cls.eventos = [
+            criar_evento(nome=f'Corrida {i}', pais='Portugal', data=date(2025, 1, 1 + i // 2))
+            for i in range(5)
+        ]
+        for evento in cls.eventos:
+            for colocacao, atleta in enumerate(cls.corredores, start=1):
+                Estatistica.objects.create(atleta=atleta, evento=evento, pontuacao=colocacao, distancia=10)
+
+    def paginas(self, url, **parametros):
+        """Percorre todas as páginas e retorna a lista de páginas"""
+        paginas = []
+        cursor = None
+        while True:
+            if cursor:
+                parametros['cursor'] = cursor
+            resposta = self.client.get(url, parametros)
+            self.assertEqual(resposta.status_code, 200)
+            dados = resposta.json()
+            paginas.append(dados['resultados'])
+            cursor = dados['proximo_cursor']
+            if cursor is None:
+                return paginas
+
+    def test_paginacao_keyset_de_eventos(self):
+        paginas = self.paginas(
+            '/analise/api/eventos/participantes-estrangeiros/', data='2024-01-01', tamanho=2
+        )
+
+        self.assertEqual([len(pagina) for pagina in paginas], [2, 2, 1])
+        ids = [evento['id'] for pagina in paginas for evento in pagina]
+        esperado = sorted(self.eventos, key=lambda e: (e.data, e.pk), reverse=True)
+        self.assertEqual(ids, [evento.pk for evento in esperado])
+        self.assertEqual(
+            set(paginas[0][0]), {'id', 'nome', 'data', 'cidade', 'pais', 'esporte', 'oficial'}
+        )
+
+    def test_paginacao_keyset_de_atletas(self):
+        paginas = self.paginas(
+            f'/analise/api/eventos/{self.eventos[0].pk}/participantes/', tamanho=3
+        )
+
+        nomes = [atleta['nome'] for pagina in paginas for atleta in pagina]
+        self.assertEqual(nomes, sorted(atleta.nome for atleta in self.corredores))
+
+    def test_pagina_profunda_usa_uma_consulta(self):
+        primeira = self.client.get('/analise/api/atletas/corredores-vencedores/', {
+            'data': '2024-01-01', 'tamanho': 1
+        }).json()
+        self.assertIsNone(primeira['proximo_cursor'])
+
+        cursor = self.client.get(
+            f'/analise/api/eventos/{self.eventos[0].pk}/participantes/', {'tamanho': 4}
+        ).json()['proximo_cursor']
+        with self.assertNumQueries(1):
+            self.client.get(
+                f'/analise/api/eventos/{self.eventos[0].pk}/participantes/', {'tamanho': 4, 'cursor': cursor}
+            )
+
+    def test_views_usam_os_metodos_publicos(self):
+        zerar_instrumentacao()
+        self.client.get('/analise/api/atletas/corredores-vencedores/', {'data': '2024-01-01'})
+        self.client.get(f'/analise/api/eventos/{self.eventos[0].pk}/participantes/', {'tamanho': 2})
+
+        totais = relatorio_instrumentacao()
+        self.assertEqual(totais['Atleta.buscar_corredores_vencedores']['chamadas'], 1)
+        self.assertEqual(totais['Atleta.buscar_participantes']['chamadas'], 1)
+        # O QuerySet preguiçoso é paginado pela view, não avaliado pelo método
+        self.assertEqual(totais['Atleta.buscar_participantes']['consultas'], 0)
+
+    def test_maiores_pontuadores_e_ranking(self):
+        resposta = self.client.get('/analise/api/atletas/maiores-pontuadores/', {'esporte': 'CORRIDA'})
+        self.assertEqual([a['nome'] for a in resposta.json()['resultados']], ['Corredor 0'])
+
+        resposta = self.client.get('/analise/api/atletas/ranking/', {'limite': 2})
+        ranking = resposta.json()['resultados']['CORRIDA']
+        self.assertEqual([(a['nome'], a['posicao']) for a in ranking], [('Corredor 0', 1), ('Corredor 1', 2)])
+
+    def test_parametros_invalidos(self):
+        for url, parametros in [
+            ('/analise/api/atletas/corredores-vencedores/', {'data': '01/01/2024'}),
+            ('/analise/api/atletas/maiores-pontuadores/', {'esporte': 'XADREZ'}),
+            ('/analise/api/atletas/ranking/', {'limite': 'abc'}),
+            ('/analise/api/eventos/participantes-estrangeiros/', {'data': '2024-01-01', 'cursor': '!!'}),
+            ('/analise/api/eventos/participantes-estrangeiros/', {'data': '2024-01-01', 'tamanho': 0}),
+        ]:
+            resposta = self.client.get(url, parametros)
+            self.assertEqual(resposta.status_code, 400, url)
+            self.assertIn('erro', resposta.json())
+
+    async def test_metodos_assincronos_equivalem_aos_sincronos(self):
+        data = date(2024, 1, 1)
+        evento = self.eventos[0]
+        consultas = [
+            ('buscar_corredores_vencedores', Atleta.objects, (data,)),
+            ('buscar_participantes', Atleta.objects, (evento,)),
+            ('buscar_maiores_pontuadores_eventos_oficiais', Atleta.objects, (Esporte.CORRIDA,)),
+            ('buscar_ranking_eventos_oficiais', Atleta.objects, (2,)),
+            ('buscar_evento_participantes_estrangeiros', Evento.objects, (data,)),
+        ]
+        for nome, manager, args in consultas:
+            sincrono = await sync_to_async(lambda: _materializar(getattr(manager, nome)(*args)))()
+            assincrono = await getattr(manager, f'a{nome}')(*args)
+            self.assertEqual(_materializar(assincrono), sincrono, nome)
+
+        with self.assertRaises(ValueError):
+            await Atleta.objects.abuscar_ranking_eventos_oficiais(0)
+
+    async def test_painel_assincrono(self):
+        resposta = await self.async_client.get('/analise/api/painel/', {'data': '2024-01-01', 'limite': 1})
+        self.assertEqual(resposta.status_code, 200)
+        painel = resposta.json()
+
+        self.assertEqual([a['nome'] for a in painel['corredores_vencedores']], ['Corredor 0'])
+        self.assertEqual([a['nome'] for a in painel['maiores_pontuadores']['CORRIDA']], ['Corredor 0'])
+        self.assertEqual(painel['maiores_pontuadores']['FUTEBOL'], [])
+        self.assertEqual([(a['nome'], a['posicao']) for a in painel['ranking']['CORRIDA']], [('Corredor 0', 1)])
+        self.assertEqual(len(painel['eventos_participantes_estrangeiros']), 5)
+
+        resposta = await self.async_client.get('/analise/api/painel/', {'data': 'ontem'})
+        self.assertEqual(resposta.status_code, 400)
+
+
+class ParticipantesEventosTest(TestCase):
+    """Testes da consulta de participantes de vários eventos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.atletas = [criar_atleta() for _ in range(6)]
+        cls.eventos = [criar_evento(nome=f'Evento Lote {i}') for i in range(20)]
+        for i, evento in enumerate(cls.eventos):
+            for atleta in cls.atletas[i % 4:i % 4 + 3]:
+                Estatistica.objects.create(atleta=atleta, evento=evento, pontuacao=2, distancia=10)
+        # Duas estatísticas do mesmo atleta no mesmo evento
+        Estatistica.objects.create(atleta=cls.atletas[0], evento=cls.eventos[0], pontuacao=1, distancia=5)
+        cls.sem_participantes = criar_evento(nome='Evento Vazio')
+
+    def esperado(self, evento):
+        return sorted(atleta.pk for atleta in Atleta.objects.buscar_participantes(evento))
+
+    def test_uma_consulta_para_qualquer_quantidade_de_eventos(self):
+        for quantidade in (1, 5, 20):
+            eventos = self.eventos[:quantidade] + [self.sem_participantes.pk]
+            with self.assertNumQueries(1):
+                participantes = Atleta.objects.buscar_participantes_eventos(eventos)
+
+            self.assertEqual(list(participantes), [evento.pk for evento in self.eventos[:quantidade]]
+                             + [self.sem_participantes.pk])
+            for evento in self.eventos[:quantidade]:
+                self.assertEqual([atleta.pk for atleta in participantes[evento.pk]], self.esperado(evento))
+            self.assertEqual(participantes[self.sem_participantes.pk], [])
+
+    def test_prefetch_dos_participantes(self):
+        for quantidade in (1, 5, 20):
+            ids = [evento.pk for evento in self.eventos[:quantidade]]
+            with self.assertNumQueries(2):
+                participantes = {
+                    evento.pk: sorted(atleta.pk for atleta in evento.participantes.all())
+                    for evento in Evento.objects.com_participantes().filter(pk__in=ids)
+                }
+            self.assertEqual(participantes, {evento.pk: self.esperado(evento) for evento in self.eventos[:quantidade]})
+
+        evento = Evento.objects.com_participantes(Atleta.objects.only('nome'), to_attr='lista').get(
+            pk=self.eventos[0].pk
+        )
+        self.assertEqual(sorted(atleta.pk for atleta in evento.lista), self.esperado(self.eventos[0]))
+
+    async def test_versao_assincrona(self):
+        participantes = await Atleta.objects.abuscar_participantes_eventos(self.eventos[:3])
+        esperado = await sync_to_async(Atleta.objects.buscar_participantes_eventos)(self.eventos[:3])
+        self.assertEqual(
+            {evento: [atleta.pk for atleta in atletas] for evento, atletas in participantes.items()},
+            {evento: [atleta.pk for atleta in atletas] for evento, atletas in esperado.items()}
+        )
+
+    def test_sem_eventos(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Atleta.objects.buscar_participantes_eventos([]), {})
+        with self.assertRaises(ValueError):
+            Atleta.objects.buscar_participantes_eventos(None)
+
+
+class ResultadoPreguicosoTest(TestCase):
+    """Testes do modo preguiçoso e da projeção dos métodos que retornam listas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.evento = criar_evento()
+        # Atletas com o mesmo nome não podem ser juntados pela projeção
+        cls.atletas = [criar_atleta(nome='Corredor Homônimo') for _ in range(3)] + [criar_atleta()]
+        for atleta in cls.atletas:
+            Estatistica.objects.create(atleta=atleta, evento=cls.evento, pontuacao=1, distancia=10)
+        Estatistica.objects.create(atleta=cls.atletas[0], evento=cls.evento, pontuacao=1, distancia=5)
+
+    def test_preguicoso_retorna_queryset_encadeavel(self):
+        with self.assertNumQueries(0):
+            atletas = Atleta.objects.buscar_participantes(self.evento, preguicoso=True)
+
+        self.assertEqual(atletas.count(), 4)
+        self.assertEqual(atletas.filter(nome='Corredor Homônimo').count(), 3)
+        self.assertEqual(
+            sorted(atleta.pk for atleta in atletas.iterator()),
+            sorted(atleta.pk for atleta in Atleta.objects.buscar_participantes(self.evento))
+        )
+
+    def test_projecao_com_limit_em_uma_consulta(self):
+        with CaptureQueriesContext(connection) as consultas:
+            nomes = list(Atleta.objects.buscar_corredores_vencedores(
+                date(2024, 1, 1), preguicoso=True, campos=['nome']
+            ).order_by('-nome')[:3])
+
+        self.assertEqual(nomes, [{'nome': 'Corredor Homônimo'}] * 3)
+        self.assertEqual(len(consultas), 1)
+        sql = consultas[0]['sql']
+        self.assertIn('LIMIT 3', sql)
+        self.assertNotIn('"analise_atleta"."cpf"', sql)
+
+    def test_projecao_sem_modo_preguicoso(self):
+        ids = Atleta.objects.buscar_participantes(self.evento, campos=('id',))
+        self.assertEqual(sorted(item['id'] for item in ids), sorted(atleta.pk for atleta in self.atletas))
+
+    def test_campos_invalidos(self):
+        with self.assertRaises(ValueError):
+            Atleta.objects.buscar_participantes(self.evento, campos=['inexistente'])
+        with self.assertRaises(ValueError):
+            Atleta.objects.buscar_participantes(self.evento, campos=[])
+
+
+class ElegibilidadeTest(TestCase):
+    """Testes da verificação de elegibilidade de atletas para um evento."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.evento = criar_evento(data=date(2025, 1, 1))
+        cls.elegivel = criar_atleta()
+        cls.doze_anos_no_dia = criar_atleta(data_nascimento=date(2013, 1, 1))
+        cls.onze_anos = criar_atleta(data_nascimento=date(2013, 1, 2))
+        cls.inativo = criar_atleta(ativo=False, esporte=Esporte.FUTEBOL)
+        cls.futebol = criar_atleta(esporte=Esporte.FUTEBOL)
+
+    def motivo_em_python(self, atleta):
+        """Regras de Estatistica.clean aplicadas a um atleta por vez"""
+        if not atleta.ativo:
+            return MotivoInelegibilidade.INATIVO
+        if atleta.esporte != self.evento.esporte:
+            return MotivoInelegibilidade.ESPORTE
+        try:
+            validate_atleta_idade_minima(atleta, self.evento)
+        except ValidationError:
+            return MotivoInelegibilidade.IDADE
+        return None
+
+    def test_uma_consulta_com_motivos(self):
+        with self.assertNumQueries(1):
+            elegiveis, inelegiveis = Atleta.objects.verificar_elegibilidade(
+                self.evento, Atleta.objects.all()
+            )
+
+        self.assertEqual(elegiveis, [self.elegivel, self.doze_anos_no_dia])
+        self.assertEqual(
+            [(atleta, atleta.motivo_inelegibilidade) for atleta in inelegiveis],
+            [(self.onze_anos, MotivoInelegibilidade.IDADE),
+             (self.inativo, MotivoInelegibilidade.INATIVO),
+             (self.futebol, MotivoInelegibilidade.ESPORTE)]
+        )
+        for atleta in inelegiveis:
+            self.assertEqual(atleta.motivo_inelegibilidade, self.motivo_em_python(atleta))
+
+    def test_equivale_as_regras_em_python(self):
+        gerar_dados(300, semente=4)
+        for evento in Evento.objects.all()[:5]:
+            self.evento = evento
+            atletas = list(Atleta.objects.all())
+            elegiveis, inelegiveis = Atleta.objects.verificar_elegibilidade(evento, [a.pk for a in atletas])
+
+            self.assertEqual(
+                {atleta.pk: atleta.motivo_inelegibilidade for atleta in elegiveis + inelegiveis},
+                {atleta.pk: self.motivo_em_python(atleta) for atleta in atletas}
+            )
+            self.assertEqual(
+                sorted(Atleta.objects.buscar_elegiveis(evento).values_list('pk', flat=True)),
+                [atleta.pk for atleta in elegiveis]
+            )
+
+    def test_evento_pelo_id_e_argumentos(self):
+        with self.assertNumQueries(2):
+            elegiveis, _ = Atleta.objects.verificar_elegibilidade(self.evento.pk, [self.elegivel, 0])
+        self.assertEqual(elegiveis, [self.elegivel])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Atleta.objects.verificar_elegibilidade(self.evento, []), ([], []))
+        with self.assertRaises(ValueError):
+            Atleta.objects.verificar_elegibilidade(None, [self.elegivel])
+        with self.assertRaises(ValueError):
+            Atleta.objects.verificar_elegibilidade(self.evento, None)
+
+    def test_data_limite_em_ano_bissexto(self):
+        self.assertEqual(data_limite_nascimento(date(2024, 2, 29)), date(2012, 2, 29))
+        self.assertEqual(data_limite_nascimento(date(2113, 2, 28), idade=13), date(2100, 2, 28))
+        self.assertEqual(data_limite_nascimento(date(2112, 2, 29)), date(2100, 2, 28))
+
+
+class SerieDesempenhoTest(TestCase):
+    """Testes da série de desempenho por atleta."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corredor = criar_atleta()
+        # Criados fora de ordem cronológica
+        for dia, colocacao in [(3, 4), (1, 2), (2, 6), (4, 1)]:
+            evento = criar_evento(nome=f'Corrida Dia {dia}', data=date(2025, 1, dia))
+            Estatistica.objects.create(atleta=cls.corredor, evento=evento, pontuacao=colocacao, distancia=10)
+
+    def setUp(self):
+        obter_cache().clear()
+
+    def test_medias_moveis_em_ordem_de_data(self):
+        serie = Estatistica.objects.buscar_serie_desempenho(self.corredor, janela=2)
+
+        self.assertEqual([item['data'].day for item in serie], [1, 2, 3, 4])
+        self.assertEqual([item['pontuacao'] for item in serie], [2, 6, 4, 1])
+        self.assertEqual([item['media_pontuacao'] for item in serie], [2, 4, 5, 2.5])
+        self.assertEqual([item['variacao_pontuacao'] for item in serie], [None, 4, -2, -3])
+        # Corrida não tem assistências nem minutos jogados
+        self.assertEqual({item['media_assistencias'] for item in serie}, {None})
+
+    def test_calculo_em_python_equivale_as_funcoes_de_janela(self):
+        gerar_dados(300, semente=5)
+        for atleta in Atleta.objects.all()[:10]:
+            sql = Estatistica.objects.buscar_serie_desempenho(atleta, janela=3)
+            with mock.patch.object(connection.features, 'supports_over_clause', False):
+                python = Estatistica.objects.buscar_serie_desempenho(atleta, janela=3)
+
+            self.assertEqual(len(sql), len(python))
+            for item_sql, item_python in zip(sql, python):
+                self.assertEqual(item_sql.keys(), item_python.keys())
+                for chave, valor in item_sql.items():
+                    if isinstance(valor, float):
+                        self.assertAlmostEqual(valor, item_python[chave])
+                    else:
+                        self.assertEqual(valor, item_python[chave], chave)
+
+    def test_api_em_cache_por_atleta(self):
+        url = f'/analise/api/atletas/{self.corredor.pk}/desempenho/'
+        resposta = self.client.get(url, {'janela': 3})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([item['media_pontuacao'] for item in resposta.json()['resultados']], [2, 4, 4, 11 / 3])
+
+        with self.assertNumQueries(0):
+            self.client.get(url, {'janela': 3})
+
+        self.assertEqual(self.client.get(url, {'janela': 0}).status_code, 400)
+
+
+class SnapshotTest(TestCase):
+    """Testes do snapshot colunar de estatísticas."""
+
+    def setUp(self):
+        gerar_dados(300, semente=2)
+        self.diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.diretorio)
+
+    def test_agregacao_equivale_ao_orm(self):
+        call_command('exportar_snapshot', self.diretorio, tamanho_lote=64, stdout=StringIO())
+
+        with abrir_snapshot(self.diretorio) as snapshot:
+            self.assertEqual(len(snapshot), 300)
+            agregado = snapshot.agregar('esporte', 'pontuacao')
+
+        esperado = Estatistica.objects.values('evento__esporte').annotate(
+            quantidade=Count('pontuacao'), soma=Sum('pontuacao'), minimo=Min('pontuacao'), maximo=Max('pontuacao')
+        )
+        self.assertEqual(
+            {linha.pop('evento__esporte'): linha for linha in esperado},
+            {
+                esporte: {chave: valor for chave, valor in grupo.items() if chave != 'media'}
+                for esporte, grupo in agregado.items()
+            }
+        )
+
+    def test_colunas_preservam_valores_e_nulos(self):
+        exportar_snapshot(self.diretorio)
+        estatisticas = Estatistica.objects.select_related('atleta', 'evento').order_by('id')
+
+        with abrir_snapshot(self.diretorio) as snapshot:
+            for indice, estatistica in enumerate(estatisticas):
+                self.assertEqual(snapshot['id'][indice], estatistica.pk)
+                self.assertEqual(snapshot.decodificar('data', snapshot['data'][indice]), estatistica.evento.data)
+                self.assertEqual(
+                    snapshot.decodificar('nacionalidade', snapshot['nacionalidade'][indice]),
+                    estatistica.atleta.nacionalidade
+                )
+                self.assertEqual(bool(snapshot['estrangeiro'][indice]), estatistica.estrangeiro)
+
+                assistencias = snapshot['assistencias'][indice]
+                self.assertEqual(None if assistencias == NULO_INTEIRO else assistencias, estatistica.assistencias)
+                distancia = snapshot['distancia'][indice]
+                if estatistica.distancia is None:
+                    self.assertTrue(math.isnan(distancia))
+                else:
+                    self.assertEqual(distancia, float(estatistica.distancia))
+
+    def test_snapshot_incompleto_ou_vazio(self):
+        with self.assertRaises(ValueError):
+            abrir_snapshot(self.diretorio)
+
+        exportar_snapshot(self.diretorio, queryset=Estatistica.objects.none())
+        with abrir_snapshot(self.diretorio) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(snapshot.agregar('esporte', 'pontuacao'), {})
+
+    def test_colunas_dicionarizadas_comportam_mais_de_32767_valores(self):
+        tipos = {nome: (typecode, dtype) for nome, _, typecode, dtype in COLUNAS}
+        for nome in COLUNAS_DICIONARIO:
+            typecode, dtype = tipos[nome]
+            array(typecode, [40000])
+            self.assertEqual(dtype, '<i4')
+
+    def test_coluna_truncada_libera_os_mapas_ja_abertos(self):
+        exportar_snapshot(self.diretorio)
+        with open(os.path.join(self.diretorio, 'pontuacao.bin'), 'r+b') as arquivo:
+            arquivo.truncate(4)
+
+        mapas = []
+        mmap_original = mmap.mmap
+
+        def registrar_mmap(*args, **kwargs):
+            mapa = mmap_original(*args, **kwargs)
+            mapas.append(mapa)
+            return mapa
+
+        with mock.patch('analise.snapshot.mmap.mmap', side_effect=registrar_mmap):
+            with self.assertRaisesMessage(ValueError, 'Coluna pontuacao tem 1 linhas'):
+                abrir_snapshot(self.diretorio)
+
+        self.assertTrue(mapas)
+        self.assertTrue(all(mapa.closed for mapa in mapas))
+
+
+class CacheConsultasTest(TestCase):
+    """Testes do cache versionado das consultas dos managers."""
+
+    def setUp(self):
+        obter_cache().clear()
+        zerar_estatisticas_cache()
+        self.corredor = criar_atleta()
+        self.evento = criar_evento()
+        Estatistica.objects.create(atleta=self.corredor, evento=self.evento, pontuacao=1, distancia=10)
+
+    def test_acerto_nao_consulta_o_banco(self):
+        consultas = Atleta.objects.em_cache()
+        primeira = consultas.buscar_maiores_pontuadores_eventos_oficiais(Esporte.CORRIDA)
+
+        with self.assertNumQueries(0):
+            segunda = consultas.buscar_maiores_pontuadores_eventos_oficiais('CORRIDA')
+
+        self.assertEqual(list(primeira), list(segunda))
+        self.assertEqual(estatisticas_cache()['acertos'], 1)
+        self.assertEqual(estatisticas_cache()['falhas'], 1)
+
+    def test_escrita_invalida_resultados(self):
+        consultas = Atleta.objects.em_cache()
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outro = criar_atleta()
+            Estatistica.objects.create(atleta=outro, evento=self.evento, pontuacao=2, distancia=10)
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Estatistica.objects.bulk_registrar([
+                {'atleta': criar_atleta(), 'evento': self.evento, 'pontuacao': 3, 'distancia': 10}
+            ])
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 3)
+        self.assertEqual(estatisticas_cache()['acertos'], 0)
+
+    def test_versao_muda_apenas_na_confirmacao(self):
+        versao = versoes(Estatistica)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Estatistica.objects.create(atleta=criar_atleta(), evento=self.evento, pontuacao=2, distancia=10)
+            # Uma leitura concorrente antes da confirmação ainda usa a versão anterior
+            self.assertEqual(versoes(Estatistica), versao)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(versoes(Estatistica), versao)
+
+    def test_reconstruir_resumos_invalida_ranking(self):
+        consultas = Atleta.objects.em_cache()
+        consultas.buscar_ranking_eventos_oficiais(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            ResumoAtleta.objects.reconstruir()
+
+        consultas.buscar_ranking_eventos_oficiais(3)
+        self.assertEqual(estatisticas_cache()['falhas'], 2)
+
+    def test_argumentos_diferentes_usam_chaves_diferentes(self):
+        consultas = Evento.objects.em_cache()
+        consultas.buscar_evento_participantes_estrangeiros(date(2024, 1, 1))
+        consultas.buscar_evento_participantes_estrangeiros(date(2026, 1, 1))
+
+        self.assertEqual(estatisticas_cache()['falhas'], 2)
+
+    def test_metodo_fora_da_lista(self):
+        with self.assertRaises(AttributeError):
+            Atleta.objects.em_cache().filter
+
+
+class MotorConsultasTest(TestCase):
+    """Testes do motor de consultas em memória."""
+
+    def setUp(self):
+        obter_cache().clear()
+        gerar_dados(400, semente=11)
+        self.motor = MotorConsultas().ativar()
+        self.addCleanup(self.motor.desativar)
+
+    def assertEquivalenteAoOrm(self):
+        for data in (date(2000, 1, 1), date(date.today().year - 1, 6, 1), date(2100, 1, 1)):
+            self.assertEqual(
+                [atleta.pk for atleta in self.motor.buscar_corredores_vencedores(data)],
+                sorted(atleta.pk for atleta in Atleta.objects.buscar_corredores_vencedores(data))
+            )
+            self.assertEqual(
+                [evento.pk for evento in self.motor.buscar_evento_participantes_estrangeiros(data)],
+                list(Evento.objects.buscar_evento_participantes_estrangeiros(data)
+                     .order_by('-data', '-id').values_list('id', flat=True))
+            )
+
+        for esporte in Esporte.values:
+            self.assertEqual(
+                [atleta.pk for atleta in self.motor.buscar_maiores_pontuadores_eventos_oficiais(esporte)],
+                sorted(atleta.pk for atleta in Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(esporte))
+            )
+
+        for evento in Evento.objects.all()[:15]:
+            self.assertEqual(
+                [atleta.pk for atleta in self.motor.buscar_participantes(evento)],
+                sorted(atleta.pk for atleta in Atleta.objects.buscar_participantes(evento))
+            )
+        eventos = list(Evento.objects.values_list('id', flat=True)[:15])
+        self.assertEqual(
+            {evento: [atleta.pk for atleta in atletas]
+             for evento, atletas in self.motor.buscar_participantes_eventos(eventos).items()},
+            {evento: [atleta.pk for atleta in atletas]
+             for evento, atletas in Atleta.objects.buscar_participantes_eventos(eventos).items()}
+        )
+
+        def chaves(ranking):
+            return {
+                esporte: [(atleta.posicao, atleta.melhor_pontuacao, atleta.nome, atleta.pk) for atleta in atletas]
+                for esporte, atletas in ranking.items()
+            }
+
+        for limite in (1, 3):
+            orm = chaves(Atleta.objects.buscar_ranking_eventos_oficiais(limite))
+            memoria = chaves(self.motor.buscar_ranking_eventos_oficiais(limite))
+            self.assertEqual(list(memoria), list(orm))
+            # O ORM não desempata por id atletas com a mesma posição e o mesmo nome
+            self.assertEqual({esporte: sorted(itens) for esporte, itens in memoria.items()},
+                             {esporte: sorted(itens) for esporte, itens in orm.items()})
+
+    def test_equivale_ao_orm_apos_carga(self):
+        self.assertEquivalenteAoOrm()
+
+    def test_atualizacao_incremental_pelos_sinais(self):
+        # Nenhuma alteração com sinais exige recarregar o motor
+        recarregar = mock.patch.object(self.motor, 'recarregar', side_effect=AssertionError('recarregou'))
+        with recarregar:
+            corredor = criar_atleta(nacionalidade='Quênia')
+            evento = criar_evento(data=date(2100, 1, 1))
+            estatistica = Estatistica.objects.create(atleta=corredor, evento=evento, pontuacao=1, distancia=10)
+
+            with self.assertNumQueries(0):
+                self.assertIn(corredor.pk, [a.pk for a in self.motor.buscar_corredores_vencedores(date(2099, 1, 1))])
+                self.assertEqual([e.pk for e in self.motor.buscar_evento_participantes_estrangeiros(date(2099, 1, 1))],
+                                 [evento.pk])
+
+            corredor.nacionalidade = 'Brasil'
+            corredor.save()
+            with self.assertNumQueries(0):
+                self.assertEqual(self.motor.buscar_evento_participantes_estrangeiros(date(2099, 1, 1)), [])
+
+            evento.pais = 'Quênia'
+            evento.oficial = False
+            evento.save()
+            estatistica.pontuacao = 2
+            estatistica.save()
+            self.assertEquivalenteAoOrm()
+
+            Estatistica.objects.filter(atleta__esporte=Esporte.FUTEBOL).first().delete()
+            Evento.objects.exclude(pk=evento.pk).first().delete()
+            Atleta.objects.exclude(pk=corredor.pk).first().delete()
+            self.assertEquivalenteAoOrm()
+
+    def test_escritas_sem_sinais_recarregam(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            evento = criar_evento(data=date(2100, 1, 1), pais='Quênia')
+            Estatistica.objects.bulk_registrar([
+                {'atleta': atleta, 'evento': evento, 'pontuacao': 1, 'distancia': 10}
+                for atleta in Atleta.objects.filter(esporte=Esporte.CORRIDA)[:3]
+            ])
+        self.assertEquivalenteAoOrm()
+
+    def test_escrita_sem_sinais_seguida_de_escrita_com_sinais_no_mesmo_modelo(self):
+        corredores = list(Atleta.objects.filter(esporte=Esporte.CORRIDA)[:2])
+        # Escritas confirmadas que passam pelos sinais não recarregam o motor
+        with mock.patch.object(self.motor, 'recarregar', side_effect=AssertionError('recarregou')):
+            with self.captureOnCommitCallbacks(execute=True):
+                evento = criar_evento(data=date(2100, 1, 1))
+            self.assertEqual(self.motor.buscar_participantes(evento), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Estatistica.objects.bulk_registrar([
+                {'atleta': corredores[0], 'evento': evento, 'pontuacao': 1, 'distancia': 10}
+            ])
+        # O incremento do create não pode encobrir o do bulk_registrar
+        with self.captureOnCommitCallbacks(execute=True):
+            Estatistica.objects.create(atleta=corredores[1], evento=evento, pontuacao=2, distancia=10)
+
+        self.assertEqual(
+            [atleta.pk for atleta in self.motor.buscar_participantes(evento)],
+            sorted(atleta.pk for atleta in corredores)
+        )
+        self.assertEquivalenteAoOrm()
+
+    def test_validacao_dos_argumentos(self):
+        with self.assertRaises(ValueError):
+            self.motor.buscar_corredores_vencedores('2024-01-01')
+        with self.assertRaises(ValueError):
+            self.motor.buscar_maiores_pontuadores_eventos_oficiais(None)
+        with self.assertRaises(ValueError):
+            self.motor.buscar_ranking_eventos_oficiais(0)
+        with self.assertRaises(ValueError):
+            self.motor.buscar_participantes(None)
+
+
+class GeradorDadosTest(TestCase):
+    """Testes do gerador de dados sintéticos."""
+
+    def test_cpfs_gerados_sao_validos(self):
+        for numero in [0, 1, 11111111, 123456789, 899999999]:
+            self.assertTrue(validate_cpf(gerar_cpf(numero)))
+
+    def test_cpfs_unicos_em_torno_das_bases_repetidas(self):
+        # 11111111 cairia na base 111111111; a vizinha 11111112 não pode repeti-la
+        numeros = [
+            inicio + deslocamento
+            for repetida in range(111111111, 1000000000, 111111111)
+            for inicio in [repetida - 100000000 - 9]
+            for deslocamento in range(20)
+        ]
+        cpfs = [gerar_cpf(numero) for numero in numeros if numero < CAPACIDADE_CPF]
+        self.assertEqual(len(set(cpfs)), len(cpfs))
+        self.assertTrue(all(validate_cpf(cpf) for cpf in cpfs))
+
+    def test_dados_gerados_passam_na_validacao_dos_modelos(self):
+        gerados = gerar_dados(300, semente=7, tamanho_lote=64)
+
+        self.assertEqual(Estatistica.objects.count(), gerados['estatisticas'])
+        for atleta in Atleta.objects.all():
+            atleta.full_clean()
+        for evento in Evento.objects.all():
+            evento.full_clean()
+        for estatistica in Estatistica.objects.select_related('atleta', 'evento'):
+            estatistica.full_clean()
+        self.assertEqual(
+            ResumoAtleta.objects.aggregate(total=Sum('total_estatisticas'))['total'], 300
+        )
+        self.assertEqual(
+            Estatistica.objects.filter(estrangeiro=True).count(),
+            Estatistica.objects.exclude(atleta__nacionalidade=F('evento__pais')).count()
+        )
+
+    def test_mesma_semente_gera_mesmos_dados(self):
+        gerar_dados(30, semente=3)
+        primeira = list(Estatistica.objects.order_by('id').values_list('pontuacao', 'distancia'))
+        Estatistica.objects.all().delete()
+
+        gerar_dados(30, semente=3)
+        segunda = list(Estatistica.objects.order_by('id').values_list('pontuacao', 'distancia'))
+
+        self.assertEqual(primeira, segunda)
+
+    def test_nova_geracao_apos_remocoes_nao_repete_cpfs(self):
+        gerar_dados(30, atletas=6, eventos=3)
+        Atleta.objects.order_by('pk').first().delete()
+        Evento.objects.order_by('pk').first().delete()
+
+        gerar_dados(30, atletas=6, eventos=3)
+
+        self.assertEqual(Atleta.objects.count(), 11)
+        self.assertEqual(Evento.objects.count(), 5)
+
+    def test_exige_atletas_e_eventos_de_cada_esporte(self):
+        with self.assertRaises(ValueError):
+            gerar_dados(30, atletas=2)
+        with self.assertRaises(ValueError):
+            gerar_dados(30, eventos=1)
+        with self.assertRaisesMessage(CommandError, 'um por esporte'):
+            call_command('gerar_dados', 30, atletas=2, stdout=StringIO())
+        self.assertFalse(Atleta.objects.exists())
+
+
+@override_settings(ANALISE_INSTRUMENTACAO=True, ANALISE_CONSULTA_LENTA_MS=None)
+class InstrumentacaoTest(TestCase):
+    """Testes da instrumentação SQL dos managers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.evento = criar_evento(pais='Portugal')
+        for _ in range(3):
+            Estatistica.objects.create(atleta=criar_atleta(), evento=cls.evento, pontuacao=1, distancia=10)
+
+    def setUp(self):
+        zerar_instrumentacao()
+
+    def test_totais_por_metodo(self):
+        Atleta.objects.buscar_participantes(self.evento)
+        Atleta.objects.buscar_participantes(self.evento)
+        Evento.objects.buscar_evento_participantes_estrangeiros(date(2024, 1, 1))
+
+        totais = relatorio_instrumentacao()
+        participantes = totais['Atleta.buscar_participantes']
+        self.assertEqual(participantes['chamadas'], 2)
+        self.assertEqual(participantes['consultas'], 2)
+        self.assertEqual(participantes['linhas'], 6)
+        self.assertGreater(participantes['tempo_sql'], 0)
+        # O QuerySet retornado não é avaliado pela instrumentação
+        self.assertEqual(totais['Evento.buscar_evento_participantes_estrangeiros']['consultas'], 0)
+        self.assertEqual(totais['Evento.buscar_evento_participantes_estrangeiros']['linhas'], 0)
+
+    def test_nao_avalia_querysets(self):
+        estrangeiros = Evento.objects.buscar_evento_participantes_estrangeiros(date(2024, 1, 1))
+        self.assertIsNone(estrangeiros._result_cache)
+
+        # A view pagina o QuerySet: nenhuma consulta sem LIMIT em analise_evento
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(
+                '/analise/api/eventos/participantes-estrangeiros/', {'data': '2024-01-01', 'tamanho': 2}
+            )
+        self.assertEqual(resposta.status_code, 200)
+        selects = [c['sql'] for c in consultas.captured_queries if 'FROM "analise_evento"' in c['sql']]
+        self.assertTrue(selects)
+        self.assertTrue(all('LIMIT' in sql for sql in selects), selects)
+
+    async def test_metodos_assincronos_concorrentes(self):
+        await asyncio.gather(
+            Atleta.objects.abuscar_participantes(self.evento),
+            Atleta.objects.abuscar_maiores_pontuadores_eventos_oficiais(Esporte.CORRIDA),
+        )
+
+        totais = relatorio_instrumentacao()
+        self.assertEqual(totais['Atleta.abuscar_participantes']['consultas'], 1)
+        self.assertEqual(totais['Atleta.abuscar_participantes']['linhas'], 3)
+        self.assertEqual(totais['Atleta.abuscar_maiores_pontuadores_eventos_oficiais']['consultas'], 2)
+        # O wrapper compartilhado é removido quando a última medição termina
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_desativada(self):
+        with self.settings(ANALISE_INSTRUMENTACAO=False):
+            Atleta.objects.buscar_participantes(self.evento)
+        self.assertEqual(relatorio_instrumentacao(), {})
+
+    def test_middleware_adiciona_cabecalhos(self):
+        resposta = self.client.get('/analise/api/atletas/ranking/')
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertGreaterEqual(int(resposta['X-Analise-Consultas']), 1)
+        self.assertIn('X-Analise-Tempo-SQL', resposta)
+        self.assertIn('X-Analise-Tempo-Python', resposta)
+
+    async def test_middleware_assincrono(self):
+        async def view(request):
+            return HttpResponse()
+
+        middleware = InstrumentacaoConsultasMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertFalse(iscoroutinefunction(InstrumentacaoConsultasMiddleware(lambda request: HttpResponse())))
+
+        resposta = await self.async_client.get('/analise/api/painel/', {'data': '2024-01-01'})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertGreaterEqual(int(resposta['X-Analise-Consultas']), 1)
+        self.assertIn('X-Analise-Tempo-SQL', resposta)
+
+    def test_consulta_lenta_registra_sql_e_plano(self):
+        with self.settings(ANALISE_CONSULTA_LENTA_MS=0):
+            with self.assertLogs('analise.consultas_lentas', level='WARNING') as registros:
+                Atleta.objects.buscar_participantes(self.evento)
+
+        self.assertIn('Atleta.buscar_participantes', registros.output[0])
+        self.assertIn('SELECT', registros.output[0])
+        self.assertIn('analise_estatistica', registros.output[0].split('Plano:')[1])
+
+
+def validate_cpf_referencia(cpf):
+    """Implementação original de validate_cpf, usada como oráculo nos testes de propriedade."""
+    cpf = re.sub(r'[^0-9]', '', cpf)
+    if len(cpf) != 11:
+        return 'CPF deve ter 11 dígitos'
+    if cpf == cpf[0] * 11:
+        return 'CPF inválido'
+    for i in range(9, 11):
+        soma = sum(int(cpf[num]) * ((i + 1) - num) for num in range(0, i))
+        digito = ((soma * 10) % 11) % 10
+        if int(cpf[i]) != digito:
+            return 'CPF inválido'
+    return None
+
+
+class ValidacaoCpfTest(TestCase):
+    """Testes de propriedade da validação de CPF em lote e memoizada."""
+
+    CASOS = 5000
+
+    def gerar_casos(self, rng):
+        """CPFs válidos, quase válidos, formatados, repetidos e lixo"""
+        for _ in range(self.CASOS):
+            tipo = rng.randrange(6)
+            if tipo == 0:
+                yield gerar_cpf(rng.randrange(900000000))
+            elif tipo == 1:
+                cpf = list(gerar_cpf(rng.randrange(900000000)))
+                posicao = rng.randrange(11)
+                cpf[posicao] = str((int(cpf[posicao]) + rng.randint(1, 9)) % 10)
+                yield ''.join(cpf)
+            elif tipo == 2:
+                cpf = gerar_cpf(rng.randrange(900000000))
+                yield f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}'
+            elif tipo == 3:
+                yield str(rng.randrange(10)) * rng.choice([10, 11, 12])
+            elif tipo == 4:
+                yield ''.join(rng.choice('0123456789') for _ in range(rng.randint(0, 14)))
+            else:
+                yield ''.join(rng.choice('0123456789 .-/a٣') for _ in range(rng.randint(0, 16)))
+
+    def test_lote_equivale_a_implementacao_original(self):
+        rng = random.Random(2024)
+        casos = list(self.gerar_casos(rng))
+
+        resultados = validar_cpfs(casos)
+
+        self.assertEqual(len(resultados), len(casos))
+        for cpf, (valido, motivo) in zip(casos, resultados):
+            esperado = validate_cpf_referencia(cpf)
+            self.assertEqual((valido, motivo), (esperado is None, esperado), cpf)
+
+    def test_validacao_memoizada_equivale_a_implementacao_original(self):
+        rng = random.Random(2025)
+        for cpf in self.gerar_casos(rng):
+            esperado = validate_cpf_referencia(cpf)
+            self.assertEqual(verificar_cpf(cpf), esperado, cpf)
+            if esperado is None:
+                self.assertTrue(validate_cpf(cpf))
+            else:
+                with self.assertRaisesMessage(ValidationError, esperado):
+                    validate_cpf(cpf)
+
+
+class ImportarEstatisticasTest(TestCase):
+    """Testes do comando importar_estatisticas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corredor = criar_atleta(cpf='52998224725')
+        cls.evento = criar_evento(nome='Maratona de Teste', data=date(2025, 3, 1))
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+
+    def escrever(self, nome, conteudo):
+        caminho = os.path.join(self.diretorio.name, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def importar(self, caminho, **opcoes):
+        saida, erros = StringIO(), StringIO()
+        call_command('importar_estatisticas', caminho, stdout=saida, stderr=erros, **opcoes)
+        return saida.getvalue(), erros.getvalue()
+
+    def test_importa_csv_e_reporta_linhas_invalidas(self):
+        caminho = self.escrever('resultados.csv', (
+            'atleta_cpf,evento_nome,evento_data,pontuacao,distancia,observacoes\n'
+            '52998224725,Maratona de Teste,2025-03-01,1,42.2,Vencedor\n'
+            '00000000000,Maratona de Teste,2025-03-01,2,42.2,\n'
+            '52998224725,Maratona de Teste,2025-03-01,3,,Sem distância\n'
+            '52998224725,Maratona de Teste,2025-03-01,4,10,\n'
+        ))
+
+        saida, erros = self.importar(caminho, tamanho_lote=2)
+
+        self.assertEqual(Estatistica.objects.count(), 2)
+        self.assertIn('Linha 2: Atleta com CPF', erros)
+        self.assertIn('Linha 3: Para corrida, a distância', erros)
+        self.assertIn('linhas/s', saida)
+        self.assertEqual(ResumoAtleta.objects.get(atleta=self.corredor).total_estatisticas, 2)
+
+    def test_importa_jsonl_e_retoma_apos_ultimo_lote(self):
+        linhas = [
+            json.dumps({
+                'atleta_cpf': '52998224725', 'evento_nome': 'Maratona de Teste',
+                'evento_data': '2025-03-01', 'pontuacao': colocacao, 'distancia': 10,
+            })
+            for colocacao in range(1, 6)
+        ]
+        caminho = self.escrever('resultados.jsonl', '\n'.join(linhas) + '\n')
+        # Simula uma importação interrompida após o lote das 2 primeiras linhas
+        ProgressoImportacao.objects.create(arquivo=caminho, linhas_confirmadas=2)
+
+        self.importar(caminho, tamanho_lote=2)
+
+        self.assertEqual(
+            sorted(Estatistica.objects.values_list('pontuacao', flat=True)), [3, 4, 5]
+        )
+        progresso = ProgressoImportacao.objects.get(arquivo=caminho)
+        self.assertTrue(progresso.concluido)
+        self.assertEqual(progresso.linhas_confirmadas, 5)
+
+        # Arquivo concluído não é importado de novo, a menos que seja reiniciado
+        saida, _ = self.importar(caminho)
+        self.assertIn('já foi importado', saida)
+        self.importar(caminho, reiniciar=True)
+        self.assertEqual(Estatistica.objects.count(), 8)
+
+    def test_rejeita_valores_inteiros_com_casas_decimais(self):
+        caminho = self.escrever('resultados.csv', (
+            'atleta_cpf,evento_nome,evento_data,pontuacao,distancia\n'
+            '52998224725,Maratona de Teste,2025-03-01,3.7,10\n'
+            '52998224725,Maratona de Teste,2025-03-01,abc,10\n'
+            '52998224725,Maratona de Teste,2025-03-01,4.0,10\n'
+        ))
+
+        _, erros = self.importar(caminho)
+
+        self.assertEqual(list(Estatistica.objects.values_list('pontuacao', flat=True)), [4])
+        self.assertIn("Linha 1: pontuacao deve ser inteiro: '3.7'", erros)
+        self.assertIn("Linha 2: pontuacao inválido: 'abc'", erros)
+
+    def test_reporta_eventos_com_mesmo_nome_e_data(self):
+        criar_evento(nome='Maratona de Teste', data=date(2025, 3, 1), local='Outro local')
+        caminho = self.escrever('resultados.csv', (
+            'atleta_cpf,evento_nome,evento_data,pontuacao,distancia\n'
+            '52998224725,Maratona de Teste,2025-03-01,1,10\n'
+        ))
+
+        _, erros = self.importar(caminho)
+
+        self.assertFalse(Estatistica.objects.exists())
+        self.assertIn("Linha 1: Há mais de um evento 'Maratona de Teste' em '2025-03-01'", erros)
+
+
+class PragmasSqliteTest(TestCase):
+    def pragma(self, nome):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {nome}')
+            return cursor.fetchone()[0]
+
+    def test_aplica_pragmas_do_perfil_na_conexao(self):
+        anterior = self.pragma('cache_size'), self.pragma('busy_timeout')
+        connection.settings_dict['PRAGMAS'] = {'cache_size': -4096, 'busy_timeout': 1234}
+        try:
+            aplicar_pragmas_sqlite(sender=type(connection), connection=connection)
+            self.assertEqual(self.pragma('cache_size'), -4096)
+            self.assertEqual(self.pragma('busy_timeout'), 1234)
+        finally:
+            del connection.settings_dict['PRAGMAS']
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA cache_size = {anterior[0]}')
+                cursor.execute(f'PRAGMA busy_timeout = {anterior[1]}')
+
+    def test_sem_pragmas_nao_altera_conexao(self):
+        anterior = self.pragma('cache_size')
+        aplicar_pragmas_sqlite(sender=type(connection), connection=connection)
+        self.assertEqual(self.pragma('cache_size'), anterior)
+
+
+class ReplicaTest(TransactionTestCase):
+    """Testes da réplica de leituras e do roteamento."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, diretorio)
+        self.caminho = os.path.join(diretorio, 'replica.sqlite3')
+
+        # A conexão 'replica' passa a apontar para um arquivo temporário
+        configuracao = connections.settings['replica']
+        nome_original = configuracao['NAME']
+        configuracao['NAME'] = self.caminho
+        del connections['replica']
+        self.addCleanup(self.restaurar_replica, nome_original)
+
+        self.corredor = criar_atleta()
+        self.evento = criar_evento()
+        Estatistica.objects.create(atleta=self.corredor, evento=self.evento, pontuacao=1, distancia=10)
+
+    def restaurar_replica(self, nome):
+        connections['replica'].close()
+        connections.settings['replica']['NAME'] = nome
+        del connections['replica']
+        replica._sincronizacao.update(sincronizada_em=None, verificada_em=None)
+
+    def test_atualizar_replica_copia_o_banco(self):
+        sincronizada_em = atualizar_replica()
+
+        with sqlite3.connect(self.caminho) as conexao:
+            self.assertEqual(conexao.execute('SELECT COUNT(*) FROM analise_estatistica').fetchone()[0], 1)
+            self.assertEqual(
+                conexao.execute(f'SELECT sincronizada_em FROM {replica.TABELA_SINCRONIZACAO}').fetchall(),
+                [(sincronizada_em,)]
+            )
+
+        # Uma nova cópia substitui a anterior
+        criar_atleta()
+        atualizar_replica()
+        with sqlite3.connect(self.caminho) as conexao:
+            self.assertEqual(conexao.execute('SELECT COUNT(*) FROM analise_atleta').fetchone()[0], 2)
+            self.assertEqual(conexao.execute(f'SELECT COUNT(*) FROM {replica.TABELA_SINCRONIZACAO}').fetchone()[0], 1)
+
+    def test_replica_deve_ser_outro_arquivo(self):
+        connections.settings['replica']['NAME'] = connections.settings['default']['NAME']
+        with self.assertRaises(ValueError):
+            atualizar_replica()
+
+    @override_settings(ANALISE_LEITURA_REPLICA=True)
+    def test_leituras_dos_managers_vao_para_a_replica(self):
+        atualizar_replica()
+        outro = criar_atleta()
+        Estatistica.objects.create(atleta=outro, evento=self.evento, pontuacao=2, distancia=10)
+
+        # A réplica ainda não tem a estatística gravada após a cópia
+        self.assertEqual(Atleta.objects.buscar_participantes(self.evento), [self.corredor])
+        with ler_da_replica():
+            self.assertEqual(Atleta.objects.all().db, 'replica')
+        self.assertEqual(Atleta.objects.count(), 2)
+
+        # A API e o relatório também leem da réplica
+        resposta = self.client.get(f'/analise/api/eventos/{self.evento.pk}/participantes/')
+        self.assertEqual([item['id'] for item in resposta.json()['resultados']], [self.corredor.pk])
+        resposta = self.client.get('/analise/relatorios/estatisticas/', {'formato': 'jsonl'})
+        self.assertEqual(len(b''.join(resposta.streaming_content).splitlines()), 1)
+
+        # Os QuerySets retornados pelos managers ficam fixados na réplica
+        self.assertEqual(Evento.objects.buscar_evento_participantes_estrangeiros(date(2020, 1, 1)).db, 'replica')
+
+        roteador = RoteadorReplica()
+        self.assertEqual(roteador.db_for_write(Atleta), 'default')
+        self.assertFalse(roteador.allow_migrate('replica', 'analise'))
+
+    @override_settings(ANALISE_LEITURA_REPLICA=True, ANALISE_REPLICA_ATRASO_MAXIMO=60)
+    def test_volta_para_o_principal_quando_a_replica_esta_atrasada(self):
+        # Nunca atualizada: o arquivo não existe e não é criado
+        self.assertEqual(alias_leitura(), 'default')
+        self.assertFalse(os.path.exists(self.caminho))
+
+        atualizar_replica()
+        self.assertEqual(alias_leitura(), 'replica')
+
+        replica._sincronizacao['sincronizada_em'] -= 120
+        self.assertEqual(alias_leitura(), 'default')
+        with ler_da_replica():
+            self.assertEqual(Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(Esporte.CORRIDA).db, 'default')
+
+    @override_settings(ANALISE_LEITURA_REPLICA=True, ANALISE_REPLICA_ATRASO_MAXIMO=60)
+    def test_cache_nao_sobrevive_a_replica(self):
+        obter_cache().clear()
+        atualizar_replica()
+        consultas = Atleta.objects.em_cache()
+        outro = criar_atleta()
+        Estatistica.objects.create(atleta=outro, evento=self.evento, pontuacao=2, distancia=10)
+
+        # Lido da réplica ainda sem a nova estatística, já com a versão incrementada
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 1)
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 1)
+
+        # Após a cópia a chave muda e o resultado é relido
+        atualizar_replica()
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 2)
+
+        # Acima do atraso máximo a leitura volta ao principal, com outra chave
+        Estatistica.objects.create(atleta=criar_atleta(), evento=self.evento, pontuacao=3, distancia=10)
+        replica._sincronizacao['sincronizada_em'] -= 120
+        self.assertEqual(len(consultas.buscar_participantes(self.evento)), 3)
+
+    def test_bulk_registrar_valida_no_banco_do_manager(self):
+        atualizar_replica()
+        # Só existe no banco principal
+        novo = criar_atleta()
+
+        criadas, erros = Estatistica.objects.db_manager('replica').bulk_registrar([
+            {'atleta': novo, 'evento': self.evento, 'pontuacao': 2, 'distancia': 10},
+            {'atleta': self.corredor, 'evento': self.evento, 'pontuacao': 3, 'distancia': 10},
+        ])
+
+        self.assertEqual(erros, {0: ['Atleta ou evento inexistente']})
+        self.assertEqual(len(criadas), 1)
+        self.assertEqual(Estatistica.objects.using('replica').count(), 2)
+        self.assertEqual(Estatistica.objects.count(), 1)
+        self.assertEqual(
+            ResumoAtleta.objects.using('replica').get(atleta=self.corredor).total_estatisticas, 2
+        )
+
+    def test_desativada_por_padrao(self):
+        atualizar_replica()
+        with ler_da_replica():
+            self.assertEqual(alias_leitura(), 'default')
+            self.assertEqual(Atleta.objects.all().db, 'default')
+
+
+
+class RelatorioParaleloTest(TransactionTestCase):
+    """Testes do relatório renderizado em paralelo a partir de uma réplica em arquivo."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, diretorio)
+
+        # Os processos não enxergam o banco de testes em memória: o relatório
+        # paralelo lê de uma réplica em arquivo temporário
+        configuracao = connections.settings['replica']
+        nome_original = configuracao['NAME']
+        configuracao['NAME'] = os.path.join(diretorio, 'replica.sqlite3')
+        del connections['replica']
+        self.addCleanup(ReplicaTest.restaurar_replica, self, nome_original)
+
+        gerar_dados(300, semente=3)
+        # Atletas homônimos ficam sempre na mesma fatia
+        evento = Evento.objects.first()
+        for cpf in ('98765432100', '98765432101'):
+            homonimo = criar_atleta(nome='Homônimo', cpf=cpf, email=f'{cpf}@email.com')
+            Estatistica.objects.create(atleta=homonimo, evento=evento, pontuacao=1, distancia=10)
+        atualizar_replica()
+
+    @override_settings(ANALISE_LEITURA_REPLICA=True)
+    def test_identico_ao_relatorio_serial(self):
+        self.assertGreater(len(relatorio_paralelo.planejar_fatias('replica', 40)), 2)
+
+        for formato in ('texto', 'csv', 'jsonl'):
+            serial, paralelo = StringIO(), StringIO()
+            escrever_relatorio_estatisticas(serial, formato)
+            with ler_da_replica():
+                escrever_relatorio_estatisticas(
+                    paralelo, formato, tamanho_lote=7, trabalhadores=2, tamanho_fatia=40
+                )
+            self.assertEqual(paralelo.getvalue(), serial.getvalue())
+
+    def test_fatias_nao_dividem_atletas(self):
+        fatias = relatorio_paralelo.planejar_fatias('replica', 40)
+        nomes = sorted(set(Atleta.objects.values_list('nome', flat=True)))
+
+        self.assertEqual((fatias[0][0], fatias[-1][1]), (nomes[0], nomes[-1]))
+        for (_, ultimo), (primeiro, _) in zip(fatias, fatias[1:]):
+            self.assertEqual(nomes.index(primeiro), nomes.index(ultimo) + 1)
+
+    def test_argumentos_invalidos(self):
+        # Fora de ler_da_replica() o relatório leria o banco de testes em memória
+        with self.assertRaises(ValueError):
+            relatorio_paralelo.gerar_relatorio_paralelo('texto')
+        with self.assertRaises(ValueError):
+            relatorio_paralelo.gerar_relatorio_paralelo('xml')
+        with self.assertRaises(ValueError):
+            relatorio_paralelo.gerar_relatorio_paralelo('csv', trabalhadores=0)
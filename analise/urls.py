@@ -0,0 +1,22 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'analise'
+
+urlpatterns = [
+    path('relatorios/estatisticas/', views.relatorio_estatisticas, name='relatorio_estatisticas'),
+
+    # API JSON somente leitura
+    path('api/atletas/corredores-vencedores/', views.api_corredores_vencedores, name='api_corredores_vencedores'),
+    path('api/atletas/maiores-pontuadores/', views.api_maiores_pontuadores, name='api_maiores_pontuadores'),
+    path('api/atletas/ranking/', views.api_ranking, name='api_ranking'),
+    path('api/atletas/<int:atleta_id>/desempenho/', views.api_desempenho_atleta, name='api_desempenho_atleta'),
+    path('api/eventos/<int:evento_id>/participantes/', views.api_participantes, name='api_participantes'),
+    path(
+        'api/eventos/participantes-estrangeiros/',
+        views.api_eventos_participantes_estrangeiros,
+        name='api_eventos_participantes_estrangeiros'
+    ),
+    path('api/painel/', views.api_painel, name='api_painel'),
+]
@@ -0,0 +1,245 @@
+"""
+Contexto de validação para gravações em lote.
+
+Fora de um contexto, cada ``Estatistica.save()`` consulta a existência do
+atleta e do evento (validação das chaves estrangeiras), carrega os dois
+objetos para as regras de ``clean()``, abre um savepoint e atualiza o
+ResumoAtleta; cada ``Atleta.full_clean()`` consulta a unicidade de cpf e
+e-mail. Dentro de ``contexto_validacao()``:
+
+- atletas e eventos são carregados uma vez (``precarregar`` ou sob demanda)
+  e compartilhados entre as estatísticas, sem a validação de existência;
+- a unicidade de cpf/e-mail é verificada em memória: apenas os valores do
+  lote são consultados (todos de uma vez com ``precarregar(novos_atletas=...)``,
+  ou por atleta, sob demanda) e os valores validados ficam reservados até o
+  fim do contexto;
+- o lote inteiro é uma transação e os resumos dos atletas afetados são
+  recalculados uma vez, na saída.
+
+Assim cada ``Estatistica.save()`` executa apenas o INSERT (ou UPDATE).
+
+Uso:
+    with contexto_validacao() as contexto:
+        contexto.precarregar(atletas=ids_atletas, eventos=ids_eventos)
+        for linha in linhas:
+            Estatistica.objects.create(**linha)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+_contexto_atual = ContextVar('analise_contexto_validacao', default=None)
+
+# Campos únicos de Atleta verificados em memória
+CAMPOS_UNICOS_ATLETA = ('cpf', 'email')
+
+# Valores de cada campo por consulta de unicidade (limite de parâmetros do SQLite)
+TAMANHO_LOTE_UNICOS = 400
+
+
+def contexto_atual():
+    """ContextoValidacao ativo, ou None fora de contexto_validacao()"""
+    return _contexto_atual.get()
+
+
+class ContextoValidacao:
+    """Objetos relacionados e valores únicos compartilhados durante um lote"""
+
+    def __init__(self, using=None):
+        self.using = using
+        self.atletas = {}
+        self.eventos = {}
+        self.atletas_alterados = set()
+        # {campo: {valor: chave do dono}}, apenas para valores já consultados
+        # (em _consultados); chave ('pk', id) ou ('objeto', id(atleta)) para
+        # atletas ainda não gravados, mantidos em _atletas_lote
+        self._unicos_atleta = {campo: {} for campo in CAMPOS_UNICOS_ATLETA}
+        self._consultados = {campo: set() for campo in CAMPOS_UNICOS_ATLETA}
+        # {chave do atleta: {campo: valor}} dos atletas conhecidos
+        self._valores_atleta = {}
+        self._atletas_lote = {}
+
+    def precarregar(self, atletas=(), eventos=(), novos_atletas=()) -> None:
+        """
+        Carrega atletas e eventos em uma consulta por modelo.
+
+        Args:
+            atletas: Ids (ou objetos) dos atletas usados no lote
+            eventos: Ids (ou objetos) dos eventos usados no lote
+            novos_atletas: Atletas que serão validados no lote; os donos atuais
+                dos seus cpfs e e-mails são consultados de uma vez
+        """
+        from .models.atleta import Atleta
+        from .models.evento import Evento
+
+        self._carregar(Atleta, self.atletas, atletas)
+        self._carregar(Evento, self.eventos, eventos)
+        self._consultar_unicos(Atleta, novos_atletas)
+
+    def _carregar(self, modelo, cache: dict, itens) -> None:
+        ids = {getattr(item, 'pk', item) for item in itens} - set(cache) - {None}
+        if ids:
+            cache.update(modelo._base_manager.db_manager(self.using).in_bulk(ids))
+
+    def _relacionado(self, estatistica, campo: str, modelo, cache: dict) -> list:
+        """
+        Associa à estatística o objeto compartilhado do campo. Retorna [campo]
+        se a existência do objeto já é conhecida, para excluí-lo de clean_fields.
+        """
+        descritor = getattr(type(estatistica), campo)
+        pk = getattr(estatistica, f'{campo}_id')
+
+        if descritor.field.is_cached(estatistica):
+            objeto = getattr(estatistica, campo)
+            if objeto is not None and objeto.pk is not None and objeto.pk == pk:
+                cache.setdefault(pk, objeto)
+                return [campo]
+            return []
+
+        if pk is None:
+            return []
+        if pk not in cache:
+            self._carregar(modelo, cache, [pk])
+        if pk not in cache:
+            # Inexistente: clean_fields gera a mensagem de erro padrão
+            return []
+
+        setattr(estatistica, campo, cache[pk])
+        return [campo]
+
+    def validar_estatistica(self, estatistica) -> None:
+        """
+        full_clean da estatística usando os atletas e eventos compartilhados.
+
+        Raises:
+            ValidationError: Se a estatística for inválida
+        """
+        from .models.atleta import Atleta
+        from .models.evento import Evento
+
+        exclude = (
+            self._relacionado(estatistica, 'atleta', Atleta, self.atletas)
+            + self._relacionado(estatistica, 'evento', Evento, self.eventos)
+        )
+        estatistica.full_clean(exclude=exclude)
+
+    def adiar_resumo(self, *atleta_ids) -> None:
+        """Marca atletas cujo resumo será recalculado ao final do contexto"""
+        self.atletas_alterados.update(atleta_id for atleta_id in atleta_ids if atleta_id is not None)
+
+    def validar_unicos_atleta(self, atleta, exclude=None) -> None:
+        """
+        Verifica em memória a unicidade de cpf e e-mail, reservando os valores
+        do atleta até o fim do contexto.
+
+        Raises:
+            ValidationError: Se outro atleta já usa o cpf ou o e-mail
+        """
+        self._consultar_unicos(type(atleta), [atleta])
+
+        erros = {}
+        for campo in CAMPOS_UNICOS_ATLETA:
+            if exclude and campo in exclude:
+                continue
+            dono = self._unicos_atleta[campo].get(getattr(atleta, campo))
+            if dono is not None and not self._mesmo_atleta(dono, atleta):
+                erros[campo] = [atleta.unique_error_message(type(atleta), (campo,))]
+        if erros:
+            raise ValidationError(erros)
+
+        # Libera os valores anteriores do mesmo atleta (cpf ou e-mail alterado)
+        for chave in self._chaves(atleta):
+            for campo, valor in self._valores_atleta.pop(chave, {}).items():
+                if self._mesmo_atleta(self._unicos_atleta[campo].get(valor), atleta):
+                    del self._unicos_atleta[campo][valor]
+
+        chave = self._chave_atleta(atleta)
+        if chave[0] == 'objeto':
+            # Mantém o objeto vivo para que seu id() não seja reaproveitado
+            self._atletas_lote[chave[1]] = atleta
+        valores = {campo: getattr(atleta, campo) for campo in CAMPOS_UNICOS_ATLETA}
+        for campo, valor in valores.items():
+            self._unicos_atleta[campo][valor] = chave
+        self._valores_atleta[chave] = valores
+
+    def _consultar_unicos(self, modelo, atletas) -> None:
+        """
+        Consulta os donos dos cpfs e e-mails dos atletas ainda não consultados,
+        em uma consulta por lote de valores (não a tabela inteira)
+        """
+        pendentes = {campo: set() for campo in CAMPOS_UNICOS_ATLETA}
+        for atleta in atletas:
+            for campo in CAMPOS_UNICOS_ATLETA:
+                valor = getattr(atleta, campo)
+                if valor is not None and valor not in self._consultados[campo]:
+                    pendentes[campo].add(valor)
+
+        listas = {campo: sorted(valores) for campo, valores in pendentes.items()}
+        maior = max(len(valores) for valores in listas.values())
+        for inicio in range(0, maior, TAMANHO_LOTE_UNICOS):
+            filtro = Q()
+            for campo, valores in listas.items():
+                if valores[inicio:inicio + TAMANHO_LOTE_UNICOS]:
+                    filtro |= Q(**{f'{campo}__in': valores[inicio:inicio + TAMANHO_LOTE_UNICOS]})
+            existentes = modelo._base_manager.db_manager(self.using).filter(filtro).values_list(
+                'pk', *CAMPOS_UNICOS_ATLETA
+            )
+            for pk, *valores in existentes:
+                self._registrar_existente(('pk', pk), dict(zip(CAMPOS_UNICOS_ATLETA, valores)))
+
+        for campo, valores in pendentes.items():
+            self._consultados[campo].update(valores)
+
+    def _registrar_existente(self, chave: tuple, valores: dict) -> None:
+        """Registra os valores gravados de um atleta, se o contexto ainda não os conhece"""
+        if chave in self._valores_atleta:
+            # Já validado no contexto: os valores em memória prevalecem sobre os do banco
+            return
+        self._valores_atleta[chave] = valores
+        for campo, valor in valores.items():
+            if valor not in self._consultados[campo]:
+                self._unicos_atleta[campo][valor] = chave
+
+    @staticmethod
+    def _chaves(atleta) -> set:
+        """Chaves sob as quais o atleta pode ter sido registrado (antes e depois de gravado)"""
+        chaves = {('objeto', id(atleta))}
+        if atleta.pk is not None:
+            chaves.add(('pk', atleta.pk))
+        return chaves
+
+    @staticmethod
+    def _chave_atleta(atleta) -> tuple:
+        # Atletas ainda não gravados são identificados pelo próprio objeto
+        return ('pk', atleta.pk) if atleta.pk is not None else ('objeto', id(atleta))
+
+    @classmethod
+    def _mesmo_atleta(cls, dono, atleta) -> bool:
+        return dono is not None and dono in cls._chaves(atleta)
+
+
+@contextmanager
+def contexto_validacao(using=None):
+    """
+    Executa o bloco em uma transação com um ContextoValidacao ativo.
+
+    Args:
+        using: Alias do banco (padrão: o do roteamento)
+
+    Yields:
+        ContextoValidacao, para precarregar atletas e eventos
+    """
+    from .models.resumo_atleta import ResumoAtleta
+
+    contexto = ContextoValidacao(using)
+    token = _contexto_atual.set(contexto)
+    try:
+        with transaction.atomic(using=using):
+            yield contexto
+            if contexto.atletas_alterados:
+                ResumoAtleta.objects.db_manager(using).recalcular(contexto.atletas_alterados)
+    finally:
+        _contexto_atual.reset(token)
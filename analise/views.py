@@ -1,3 +1,218 @@
-from django.shortcuts import render
+import asyncio
+from datetime import date
+from functools import wraps
+from inspect import iscoroutinefunction
 
-# Create your views here.
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .models.atleta import Atleta
+from .models.evento import Evento
+from .models.estatistica import Estatistica
+from .models.esporte import Esporte
+from .paginacao import paginar_keyset
+from .relatorios import FORMATOS, TIPOS_CONTEUDO, gerar_relatorio_estatisticas
+from .replica import leitura_replica
+
+# Campos projetados pela API; nenhuma consulta carrega o modelo completo
+CAMPOS_ATLETA = ('id', 'nome', 'esporte', 'nacionalidade')
+CAMPOS_EVENTO = ('id', 'nome', 'data', 'cidade', 'pais', 'esporte', 'oficial')
+
+# Chaves da paginação keyset (o último campo deve ser único)
+ORDENACAO_ATLETA = ('nome', 'id')
+ORDENACAO_EVENTO = ('-data', '-id')
+
+# Janela das médias móveis da série de desempenho
+JANELA_PADRAO = 5
+JANELA_MAXIMA = 50
+
+# Limite padrão de posições do ranking no painel
+LIMITE_RANKING_PAINEL = 3
+
+TAMANHO_PAGINA_PADRAO = 50
+TAMANHO_PAGINA_MAXIMO = 500
+
+
+@require_GET
+@leitura_replica
+def relatorio_estatisticas(request):
+    """
+    Relatório de estatísticas por atleta enviado em streaming.
+    
+    O formato é escolhido pelo parâmetro ``formato`` (texto, csv ou jsonl).
+    """
+    formato = request.GET.get('formato', 'texto')
+    if formato not in FORMATOS:
+        return HttpResponseBadRequest(f'Formato deve ser um de: {", ".join(FORMATOS)}')
+    
+    resposta = StreamingHttpResponse(
+        gerar_relatorio_estatisticas(formato),
+        content_type=TIPOS_CONTEUDO[formato]
+    )
+    if formato != 'texto':
+        resposta['Content-Disposition'] = f'attachment; filename="estatisticas.{formato}"'
+    return resposta
+
+
+# --------------------------------------------------------------------------------------------------
+# API JSON somente leitura para as consultas dos managers
+# --------------------------------------------------------------------------------------------------
+
+def api_view(view):
+    """
+    Restringe a view a GET, converte ValueError em resposta 400 com JSON e
+    envia as leituras para a réplica (ver analise/replica.py)
+    """
+    view = leitura_replica(view)
+    if iscoroutinefunction(view):
+        @require_GET
+        @wraps(view)
+        async def wrapper_assincrono(request, *args, **kwargs):
+            try:
+                return await view(request, *args, **kwargs)
+            except ValueError as e:
+                return JsonResponse({'erro': str(e)}, status=400)
+        return wrapper_assincrono
+    
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ValueError as e:
+            return JsonResponse({'erro': str(e)}, status=400)
+    return wrapper
+
+
+def _parametro_data(request) -> date:
+    """Lê o parâmetro obrigatório ``data`` no formato AAAA-MM-DD"""
+    try:
+        return date.fromisoformat(request.GET.get('data', ''))
+    except ValueError:
+        raise ValueError('Parâmetro data deve estar no formato AAAA-MM-DD')
+
+
+def _parametro_inteiro(request, nome: str, padrao: int, maximo: int) -> int:
+    """Lê um parâmetro inteiro positivo limitado a ``maximo``"""
+    try:
+        valor = int(request.GET.get(nome, padrao))
+    except ValueError:
+        raise ValueError(f'Parâmetro {nome} deve ser um inteiro')
+    if not 1 <= valor <= maximo:
+        raise ValueError(f'Parâmetro {nome} deve estar entre 1 e {maximo}')
+    return valor
+
+
+def _pagina(request, queryset, campos, ordenacao) -> JsonResponse:
+    """Projeta os campos e devolve a página indicada pelo parâmetro ``cursor``"""
+    tamanho = _parametro_inteiro(request, 'tamanho', TAMANHO_PAGINA_PADRAO, TAMANHO_PAGINA_MAXIMO)
+    itens, proximo_cursor = paginar_keyset(
+        queryset.values(*campos),
+        ordenacao,
+        cursor=request.GET.get('cursor'),
+        tamanho=tamanho
+    )
+    return JsonResponse({'resultados': itens, 'proximo_cursor': proximo_cursor})
+
+
+@api_view
+def api_corredores_vencedores(request):
+    """Corredores que venceram alguma prova desde ``data``"""
+    queryset = Atleta.objects.buscar_corredores_vencedores(
+        _parametro_data(request), preguicoso=True, campos=CAMPOS_ATLETA
+    )
+    return _pagina(request, queryset, CAMPOS_ATLETA, ORDENACAO_ATLETA)
+
+
+@api_view
+def api_maiores_pontuadores(request):
+    """Atletas com a melhor pontuação em eventos oficiais do ``esporte``"""
+    esporte = request.GET.get('esporte')
+    if esporte not in Esporte.values:
+        raise ValueError(f'Parâmetro esporte deve ser um de: {", ".join(Esporte.values)}')
+    
+    queryset = Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(esporte)
+    return _pagina(request, queryset, CAMPOS_ATLETA, ORDENACAO_ATLETA)
+
+
+@api_view
+def api_ranking(request):
+    """Ranking dos ``limite`` primeiros colocados de cada esporte em eventos oficiais"""
+    limite = _parametro_inteiro(request, 'limite', 1, TAMANHO_PAGINA_MAXIMO)
+    ranking = Atleta.objects.em_cache().buscar_ranking_eventos_oficiais(limite)
+    
+    return JsonResponse({'resultados': {
+        esporte: [
+            {
+                'id': atleta.id,
+                'nome': atleta.nome,
+                'melhor_pontuacao': atleta.melhor_pontuacao,
+                'posicao': atleta.posicao,
+            }
+            for atleta in atletas
+        ]
+        for esporte, atletas in ranking.items()
+    }})
+
+
+@api_view
+def api_participantes(request, evento_id):
+    """Atletas que participaram do evento"""
+    queryset = Atleta.objects.buscar_participantes(evento_id, preguicoso=True, campos=CAMPOS_ATLETA)
+    return _pagina(request, queryset, CAMPOS_ATLETA, ORDENACAO_ATLETA)
+
+
+@api_view
+def api_desempenho_atleta(request, atleta_id):
+    """Série de desempenho do atleta com médias móveis das últimas ``janela`` participações"""
+    janela = _parametro_inteiro(request, 'janela', JANELA_PADRAO, JANELA_MAXIMA)
+    serie = Estatistica.objects.em_cache().buscar_serie_desempenho(atleta_id, janela)
+    return JsonResponse({'atleta': atleta_id, 'janela': janela, 'resultados': serie})
+
+
+@api_view
+def api_eventos_participantes_estrangeiros(request):
+    """Eventos com participantes estrangeiros desde ``data``, do mais recente ao mais antigo"""
+    queryset = Evento.objects.buscar_evento_participantes_estrangeiros(_parametro_data(request))
+    return _pagina(request, queryset, CAMPOS_EVENTO, ORDENACAO_EVENTO)
+
+
+def _projetar(objeto, campos) -> dict:
+    return {campo: getattr(objeto, campo) for campo in campos}
+
+
+@api_view
+async def api_painel(request):
+    """
+    Painel com as consultas dos managers desde ``data``: corredores vencedores,
+    maiores pontuadores oficiais de cada esporte, ranking (``limite`` posições)
+    e eventos com participantes estrangeiros.
+    
+    As consultas são independentes e aguardadas em conjunto com asyncio.gather,
+    mas no Django 5.0 o ORM assíncrono executa cada uma na thread única de
+    sync_to_async(thread_sensitive=True): elas rodam uma após a outra e o
+    tempo de resposta é o mesmo da versão síncrona. O ganho é não bloquear o
+    event loop enquanto o SQL executa.
+    """
+    data = _parametro_data(request)
+    limite = _parametro_inteiro(request, 'limite', LIMITE_RANKING_PAINEL, TAMANHO_PAGINA_MAXIMO)
+    
+    corredores, ranking, eventos, *pontuadores = await asyncio.gather(
+        Atleta.objects.abuscar_corredores_vencedores(data),
+        Atleta.objects.abuscar_ranking_eventos_oficiais(limite),
+        Evento.objects.abuscar_evento_participantes_estrangeiros(data),
+        *(Atleta.objects.abuscar_maiores_pontuadores_eventos_oficiais(esporte) for esporte in Esporte.values)
+    )
+    
+    return JsonResponse({
+        'corredores_vencedores': [_projetar(atleta, CAMPOS_ATLETA) for atleta in corredores],
+        'maiores_pontuadores': {
+            esporte: [_projetar(atleta, CAMPOS_ATLETA) for atleta in atletas]
+            for esporte, atletas in zip(Esporte.values, pontuadores)
+        },
+        'ranking': {
+            esporte: [_projetar(atleta, CAMPOS_ATLETA + ('melhor_pontuacao', 'posicao')) for atleta in atletas]
+            for esporte, atletas in ranking.items()
+        },
+        'eventos_participantes_estrangeiros': [_projetar(evento, CAMPOS_EVENTO) for evento in eventos],
+    })
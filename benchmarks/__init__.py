@@ -0,0 +1,7 @@
+"""
+Benchmarks da aplicação Estatistinga.
+
+Cada script cria um banco de testes temporário, portanto pode ser executado
+sem afetar os dados do banco configurado em settings.py:
+python -m benchmarks.bench_bulk_registrar
+"""
@@ -0,0 +1,114 @@
+"""
+Compara o laço de Estatistica.objects.create usado em
+test_aplicacao.criar_estatisticas com Estatistica.objects.bulk_registrar.
+
+Uso:
+python -m benchmarks.bench_bulk_registrar --linhas 5000
+"""
+import argparse
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.utils import configurar_django, banco_temporario, contador_consultas, cronometro, sem_instrumentacao
+
+configurar_django()
+
+from analise.models.atleta import Atleta  # noqa: E402
+from analise.models.evento import Evento  # noqa: E402
+from analise.models.estatistica import Estatistica  # noqa: E402
+from analise.models.esporte import Esporte  # noqa: E402
+
+
+def criar_cadastros(quantidade_atletas: int, quantidade_eventos: int):
+    """Cria atletas e eventos de corrida em lote"""
+    atletas = Atleta.objects.bulk_create(
+        Atleta(
+            nome=f'Corredor {i:06d}',
+            cpf=f'{i:011d}',
+            email=f'corredor{i}@email.com',
+            data_nascimento=date(1995, 1, 1),
+            nacionalidade='Brasil',
+            altura=1.75,
+            peso=65.0,
+            esporte=Esporte.CORRIDA,
+        )
+        for i in range(quantidade_atletas)
+    )
+    eventos = Evento.objects.bulk_create(
+        Evento(
+            nome=f'Corrida {i:06d}',
+            local='Avenida Paulista',
+            cidade='São Paulo',
+            pais='Brasil',
+            data=date(2024, 1, 1) + timedelta(days=i),
+            esporte=Esporte.CORRIDA,
+            organizador='Federação',
+            capacidade=1000,
+        )
+        for i in range(quantidade_eventos)
+    )
+    return atletas, eventos
+
+
+def gerar_linhas(atletas, eventos, quantidade: int) -> list:
+    """Gera linhas de estatísticas válidas referenciando atletas e eventos por id"""
+    return [
+        {
+            'atleta_id': atletas[i % len(atletas)].pk,
+            'evento_id': eventos[i % len(eventos)].pk,
+            'pontuacao': i % 100 + 1,
+            'distancia': Decimal('42.20'),
+            'observacoes': 'Carga de benchmark',
+        }
+        for i in range(quantidade)
+    ]
+
+
+def executar(linhas: int, tamanho_lote: int) -> dict:
+    """Executa as duas estratégias de carga e retorna tempos e número de consultas"""
+    resultado = {}
+
+    atletas, eventos = criar_cadastros(max(linhas // 10, 1), max(linhas // 100, 1))
+    dados = gerar_linhas(atletas, eventos, linhas)
+
+    # Estratégia atual: objects.create por linha (save() + full_clean())
+    with contador_consultas(resultado, 'create_consultas'):
+        with cronometro(resultado, 'create_segundos'):
+            for linha in dados:
+                Estatistica.objects.create(**linha)
+
+    Estatistica.objects.all().delete()
+
+    # Nova estratégia: bulk_registrar
+    with contador_consultas(resultado, 'bulk_registrar_consultas'):
+        with cronometro(resultado, 'bulk_registrar_segundos'):
+            criadas, erros = Estatistica.objects.bulk_registrar(dados, tamanho_lote=tamanho_lote)
+
+    assert not erros, f'Linhas inválidas no benchmark: {erros}'
+    assert len(criadas) == linhas
+
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--linhas', type=int, default=5000)
+    parser.add_argument('--tamanho-lote', type=int, default=1000)
+    args = parser.parse_args()
+
+    with banco_temporario(), sem_instrumentacao():
+        resultado = executar(args.linhas, args.tamanho_lote)
+
+    print(f"Linhas: {args.linhas}")
+    for estrategia in ('create', 'bulk_registrar'):
+        segundos = resultado[f'{estrategia}_segundos']
+        print(
+            f"  {estrategia:<15} {segundos:8.3f}s  "
+            f"{args.linhas / segundos:10.0f} linhas/s  "
+            f"{resultado[f'{estrategia}_consultas']:8d} consultas"
+        )
+    print(f"  Aceleração: {resultado['create_segundos'] / resultado['bulk_registrar_segundos']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
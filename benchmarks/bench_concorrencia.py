@@ -0,0 +1,202 @@
+"""
+Mede leituras e escritas concorrentes no SQLite em cada perfil de banco.
+
+Para cada perfil de PERFIS_BANCO (settings.py), cria um banco em arquivo
+temporário, gera dados sintéticos e executa, durante o mesmo intervalo,
+várias threads leitoras chamando os métodos dos managers e uma thread
+escritora criando estatísticas com Estatistica.objects.create. Ao final
+compara a vazão de leituras e escritas, a latência das leituras e a
+quantidade de erros "database is locked" de cada perfil.
+
+Uso:
+python -m benchmarks.bench_concorrencia --leitores 4 --segundos 10
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+
+from benchmarks.utils import configurar_django, sem_instrumentacao
+
+configurar_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import OperationalError, connections  # noqa: E402
+from analise.gerador import gerar_campos_estatistica, gerar_dados  # noqa: E402
+from analise.models.atleta import Atleta  # noqa: E402
+from analise.models.evento import Evento  # noqa: E402
+from analise.models.estatistica import Estatistica  # noqa: E402
+from analise.models.esporte import Esporte  # noqa: E402
+
+
+def configurar_perfil(perfil: str, caminho: str) -> None:
+    """Aponta a conexão 'default' para o arquivo com as opções do perfil"""
+    connections.close_all()
+    configuracao = dict(connections.settings['default'])
+    configuracao.pop('PRAGMAS', None)
+    configuracao.update({
+        'NAME': caminho,
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'OPTIONS': {},
+    })
+    configuracao.update(settings.PERFIS_BANCO[perfil])
+
+    # Novas conexões (inclusive as das threads) são criadas a partir de connections.settings
+    connections.settings['default'] = configuracao
+    del connections['default']
+
+
+def bloqueio(erro: OperationalError) -> bool:
+    return 'locked' in str(erro) or 'busy' in str(erro)
+
+
+class Contadores:
+    """Totais de uma thread: operações concluídas, erros de bloqueio e latências"""
+
+    def __init__(self):
+        self.operacoes = 0
+        self.bloqueios = 0
+        self.latencias = []
+
+
+def leitor(fim: float, eventos: list, data_corte: date, semente: int, contadores: Contadores):
+    rng = random.Random(semente)
+    consultas = (
+        lambda: Atleta.objects.buscar_participantes(rng.choice(eventos)),
+        lambda: Atleta.objects.buscar_corredores_vencedores(data_corte),
+        lambda: list(Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(Esporte.FUTEBOL)),
+    )
+    try:
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                rng.choice(consultas)()
+            except OperationalError as e:
+                if not bloqueio(e):
+                    raise
+                contadores.bloqueios += 1
+                continue
+            contadores.latencias.append(time.perf_counter() - inicio)
+            contadores.operacoes += 1
+    finally:
+        connections.close_all()
+
+
+def escritor(fim: float, atletas: list, eventos: list, semente: int, contadores: Contadores):
+    rng = random.Random(semente)
+    try:
+        while time.perf_counter() < fim:
+            try:
+                Estatistica.objects.create(
+                    atleta_id=rng.choice(atletas),
+                    evento_id=rng.choice(eventos),
+                    **gerar_campos_estatistica(Esporte.CORRIDA, rng)
+                )
+            except OperationalError as e:
+                if not bloqueio(e):
+                    raise
+                contadores.bloqueios += 1
+                continue
+            contadores.operacoes += 1
+    finally:
+        connections.close_all()
+
+
+def percentil(valores: list, fracao: float) -> float:
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(int(len(valores) * fracao), len(valores) - 1)]
+
+
+def executar_perfil(perfil: str, leitores: int, segundos: float, estatisticas: int, semente: int) -> dict:
+    """Gera os dados em um banco novo e executa leitores e escritor concorrentes"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        configurar_perfil(perfil, os.path.join(diretorio, 'concorrencia.sqlite3'))
+        call_command('migrate', verbosity=0)
+        gerar_dados(estatisticas, semente=semente)
+
+        with connections['default'].cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+
+        eventos = list(Evento.objects.values_list('id', flat=True))
+        atletas_corrida = list(Atleta.objects.filter(esporte=Esporte.CORRIDA).values_list('id', flat=True))
+        eventos_corrida = list(Evento.objects.filter(esporte=Esporte.CORRIDA).values_list('id', flat=True))
+        data_corte = date(date.today().year - 1, 1, 1)
+        connections.close_all()
+
+        contadores_leitura = [Contadores() for _ in range(leitores)]
+        contadores_escrita = Contadores()
+        fim = time.perf_counter() + segundos
+
+        threads = [
+            threading.Thread(target=leitor, args=(fim, eventos, data_corte, semente + i, contadores))
+            for i, contadores in enumerate(contadores_leitura)
+        ]
+        threads.append(threading.Thread(
+            target=escritor, args=(fim, atletas_corrida, eventos_corrida, semente, contadores_escrita)
+        ))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        connections.close_all()
+
+    latencias = [latencia for contadores in contadores_leitura for latencia in contadores.latencias]
+    leituras = sum(contadores.operacoes for contadores in contadores_leitura)
+    return {
+        'perfil': perfil,
+        'journal_mode': journal_mode,
+        'leituras': leituras,
+        'leituras_por_segundo': leituras / segundos,
+        'leitura_p50_ms': percentil(latencias, 0.50) * 1000,
+        'leitura_p95_ms': percentil(latencias, 0.95) * 1000,
+        'escritas': contadores_escrita.operacoes,
+        'escritas_por_segundo': contadores_escrita.operacoes / segundos,
+        'erros_bloqueio_leitura': sum(contadores.bloqueios for contadores in contadores_leitura),
+        'erros_bloqueio_escrita': contadores_escrita.bloqueios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--perfis', nargs='+', default=list(settings.PERFIS_BANCO),
+                        choices=list(settings.PERFIS_BANCO))
+    parser.add_argument('--leitores', type=int, default=4, help='Threads leitoras (padrão: 4)')
+    parser.add_argument('--segundos', type=float, default=10, help='Duração de cada perfil (padrão: 10)')
+    parser.add_argument('--estatisticas', type=int, default=20000,
+                        help='Estatísticas geradas antes da medição (padrão: 20000)')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON de resultado (opcional)')
+    args = parser.parse_args()
+
+    resultados = []
+    for perfil in args.perfis:
+        with sem_instrumentacao():
+            resultado = executar_perfil(perfil, args.leitores, args.segundos, args.estatisticas, args.semente)
+        resultados.append(resultado)
+        print(
+            f"{perfil:<16} ({resultado['journal_mode']}) "
+            f"leituras: {resultado['leituras_por_segundo']:8.1f}/s "
+            f"p50 {resultado['leitura_p50_ms']:7.2f} ms p95 {resultado['leitura_p95_ms']:7.2f} ms | "
+            f"escritas: {resultado['escritas_por_segundo']:7.1f}/s | "
+            f"bloqueios: {resultado['erros_bloqueio_leitura']} leitura, "
+            f"{resultado['erros_bloqueio_escrita']} escrita"
+        )
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
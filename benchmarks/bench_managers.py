@@ -0,0 +1,138 @@
+"""
+Mede os métodos dos managers e o relatório de estatísticas em várias escalas.
+
+Para cada escala, gera dados sintéticos em um banco temporário e registra,
+por operação, tempo de execução, número de consultas SQL e pico de memória
+Python (tracemalloc). O resultado é gravado em JSON junto com o commit atual,
+permitindo comparar execuções entre commits.
+
+Uso:
+python -m benchmarks.bench_managers --escalas 10000 100000 --saida bench.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import date, datetime, timezone
+
+from benchmarks.utils import (
+    Descarte, configurar_django, banco_temporario, contador_consultas, cronometro, sem_instrumentacao
+)
+
+configurar_django()
+
+from django.db.models import Count  # noqa: E402
+from analise.gerador import gerar_dados  # noqa: E402
+from analise.models.atleta import Atleta  # noqa: E402
+from analise.models.evento import Evento  # noqa: E402
+from analise.models.esporte import Esporte  # noqa: E402
+from analise.relatorios import escrever_relatorio_estatisticas  # noqa: E402
+
+
+def operacoes(data_corte: date, evento_id: int) -> dict:
+    """Operações medidas; cada uma materializa completamente o resultado"""
+    return {
+        'buscar_corredores_vencedores': lambda: Atleta.objects.buscar_corredores_vencedores(data_corte),
+        'buscar_maiores_pontuadores_eventos_oficiais': lambda: [
+            list(Atleta.objects.buscar_maiores_pontuadores_eventos_oficiais(esporte))
+            for esporte in (Esporte.CORRIDA, Esporte.FUTEBOL, Esporte.BASQUETE)
+        ],
+        'buscar_ranking_eventos_oficiais': lambda: Atleta.objects.buscar_ranking_eventos_oficiais(3),
+        'buscar_participantes': lambda: Atleta.objects.buscar_participantes(evento_id),
+        'buscar_evento_participantes_estrangeiros': lambda: list(
+            Evento.objects.buscar_evento_participantes_estrangeiros(data_corte)
+        ),
+        'relatorio_estatisticas': lambda: escrever_relatorio_estatisticas(Descarte()),
+    }
+
+
+def medir(funcao, repeticoes: int) -> dict:
+    """Menor tempo entre as repetições, consultas e pico de memória da primeira"""
+    medicao = {}
+    tempos = []
+
+    tracemalloc.start()
+    with contador_consultas(medicao, 'consultas'):
+        with cronometro(medicao, 'segundos'):
+            funcao()
+    _, medicao['pico_memoria_bytes'] = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tempos.append(medicao.pop('segundos'))
+
+    for _ in range(repeticoes - 1):
+        with cronometro(medicao, 'segundos'):
+            funcao()
+        tempos.append(medicao.pop('segundos'))
+
+    medicao['segundos'] = min(tempos)
+    return medicao
+
+
+def executar_escala(estatisticas: int, repeticoes: int, semente: int) -> dict:
+    """Gera os dados de uma escala e mede todas as operações"""
+    resultado = {'estatisticas': estatisticas}
+
+    with cronometro(resultado, 'geracao_segundos'):
+        gerar_dados(estatisticas, semente=semente)
+
+    # Evento com mais participantes, o pior caso de buscar_participantes
+    evento_id = Evento.objects.annotate(
+        total=Count('estatisticas')
+    ).order_by('-total').values_list('id', flat=True).first()
+    data_corte = date(date.today().year - 1, 1, 1)
+
+    resultado['operacoes'] = {
+        nome: medir(funcao, repeticoes)
+        for nome, funcao in operacoes(data_corte, evento_id).items()
+    }
+    return resultado
+
+
+def commit_atual() -> str:
+    """Hash do commit atual, ou None fora de um repositório git"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10000, 100000],
+                        help='Quantidades de estatísticas geradas (padrão: 10000 100000)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default='bench_managers.json', help='Arquivo JSON de resultado')
+    args = parser.parse_args()
+
+    execucao = {
+        'commit': commit_atual(),
+        'data': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'escalas': [],
+    }
+
+    for estatisticas in args.escalas:
+        # Cada escala usa um banco novo
+        with banco_temporario(), sem_instrumentacao():
+            escala = executar_escala(estatisticas, args.repeticoes, args.semente)
+        execucao['escalas'].append(escala)
+
+        print(f"Escala {estatisticas} (geração: {escala['geracao_segundos']:.1f}s)")
+        for nome, medicao in escala['operacoes'].items():
+            print(
+                f"  {nome:<45} {medicao['segundos'] * 1000:10.2f} ms "
+                f"{medicao['consultas']:5d} consultas "
+                f"{medicao['pico_memoria_bytes'] / 1024:10.1f} KiB"
+            )
+
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(execucao, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Compara as consultas dos managers (SQL) com o motor de consultas em memória.
+
+Para cada escala, gera dados sintéticos em um banco temporário, carrega o
+MotorConsultas e mede, por consulta, a latência mediana e o p95 das duas
+implementações, conferindo que retornam os mesmos ids. Também registra o
+tempo de carga e o pico de memória Python (tracemalloc) do motor.
+
+Uso:
+python -m benchmarks.bench_motor_memoria --escalas 100000 1000000 --saida motor.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.utils import configurar_django, banco_temporario, cronometro, sem_instrumentacao
+
+configurar_django()
+
+from django.db.models import Count  # noqa: E402
+from analise.gerador import gerar_dados  # noqa: E402
+from analise.memoria import MotorConsultas  # noqa: E402
+from analise.models.atleta import Atleta  # noqa: E402
+from analise.models.evento import Evento  # noqa: E402
+from analise.models.esporte import Esporte  # noqa: E402
+
+
+def _ids(resultado) -> list:
+    """Ids do resultado, ordenados quando a consulta não define ordem"""
+    if isinstance(resultado, dict):
+        return {esporte: sorted(atleta.pk for atleta in atletas) for esporte, atletas in resultado.items()}
+    return sorted(item.pk for item in resultado)
+
+
+def consultas(fonte, data_corte: date, evento_id: int) -> dict:
+    """Consultas medidas em ``fonte``: os managers (atleta, evento) ou o motor (motor, motor)"""
+    atletas, eventos = fonte
+    return {
+        'buscar_corredores_vencedores': lambda: atletas.buscar_corredores_vencedores(data_corte),
+        'buscar_maiores_pontuadores_eventos_oficiais': lambda: list(
+            atletas.buscar_maiores_pontuadores_eventos_oficiais(Esporte.FUTEBOL)
+        ),
+        'buscar_ranking_eventos_oficiais': lambda: atletas.buscar_ranking_eventos_oficiais(3),
+        'buscar_participantes': lambda: atletas.buscar_participantes(evento_id),
+        'buscar_evento_participantes_estrangeiros': lambda: list(
+            eventos.buscar_evento_participantes_estrangeiros(data_corte)
+        ),
+    }
+
+
+def latencias(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return {
+        'p50_ms': tempos[len(tempos) // 2] * 1000,
+        'p95_ms': tempos[min(int(len(tempos) * 0.95), len(tempos) - 1)] * 1000,
+    }
+
+
+def executar_escala(estatisticas: int, repeticoes: int, semente: int) -> dict:
+    """Gera os dados de uma escala, carrega o motor e mede as duas implementações"""
+    resultado = {'estatisticas': estatisticas}
+
+    with cronometro(resultado, 'geracao_segundos'):
+        gerar_dados(estatisticas, semente=semente)
+
+    tracemalloc.start()
+    with cronometro(resultado, 'carga_motor_segundos'):
+        motor = MotorConsultas().ativar()
+    _, resultado['memoria_motor_bytes'] = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    evento_id = Evento.objects.annotate(
+        total=Count('estatisticas')
+    ).order_by('-total').values_list('id', flat=True).first()
+    data_corte = date(date.today().year - 1, 1, 1)
+
+    orm = consultas((Atleta.objects, Evento.objects), data_corte, evento_id)
+    memoria = consultas((motor, motor), data_corte, evento_id)
+    resultado['consultas'] = {}
+    try:
+        for nome in orm:
+            if _ids(orm[nome]()) != _ids(memoria[nome]()):
+                raise AssertionError(f'{nome}: resultados diferentes entre o ORM e o motor')
+            resultado['consultas'][nome] = {
+                'orm': latencias(orm[nome], repeticoes),
+                'memoria': latencias(memoria[nome], repeticoes),
+            }
+    finally:
+        motor.desativar()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[100000],
+                        help='Quantidades de estatísticas geradas (padrão: 100000)')
+    parser.add_argument('--repeticoes', type=int, default=50)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON de resultado (opcional)')
+    args = parser.parse_args()
+
+    resultados = []
+    for estatisticas in args.escalas:
+        with banco_temporario(), sem_instrumentacao():
+            escala = executar_escala(estatisticas, args.repeticoes, args.semente)
+        resultados.append(escala)
+
+        print(
+            f"Escala {estatisticas} (carga do motor: {escala['carga_motor_segundos']:.1f}s, "
+            f"{escala['memoria_motor_bytes'] / 2 ** 20:.1f} MiB)"
+        )
+        for nome, medicao in escala['consultas'].items():
+            print(
+                f"  {nome:<45} ORM p50 {medicao['orm']['p50_ms']:9.3f} ms | "
+                f"memória p50 {medicao['memoria']['p50_ms']:7.3f} ms p95 {medicao['memoria']['p95_ms']:7.3f} ms"
+            )
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Compara as linhas do relatório lidas como instâncias de modelo e como LinhaRelatorio.
+
+Para cada escala, gera dados sintéticos em um banco temporário e mede, nos
+dois caminhos, a vazão (linhas por segundo lendo todos os campos usados no
+relatório, com a data em DD/MM/AAAA) e a memória por linha retida
+(tracemalloc ao materializar todas as linhas em uma lista). Também mede a
+geração completa do relatório em JSON Lines, que usa LinhaRelatorio.
+
+Uso:
+python -m benchmarks.bench_relatorio_linhas --escalas 10000 100000 --saida linhas.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.utils import Descarte, configurar_django, banco_temporario, cronometro, sem_instrumentacao
+
+configurar_django()
+
+from analise.gerador import gerar_dados  # noqa: E402
+from analise.models.estatistica import Estatistica  # noqa: E402
+from analise.relatorios import consultar_estatisticas, escrever_relatorio_estatisticas, gerar_linhas  # noqa: E402
+
+TAMANHO_LOTE = 2000
+
+
+def linhas_modelo():
+    """Caminho anterior: instâncias de Estatistica com atleta e evento via select_related"""
+    estatisticas = Estatistica.objects.select_related('atleta', 'evento').only(
+        'pontuacao', 'observacoes',
+        'atleta__nome', 'atleta__esporte',
+        'evento__nome', 'evento__data',
+    ).order_by('atleta__nome', 'evento__data')
+    return estatisticas.iterator(chunk_size=TAMANHO_LOTE)
+
+
+def ler_modelo(est) -> tuple:
+    return (
+        est.atleta.nome, est.atleta.esporte, est.evento.nome,
+        est.evento.data.strftime('%d/%m/%Y'), est.pontuacao, est.observacoes,
+    )
+
+
+def linhas_compactas():
+    return gerar_linhas(consultar_estatisticas().iterator(chunk_size=TAMANHO_LOTE))
+
+
+def ler_compacta(linha) -> tuple:
+    return (
+        linha.atleta, linha.esporte, linha.evento,
+        linha.data_formatada, linha.pontuacao, linha.observacoes,
+    )
+
+
+def medir_caminho(gerar, ler, total: int, repeticoes: int) -> dict:
+    """Melhor vazão entre as repetições e bytes por linha retida"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for linha in gerar():
+            ler(linha)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    retidas = list(gerar())
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retidas
+
+    return {
+        'linhas_por_segundo': total / min(tempos),
+        'bytes_por_linha': memoria / total,
+    }
+
+
+def executar_escala(estatisticas: int, repeticoes: int, semente: int) -> dict:
+    resultado = {'estatisticas': estatisticas}
+    with cronometro(resultado, 'geracao_segundos'):
+        gerar_dados(estatisticas, semente=semente)
+    total = Estatistica.objects.count()
+
+    resultado['modelo'] = medir_caminho(linhas_modelo, ler_modelo, total, repeticoes)
+    resultado['linha_relatorio'] = medir_caminho(linhas_compactas, ler_compacta, total, repeticoes)
+
+    with cronometro(resultado, 'relatorio_jsonl_segundos'):
+        escrever_relatorio_estatisticas(Descarte(), 'jsonl', TAMANHO_LOTE)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10000, 100000],
+                        help='Quantidades de estatísticas geradas (padrão: 10000 100000)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON de resultado (opcional)')
+    args = parser.parse_args()
+
+    resultados = []
+    for estatisticas in args.escalas:
+        with banco_temporario(), sem_instrumentacao():
+            escala = executar_escala(estatisticas, args.repeticoes, args.semente)
+        resultados.append(escala)
+
+        print(f"Escala {estatisticas} (relatório jsonl: {escala['relatorio_jsonl_segundos']:.2f}s)")
+        for caminho in ('modelo', 'linha_relatorio'):
+            medicao = escala[caminho]
+            print(
+                f"  {caminho:<16} {medicao['linhas_por_segundo']:12.0f} linhas/s "
+                f"{medicao['bytes_por_linha']:8.0f} bytes/linha"
+            )
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Compara o relatório de estatísticas serial com o renderizado em paralelo.
+
+Para cada escala, gera dados sintéticos em um banco temporário em arquivo (os
+processos não enxergam um banco em memória) e mede o tempo de geração do
+relatório serial e do paralelo para cada quantidade de processos, conferindo
+que o conteúdo é idêntico.
+
+Uso:
+python -m benchmarks.bench_relatorio_paralelo --escalas 100000 1000000 --trabalhadores 2 4 --saida paralelo.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from benchmarks.utils import configurar_django, banco_temporario, cronometro, sem_instrumentacao
+
+configurar_django()
+
+from django.db import connection  # noqa: E402
+from analise.gerador import gerar_dados  # noqa: E402
+from analise.relatorio_paralelo import TAMANHO_FATIA  # noqa: E402
+from analise.relatorios import escrever_relatorio_estatisticas  # noqa: E402
+
+
+class _Resumo:
+    """Destino de escrita que guarda apenas o hash e o tamanho do relatório"""
+
+    def __init__(self):
+        self.hash = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, texto):
+        dados = texto.encode('utf-8')
+        self.hash.update(dados)
+        self.bytes += len(dados)
+
+
+def medir(resultado: dict, chave: str, formato: str, **kwargs) -> str:
+    resumo = _Resumo()
+    with cronometro(resultado, chave):
+        escrever_relatorio_estatisticas(resumo, formato, **kwargs)
+    return resumo.hash.hexdigest()
+
+
+def executar_escala(estatisticas: int, formato: str, trabalhadores: list, tamanho_fatia: int, semente: int) -> dict:
+    resultado = {'estatisticas': estatisticas, 'formato': formato}
+    with cronometro(resultado, 'geracao_segundos'):
+        gerar_dados(estatisticas, semente=semente)
+
+    serial = medir(resultado, 'serial_segundos', formato)
+    resultado['paralelo_segundos'] = {}
+    for quantidade in trabalhadores:
+        hash_paralelo = medir(
+            resultado['paralelo_segundos'], quantidade, formato,
+            trabalhadores=quantidade, tamanho_fatia=tamanho_fatia,
+        )
+        if hash_paralelo != serial:
+            raise AssertionError(f'{quantidade} processos: relatório diferente do serial')
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[100000],
+                        help='Quantidades de estatísticas geradas (padrão: 100000)')
+    parser.add_argument('--trabalhadores', type=int, nargs='+', default=[2, os.cpu_count() or 1],
+                        help='Quantidades de processos medidas (padrão: 2 e os.cpu_count())')
+    parser.add_argument('--tamanho-fatia', type=int, default=TAMANHO_FATIA)
+    parser.add_argument('--formato', default='texto', choices=['texto', 'csv', 'jsonl'])
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON de resultado (opcional)')
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp()
+    connection.settings_dict['TEST']['NAME'] = os.path.join(diretorio, 'bench.sqlite3')
+    resultados = []
+    try:
+        for estatisticas in args.escalas:
+            with banco_temporario(), sem_instrumentacao():
+                escala = executar_escala(
+                    estatisticas, args.formato, sorted(set(args.trabalhadores)), args.tamanho_fatia, args.semente
+                )
+            resultados.append(escala)
+
+            print(f"Escala {estatisticas} ({args.formato}): serial {escala['serial_segundos']:.2f}s")
+            for quantidade, segundos in escala['paralelo_segundos'].items():
+                print(
+                    f"  {quantidade:>3} processos {segundos:8.2f}s "
+                    f"(x{escala['serial_segundos'] / segundos:.2f})"
+                )
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
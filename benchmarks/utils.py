@@ -0,0 +1,77 @@
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def configurar_django():
+    """Configura o Django para execução dos benchmarks fora do manage.py"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'estatistinga.settings')
+    django.setup()
+
+
+@contextmanager
+def banco_temporario(verbosity: int = 0):
+    """
+    Cria um banco de testes temporário e o destrói ao final.
+    
+    Args:
+        verbosity: Nível de verbosidade da criação/destruição do banco
+    """
+    from django.db import connection
+    
+    nome_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=verbosity)
+
+
+def sem_instrumentacao():
+    """
+    Desativa a instrumentação SQL dos managers durante o bloco: com o padrão
+    ANALISE_INSTRUMENTACAO = DEBUG, o custo da medição entraria nos tempos
+    """
+    from django.test import override_settings
+
+    return override_settings(ANALISE_INSTRUMENTACAO=False)
+
+
+class Descarte:
+    """Destino de escrita que apenas conta os caracteres recebidos"""
+
+    def __init__(self):
+        self.caracteres = 0
+
+    def write(self, texto):
+        self.caracteres += len(texto)
+
+
+@contextmanager
+def cronometro(resultado: dict, chave: str):
+    """Grava em resultado[chave] o tempo de execução (em segundos) do bloco"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        resultado[chave] = time.perf_counter() - inicio
+
+
+@contextmanager
+def contador_consultas(resultado: dict, chave: str):
+    """Grava em resultado[chave] o número de consultas SQL executadas no bloco"""
+    from django.db import connection
+    
+    contagem = [0]
+    
+    def contar(execute, sql, params, many, context):
+        contagem[0] += 1
+        return execute(sql, params, many, context)
+    
+    try:
+        with connection.execute_wrapper(contar):
+            yield
+    finally:
+        resultado[chave] = contagem[0]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'analise.middleware.InstrumentacaoConsultasMiddleware',
 ]
 
 ROOT_URLCONF = 'estatistinga.urls'
@@ -78,7 +80,122 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'estatistinga.sqlite3',
-    }
+    },
+    # Cópia do banco principal para leituras analíticas, atualizada pelo comando
+    # atualizar_replica (ver analise/replica.py)
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'estatistinga.replica.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['analise.replica.RoteadorReplica']
+
+# Perfis de banco, escolhidos pela variável de ambiente ESTATISTINGA_PERFIL_BANCO.
+# O perfil 'producao' mantém conexões persistentes e aplica, a cada nova conexão,
+# os PRAGMAs listados em 'PRAGMAS' (ver analise/signals.py): WAL para que leitores
+# não bloqueiem atrás do escritor, mmap e cache maiores. O 'timeout' (em segundos)
+# é o busy timeout do SQLite: quanto uma conexão espera por um lock antes de
+# falhar com "database is locked".
+
+PERFIS_BANCO = {
+    'desenvolvimento': {},
+    'producao': {
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 268435456,  # 256 MiB
+            'cache_size': -65536,  # 64 MiB (valor negativo é em KiB)
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+
+PERFIL_BANCO = os.environ.get('ESTATISTINGA_PERFIL_BANCO', 'desenvolvimento')
+
+DATABASES['default'].update(PERFIS_BANCO[PERFIL_BANCO])
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# O alias 'analise' guarda os resultados das consultas dos managers (analise/cache.py).
+#
+# ATENÇÃO: o backend padrão (locmem) é local a cada processo. As versões que
+# invalidam os resultados são incrementadas apenas no processo que gravou: escritas
+# feitas por outro processo (importar_estatisticas, reconstruir_resumos, outro
+# worker do servidor) NÃO invalidam este cache, e resultados antigos podem ser
+# servidos por até TIMEOUT segundos. Com mais de um processo, defina
+# ESTATISTINGA_CACHE_DIR: o alias passa a usar FileBasedCache nesse diretório,
+# compartilhado entre os processos. MAX_ENTRIES e CULL_FREQUENCY valem para os dois
+# backends.
+
+CACHE_DIR = os.environ.get('ESTATISTINGA_CACHE_DIR')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analise': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': CACHE_DIR or 'analise-consultas',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+ANALISE_CACHE_ALIAS = 'analise'
+
+
+# Leituras analíticas na réplica
+
+ANALISE_LEITURA_REPLICA = os.environ.get('ESTATISTINGA_LEITURA_REPLICA') == '1'
+
+ANALISE_REPLICA_ALIAS = 'replica'
+
+# Atraso máximo (segundos) da réplica; acima dele as leituras voltam para 'default'
+ANALISE_REPLICA_ATRASO_MAXIMO = 300
+
+# Intervalo (segundos) entre as consultas do instante de atualização da réplica
+ANALISE_REPLICA_VERIFICACAO = 5
+
+
+# Instrumentação SQL dos managers (analise/instrumentacao.py)
+# Consultas mais lentas que ANALISE_CONSULTA_LENTA_MS são registradas com o EXPLAIN
+# no logger 'analise.consultas_lentas'; None desativa o registro.
+
+ANALISE_INSTRUMENTACAO = DEBUG
+
+ANALISE_CONSULTA_LENTA_MS = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'analise.consultas_lentas': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
 }
 
 
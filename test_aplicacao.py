@@ -5,12 +5,14 @@ py manage.py shell
 >>> exec(open('test_aplicacao.py', encoding='utf-8').read())
 """
 import os
+import sys
 import django
 from datetime import date, timedelta
 from analise.models.atleta import Atleta
 from analise.models.evento import Evento
 from analise.models.estatistica import Estatistica
 from analise.models.esporte import Esporte 
+from analise.relatorios import escrever_relatorio_estatisticas
 
 # Configurar Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'estatistinga.settings')
@@ -321,37 +323,17 @@ def executar_testes(atletas, eventos):
 # IMPLEMENTAÇÃO DO RELATÓRIO FINAL (REQUISITO H.V)
 # --------------------------------------------------------------------------------------------------
 
-def imprimir_relatorio_estatisticas():
+def imprimir_relatorio_estatisticas(trabalhadores=None):
     """
     Imprime um relatório das estatísticas agrupadas por atleta e ordenadas pela data do evento.
     (Requisito h.v do PDF)
-    """
-    print("=" * 80)
-    print("RELATÓRIO FINAL: ESTATÍSTICAS POR ATLETA")
-    print("=" * 80)
-    
-    # Consulta: Seleciona todas as estatísticas, pré-carrega Atleta e Evento (select_related)
-    # Ordena: Pelo nome do atleta (agrupamento) e pela data do evento (ordenação)
-    estatisticas = Estatistica.objects.all().select_related('atleta', 'evento').order_by('atleta__nome', 'evento__data')
-    
-    atleta_atual = None
     
-    for est in estatisticas:
-        # Se o atleta mudar, imprime o cabeçalho do novo grupo
-        if est.atleta.nome != atleta_atual:
-            print(f"\n--- ATLETA: {est.atleta.nome} ({est.atleta.esporte}) ---")
-            atleta_atual = est.atleta.nome
-        
-        # Imprime os detalhes da estatística
-        # Formato DD/MM/AAAA conforme a prova
-        data_evento = est.evento.data.strftime('%d/%m/%Y') 
-        print(f"  > Evento: {est.evento.nome} ({data_evento})")
-        # Pega a primeira linha da observação para ser conciso no relatório
-        print(f"    - Pontuação: {est.pontuacao} | Observação: {est.observacoes.splitlines()[0] if est.observacoes else 'N/A'}")
-        
-    print("\n" + "=" * 80)
-    print("FIM DO RELATÓRIO.")
-    print("=" * 80 + "\n")
+    O relatório é gerado em streaming por analise.relatorios, que também o expõe
+    em CSV/JSON Lines e no endpoint /analise/relatorios/estatisticas/. Com
+    ``trabalhadores``, as fatias de atletas são renderizadas em paralelo nessa
+    quantidade de processos (analise/relatorio_paralelo.py), com o mesmo resultado.
+    """
+    escrever_relatorio_estatisticas(sys.stdout, trabalhadores=trabalhadores)
 
 
 # --------------------------------------------------------------------------------------------------